@@ -0,0 +1,114 @@
+"""
+Batch allocation for Burn Relief Bot - Vectorized splits for previews and reconciliation
+Applies the same basis-point rules and largest-remainder rounding as
+AllocationRule.allocate, one NumPy column per allocation leg
+"""
+
+from typing import Any, Dict, List, Mapping, Sequence
+
+import numpy as np
+
+from allocation_engine import BPS_DENOMINATOR, LEGS, AllocationRule, to_base_units
+
+# Token classes accepted in place of rule names
+TOKEN_CLASS_RULES = {
+    "burnable": "burn_and_swap",
+    "non_burnable": "swap_only",
+    "drb": "drb_direct_allocation",
+    "contest": "contest",
+}
+
+# Totals must fit in int64 base units
+MAX_BATCH_UNITS = np.iinfo(np.int64).max
+
+
+class BatchAllocator:
+    """Vectorized counterpart of AllocationRule.allocate"""
+
+    def __init__(self, rules: Mapping[str, AllocationRule]):
+        self.rule_names = list(rules)
+        self.rule_index = {name: index for index, name in enumerate(self.rule_names)}
+        # One row of leg basis points per rule
+        self.bps = np.array(
+            [[rules[name].bps.get(leg, 0) for leg in LEGS] for name in self.rule_names],
+            dtype=np.int64
+        )
+
+    def resolve_rules(self, rules: Sequence[str]) -> np.ndarray:
+        """Map rule names or token classes to rule indexes"""
+        indexes = np.empty(len(rules), dtype=np.intp)
+        for row, value in enumerate(rules):
+            name = TOKEN_CLASS_RULES.get(value, value)
+            if name not in self.rule_index:
+                raise ValueError(f"Row {row}: unknown allocation rule '{value}'")
+            indexes[row] = self.rule_index[name]
+        return indexes
+
+    def allocate(self, total_units: np.ndarray, rule_indexes: np.ndarray) -> Dict[str, np.ndarray]:
+        """Split every total by its row's rule, returning one int64 column per leg"""
+        total_units = np.asarray(total_units, dtype=np.int64)
+        if total_units.shape != rule_indexes.shape:
+            raise ValueError("Amounts and rules must have the same length")
+        if (total_units < 0).any():
+            raise ValueError("Allocation totals cannot be negative")
+
+        bps = self.bps[rule_indexes]
+
+        # total * bps / 10000 without overflowing int64:
+        # split total into quotient and remainder of the denominator first
+        quotient, remainder = np.divmod(total_units, BPS_DENOMINATOR)
+        scaled = remainder[:, None] * bps
+        shares = quotient[:, None] * bps + scaled // BPS_DENOMINATOR
+        fractions = scaled % BPS_DENOMINATOR
+
+        # Largest remainder first, ties broken by leg order
+        leftover = total_units - shares.sum(axis=1)
+        order = np.argsort(-fractions, axis=1, kind="stable")
+        bonus = np.zeros_like(shares)
+        ranks = np.arange(len(LEGS))[None, :] < leftover[:, None]
+        np.put_along_axis(bonus, order, ranks.astype(np.int64), axis=1)
+        shares += bonus
+
+        columns = {leg: shares[:, index] for index, leg in enumerate(LEGS)}
+        columns["drb_total"] = (
+            columns["drb_grok"] + columns["drb_community"] + columns["drb_team"] + columns["drb_project"]
+        )
+        columns["bnkr_total"] = columns["bnkr_community"] + columns["bnkr_team"] + columns["bnkr_project"]
+        columns["total"] = total_units
+        return columns
+
+    def allocate_amounts(self, amounts: Sequence[Any], rules: Sequence[str], decimals: int = 6) -> Dict[str, Any]:
+        """Allocate human-readable amounts and return columnar decimal strings"""
+        if len(amounts) != len(rules):
+            raise ValueError("Amounts and rules must have the same length")
+        if not 0 <= decimals <= 18:
+            raise ValueError("Decimals must be between 0 and 18")
+
+        units = []
+        for row, amount in enumerate(amounts):
+            try:
+                value = to_base_units(amount, decimals)
+            except (ArithmeticError, ValueError):
+                raise ValueError(f"Row {row}: invalid amount '{amount}'")
+            if value > MAX_BATCH_UNITS:
+                raise ValueError(f"Row {row}: amount too large for {decimals} decimals")
+            units.append(value)
+
+        rule_indexes = self.resolve_rules(rules)
+        columns = self.allocate(np.array(units, dtype=np.int64), rule_indexes)
+
+        result: Dict[str, Any] = {
+            "allocation_type": [self.rule_names[index] for index in rule_indexes.tolist()]
+        }
+        for name, column in columns.items():
+            result[name] = format_column(column, decimals)
+        return result
+
+
+def format_column(units: np.ndarray, decimals: int) -> List[str]:
+    """Format an int64 base-unit column as fixed-point decimal strings"""
+    if decimals == 0:
+        return units.astype(str).tolist()
+    whole, fraction = np.divmod(units, 10 ** decimals)
+    text = np.char.add(np.char.add(whole.astype(str), "."), np.char.zfill(fraction.astype(str), decimals))
+    return text.tolist()
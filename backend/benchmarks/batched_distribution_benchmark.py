@@ -0,0 +1,110 @@
+"""
+Gas and latency comparison for batched distribution
+Sends the same four-way split on the local JSON-RPC stand-in chain
+(rpc_standin.py) as separate concurrent transfers (RedistributionSender) and as
+one disperseToken call (BatchedDistributionSender), with an approval per batch
+and with a standing unlimited approval, and checks the per-leg results decoded
+from the disperse receipt. A last run sends several batches of one token at
+once on top of a leftover allowance, which must not overwrite each other's
+approvals
+
+Gas figures come from the stand-in's rough cost model, so compare them
+relative to each other rather than as absolute on-chain costs
+
+Run: python backend/benchmarks/batched_distribution_benchmark.py [rounds]
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from eth_account import Account
+from web3 import AsyncWeb3
+
+from redistribution_sender import ALLOWANCE_ABI, BatchedDistributionSender, NonceManager, RedistributionSender
+from rpc_standin import CHAIN_ID, STANDIN_DISPERSE_ADDRESS, StandInChain
+
+TOKEN = "0x22aF33FE49fD1Fa80c7149773dDe5890D3c76F3b"
+DISTRIBUTIONS = {
+    "0x000000000000000000000000000000000000dEaD": 880 * 10 ** 18,
+    "0xb1058c959987e3513600eb5b4fd82aeee2a0e4f9": 70 * 10 ** 18,
+    "0xdc5400599723Da6487C54d134EE44e948a22718b": 15 * 10 ** 18,
+    "0x204B520ae6311491cB78d3BAaDfd7eA67FD4456F": 5 * 10 ** 18,
+}
+GAS_PRICE = 1_000_000_000
+POLL_LATENCY = 0.05
+
+
+async def run(name, make_sender, rounds):
+    chain = StandInChain()
+    url = await chain.start()
+    web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(url))
+    account = Account.create()
+    sender = make_sender(web3, account)
+
+    latencies = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        results = await sender.send(TOKEN, DISTRIBUTIONS, GAS_PRICE)
+        latencies.append(time.perf_counter() - started)
+        failed = [recipient for recipient, value in results.items() if value.startswith("ERROR")]
+        assert not failed and set(results) == set(DISTRIBUTIONS), f"{name}: failed legs {failed}"
+    await chain.stop()
+
+    gas = sum(int(receipt["gasUsed"], 16) for receipt in chain.receipts.values())
+    print(f"{name:<28} {len(chain.mined) / rounds:>7.1f} {gas / rounds:>12,.0f} "
+          f"{sum(latencies) / rounds * 1000:>10.1f} {chain.requests / rounds:>9.1f}")
+
+
+async def concurrent_batches(batches):
+    """Several redistributions of one token in flight together, approving per batch"""
+    chain = StandInChain()
+    url = await chain.start()
+    web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(url))
+    account = Account.create()
+    sender = BatchedDistributionSender(
+        web3, account, NonceManager(web3), chain_id=CHAIN_ID,
+        disperse_address=STANDIN_DISPERSE_ADDRESS, poll_latency=POLL_LATENCY
+    )
+    # Leftover allowance that covers one batch but not two
+    total = sum(DISTRIBUTIONS.values())
+    token = web3.eth.contract(address=AsyncWeb3.to_checksum_address(TOKEN), abi=ALLOWANCE_ABI)
+    approve = sender.build_approve(token, total * 3 // 2, await web3.eth.get_transaction_count(account.address), GAS_PRICE, CHAIN_ID)
+    await web3.eth.wait_for_transaction_receipt(
+        await web3.eth.send_raw_transaction(account.sign_transaction(approve).rawTransaction), poll_latency=POLL_LATENCY
+    )
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(sender.send(TOKEN, DISTRIBUTIONS, GAS_PRICE) for _ in range(batches)))
+    elapsed = (time.perf_counter() - started) * 1000
+    await chain.stop()
+    failed = sum(value.startswith("ERROR") for result in results for value in result.values())
+    print(f"{batches} concurrent batches of one token: {len(chain.mined)} txs, {failed} failed legs, {elapsed:.1f} ms")
+    assert failed == 0, f"{failed} legs failed"
+
+
+async def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    print(f"Four-way split, averages over {rounds} rounds on the stand-in chain")
+    print(f"{'mode':<28} {'txs':>7} {'gas':>12} {'ms':>10} {'rpc calls':>9}")
+
+    await run("separate transfers", lambda web3, account: RedistributionSender(
+        web3, account, NonceManager(web3), chain_id=CHAIN_ID, poll_latency=POLL_LATENCY
+    ), rounds)
+    await run("disperse, approve per batch", lambda web3, account: BatchedDistributionSender(
+        web3, account, NonceManager(web3), chain_id=CHAIN_ID,
+        disperse_address=STANDIN_DISPERSE_ADDRESS, poll_latency=POLL_LATENCY
+    ), rounds)
+    await run("disperse, standing approval", lambda web3, account: BatchedDistributionSender(
+        web3, account, NonceManager(web3), chain_id=CHAIN_ID,
+        disperse_address=STANDIN_DISPERSE_ADDRESS, approve_unlimited=True, poll_latency=POLL_LATENCY
+    ), rounds)
+    await concurrent_batches(8)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""
+Benchmark for concurrent quote legs in a burn plan
+Serves Jupiter quotes from a local stand-in whose latency depends on the output
+mint, then times BlockchainService._execute_solana_burn against awaiting the
+same quote legs one after the other; the plan should take as long as its
+slowest leg. A leg slower than the quote timeout must not hold up the plan
+
+Run: python backend/benchmarks/burn_quote_benchmark.py
+"""
+
+import asyncio
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aiohttp import web
+
+import blockchain_service as service_module
+from blockchain_service import BlockchainService
+
+LEG_LATENCY = {"DRB_SOLANA_MINT": 0.12, "CBBTC_SOLANA_MINT": 0.2}
+
+
+async def start_jupiter_standin(latency):
+    async def quote(request):
+        await asyncio.sleep(latency[request.query["outputMint"]])
+        return web.json_response({"inAmount": request.query["amount"], "outputMint": request.query["outputMint"]})
+
+    app = web.Application()
+    app.router.add_get("/v6/quote", quote)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/v6/quote"
+
+
+async def sequential(service, token):
+    return [await service._get_jupiter_quote(token, mint, "60") for mint in LEG_LATENCY]
+
+
+async def timed(label, plan):
+    started = time.perf_counter()
+    result = await plan()
+    print(f"  {label:<12} {(time.perf_counter() - started) * 1000:8.1f} ms")
+    return result
+
+
+async def main():
+    latency = dict(LEG_LATENCY)
+    runner, service_module.JUPITER_QUOTE_URL = await start_jupiter_standin(latency)
+    service = BlockchainService()
+    service.solana_client = object()
+    token = "So11111111111111111111111111111111111111112"
+    args = (token, Decimal("880"), Decimal("60"), Decimal("60"), "user", "recipient")
+
+    print(f"Two Jupiter quote legs, {int(LEG_LATENCY['DRB_SOLANA_MINT'] * 1000)} ms and "
+          f"{int(LEG_LATENCY['CBBTC_SOLANA_MINT'] * 1000)} ms")
+    await timed("sequential", lambda: sequential(service, token))
+    result = await timed("concurrent", lambda: service._execute_solana_burn(*args))
+    assert result["success"] and result["failed_quotes"] == [], result
+
+    print("cbBTC leg slower than a 0.3 s quote timeout")
+    service.quote_timeout = 0.3
+    latency["CBBTC_SOLANA_MINT"] = 2.0
+    result = await timed("concurrent", lambda: service._execute_solana_burn(*args))
+    assert result["success"] and result["failed_quotes"] == ["swap_to_cbbtc"], result
+
+    await service.close()
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
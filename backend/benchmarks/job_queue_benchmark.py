@@ -0,0 +1,101 @@
+"""
+Benchmark for the burn job queue
+Enqueues a batch of jobs whose handler sleeps for a fixed time (standing in for
+an I/O-bound burn), drains them with 1, 2, 4 ... worker processes and reports
+throughput, the speed-up over one process, plus how many jobs ran more than once
+
+Needs a reachable MongoDB (MONGO_URL, default mongodb://localhost:27017)
+Run: python backend/benchmarks/job_queue_benchmark.py [jobs] [max_processes]
+"""
+
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from job_queue import COMPLETED, JobQueue
+
+MONGO_URL = os.environ.get("MONGO_URL", "mongodb://localhost:27017")
+DATABASE = "burn_relief_bot_benchmark"
+WORKERS_PER_PROCESS = 8
+JOB_SECONDS = 0.05
+
+
+def run_process(total_jobs):
+    async def handler(job):
+        await db.job_runs.insert_one({"job_id": job["_id"]})
+        await asyncio.sleep(JOB_SECONDS)
+
+    async def drain():
+        queue = JobQueue(db.jobs, handler, workers=WORKERS_PER_PROCESS, poll_interval=0.05)
+        await queue.start()
+        while await db.jobs.count_documents({"status": COMPLETED}) < total_jobs:
+            await asyncio.sleep(0.05)
+        await queue.stop()
+
+    client = AsyncIOMotorClient(MONGO_URL)
+    db = client[DATABASE]
+    asyncio.run(drain())
+
+
+async def reset(total_jobs):
+    client = AsyncIOMotorClient(MONGO_URL)
+    db = client[DATABASE]
+    await db.jobs.delete_many({})
+    await db.job_runs.delete_many({})
+    queue = JobQueue(db.jobs, None)
+    await queue.ensure_indexes()
+    for index in range(total_jobs):
+        await queue.enqueue(f"job:{index}", "benchmark", {"index": index})
+    client.close()
+
+
+async def duplicate_runs():
+    client = AsyncIOMotorClient(MONGO_URL)
+    runs = client[DATABASE].job_runs
+    count = await runs.count_documents({}) - len(await runs.distinct("job_id"))
+    client.close()
+    return count
+
+
+async def drop():
+    client = AsyncIOMotorClient(MONGO_URL)
+    await client.drop_database(DATABASE)
+    client.close()
+
+
+def main():
+    total_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    max_processes = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    print(f"{total_jobs} jobs, {WORKERS_PER_PROCESS} workers per process, {JOB_SECONDS * 1000:.0f} ms per job")
+    print(f"{'processes':>9} {'jobs/s':>10} {'speed-up':>10} {'duplicates':>11}")
+    processes = 1
+    single = None
+    try:
+        while processes <= max_processes:
+            asyncio.run(reset(total_jobs))
+            started = time.perf_counter()
+            pool = [multiprocessing.Process(target=run_process, args=(total_jobs,)) for _ in range(processes)]
+            for process in pool:
+                process.start()
+            for process in pool:
+                process.join()
+            elapsed = time.perf_counter() - started
+            duplicates = asyncio.run(duplicate_runs())
+            rate = total_jobs / elapsed
+            single = single or rate
+            print(f"{processes:>9} {rate:>10.0f} {rate / single:>9.2f}x {duplicates:>11}")
+            processes *= 2
+    finally:
+        asyncio.run(drop())
+
+
+if __name__ == "__main__":
+    main()
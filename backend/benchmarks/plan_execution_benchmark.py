@@ -0,0 +1,140 @@
+"""
+Benchmark for DAG execution of cross-chain burn plans
+Each step is submitted at once and confirms through a stand-in transaction
+monitor after its confirmation time. The old serial loop waits for the burn,
+the DRB bridge and swap, and the cbBTC swap one after another; the plan
+scheduler runs the three legs side by side and only holds the DRB swap for its
+bridge. The run is then cut off mid-plan and resumed from the saved step state,
+which must not submit any step again, including the bridge that was still
+confirming when the run stopped
+
+Run: python backend/benchmarks/plan_execution_benchmark.py
+"""
+
+import asyncio
+import itertools
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cross_chain_router import CrossChainRouter
+from plan_scheduler import COMPLETED
+from tx_monitor import CONFIRMED, PENDING
+
+WALLET = "0x000000000000000000000000000000000000dEaD"
+ROUTES = [
+    {"step": 1, "type": "burn", "source_chain": "polygon", "target_chain": "polygon", "amount": "880"},
+    {"step": 2, "type": "bridge_and_swap_drb", "source_chain": "polygon", "target_chain": "base", "amount": "80"},
+    {"step": 3, "type": "direct_swap_cbbtc", "source_chain": "polygon", "target_chain": "polygon", "amount": "40"}
+]
+# Seconds until each step confirms
+LATENCY = {"burn": 0.10, "bridge": 0.20, "swap": 0.08}
+
+
+class StandInMonitor:
+    """Confirms each transaction LATENCY seconds after it was first checked"""
+
+    def __init__(self):
+        self.confirm_at = {}
+        self.queues = {}
+
+    def poll_interval(self, chain):
+        return 0.01
+
+    def subscribe(self, transactions):
+        queue = asyncio.Queue()
+        self.queues[queue] = set(transactions)
+        return queue
+
+    def unsubscribe(self, queue):
+        self.queues.pop(queue, None)
+
+    async def check(self, transactions):
+        statuses = []
+        loop = asyncio.get_running_loop()
+        for tx_hash, chain in transactions:
+            if (tx_hash, chain) not in self.confirm_at:
+                kind = tx_hash.split("-")[0]
+                self.confirm_at[(tx_hash, chain)] = loop.time() + LATENCY[kind]
+                loop.call_at(self.confirm_at[(tx_hash, chain)], self.publish, tx_hash, chain)
+            done = loop.time() >= self.confirm_at[(tx_hash, chain)]
+            statuses.append({"tx_hash": tx_hash, "chain": chain, "status": CONFIRMED if done else PENDING})
+        return statuses
+
+    async def close(self):
+        pass
+
+    def publish(self, tx_hash, chain):
+        for queue, keys in self.queues.items():
+            if (tx_hash, chain) in keys:
+                queue.put_nowait({"tx_hash": tx_hash, "chain": chain, "status": CONFIRMED, "confirmations": 1})
+
+
+def slow_steps(router, executed):
+    """Steps submit a transaction and return; confirmation goes through the monitor"""
+    nonces = itertools.count()
+    for kind, step in (("burn", router._execute_burn_step), ("bridge", router._execute_bridge_step),
+                       ("swap", router._execute_swap_step)):
+        async def submitted(route, user_address, kind=kind, step=step):
+            tx = await step(route, user_address)
+            executed[tx["step"]] += 1
+            return {**tx, "tx_hash": f"{kind}-{next(nonces)}", "simulated": False}
+        setattr(router, f"_execute_{kind}_step", submitted)
+
+
+async def serial(router):
+    """The previous execute_cross_chain_burn loop, waiting for each step to confirm"""
+    plan = []
+    for route in ROUTES:
+        if route["type"] == "burn":
+            steps = [router._execute_burn_step]
+        elif "bridge_and_swap" in route["type"]:
+            steps = [router._execute_bridge_step, router._execute_swap_step]
+        else:
+            steps = [router._execute_swap_step]
+        for step in steps:
+            plan.append(await router._await_confirmation(await step(route, WALLET)))
+    return plan
+
+
+async def timed(label, run):
+    started = time.perf_counter()
+    result = await run()
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"  {label:<12} {elapsed:8.1f} ms")
+    return result, elapsed
+
+
+async def main():
+    executed = Counter()
+    router = CrossChainRouter()
+    router.tx_monitor = StandInMonitor()
+    slow_steps(router, executed)
+
+    print("Burn 100 ms, DRB bridge 200 ms then swap 80 ms, cbBTC swap 80 ms")
+    _, serial_ms = await timed("serial", lambda: serial(router))
+    result, dag_ms = await timed("dag", lambda: router.execute_cross_chain_burn(ROUTES, WALLET, plan_id="bench"))
+    assert result["success"] and result["total_transactions"] == 4, result
+    assert dag_ms < serial_ms * 0.7, (dag_ms, serial_ms)
+
+    print("Interrupted after 150 ms, then resumed")
+    executed.clear()
+    run = asyncio.ensure_future(router.execute_cross_chain_burn(ROUTES, WALLET, plan_id="crash"))
+    await asyncio.sleep(0.15)
+    run.cancel()
+    # A cancelled run leaves its in-flight steps marked running in the store
+    saved = (await router.plan_store.load("crash"))["state"]
+    print(f"  saved state: { {node: state['status'] for node, state in saved.items()} }")
+    result, _ = await timed("resume", lambda: router.resume_cross_chain_burn("crash"))
+    assert result["success"] and all(status == COMPLETED for status in result["step_status"].values()), result
+    assert set(executed.values()) == {1}, executed
+    print(f"  executions per step: {dict(executed)}")
+
+    await router.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
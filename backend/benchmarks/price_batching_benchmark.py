@@ -0,0 +1,64 @@
+"""
+Benchmark for batched multi-token price lookups
+Prices a portfolio of tokens against the local CoinGecko stand-in
+(price_standin.py) one address per request and through PriceService.get_prices,
+which groups cache misses into multi-address requests; checks untracked tokens
+come back as None, batches are split at max_batch, and a failed request falls
+back to the last known prices
+
+Run: python backend/benchmarks/price_batching_benchmark.py [tokens]
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from eth_account import Account
+
+from price_service import PriceService
+from price_standin import StandInPriceApi, standin_price
+
+
+async def measure(api, label, lookups):
+    before = api.requests
+    started = time.perf_counter()
+    results = await lookups()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<12} {api.requests - before:>4} upstream requests  {elapsed * 1000:8.1f} ms")
+    return results
+
+
+async def main():
+    token_count = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    tokens = [Account.create().address for _ in range(token_count)]
+    untracked = set(tokens[::10])
+    api = StandInPriceApi(latency=0.05, unquoted=untracked)
+    url = await api.start()
+    expected = {token: None if token in untracked else standin_price(token) for token in tokens}
+
+    print(f"{token_count} tokens, 50 ms API latency")
+    single = PriceService(base_url=url, max_batch=1)
+    per_token = await measure(api, "per token", lambda: single.get_prices(tokens, "base"))
+    batched = PriceService(base_url=url, max_batch=50)
+    prices = await measure(api, "batched", lambda: batched.get_prices(tokens, "base"))
+    assert per_token == prices == expected
+    assert api.max_addresses == 50, api.max_addresses
+
+    print("Same portfolio with a failing price API")
+    batched.ttl = batched.stale_ttl = 0
+    api.fail_next = api.requests + 100
+    stale = await measure(api, "batched", lambda: batched.get_prices(tokens, "base"))
+    assert stale == expected
+    print(f"  stats: {batched.metrics()}")
+
+    await single.close()
+    await batched.close()
+    await api.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""
+Benchmark for the cached, coalescing price service
+Prices the same token from many concurrent callers against the local CoinGecko
+stand-in (price_standin.py), first with one blocking requests.get per call as
+BlockchainService.get_token_price used to, then through PriceService; reports
+upstream requests and wall time, and checks stale prices are served instantly
+while a single background refresh runs
+
+Run: python backend/benchmarks/price_service_benchmark.py [callers]
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import requests
+from eth_account import Account
+
+from price_service import PriceService
+from price_standin import StandInPriceApi, standin_price
+
+
+async def blocking_price(url, token):
+    response = requests.get(f"{url}/simple/token_price/base?contract_addresses={token}&vs_currencies=usd", timeout=5)
+    return response.json().get(token.lower(), {}).get("usd", 0.0)
+
+
+async def measure(api, label, lookups):
+    before = api.requests
+    started = time.perf_counter()
+    results = await lookups()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<12} {api.requests - before:>4} upstream requests  {elapsed * 1000:8.1f} ms")
+    return results
+
+
+async def main():
+    callers = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    api = StandInPriceApi(latency=0.05)
+    url = api.start_in_thread()
+    token = Account.create().address
+    service = PriceService(base_url=url, ttl=0.3, stale_ttl=5)
+
+    print(f"{callers} concurrent lookups of one token, 50 ms API latency")
+    blocking = await measure(api, "blocking", lambda: asyncio.gather(
+        *(blocking_price(url, token) for _ in range(callers))))
+    cached = await measure(api, "service", lambda: asyncio.gather(
+        *(service.get_price(token, "base") for _ in range(callers))))
+    assert blocking == cached == [standin_price(token)] * callers
+
+    print("Same lookups while the price is fresh")
+    await measure(api, "service", lambda: asyncio.gather(
+        *(service.get_price(token, "base") for _ in range(callers))))
+
+    await asyncio.sleep(0.35)
+    print("Same lookups once the price is stale")
+    await measure(api, "service", lambda: asyncio.gather(
+        *(service.get_price(token, "base") for _ in range(callers))))
+    await asyncio.sleep(0.1)
+    assert api.requests == callers + 2, api.requests
+    print(f"  background refreshes: 1   stats: {service.metrics()}")
+
+    await service.close()
+    api.stop_thread()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
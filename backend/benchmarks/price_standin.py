@@ -0,0 +1,72 @@
+"""
+Local stand-in for CoinGecko's simple/token_price endpoint
+Serves GET /simple/token_price/{platform}?contract_addresses=a,b&vs_currencies=usd
+with a deterministic price per address; addresses in unquoted are left out of
+the response like tokens CoinGecko does not track. Every request is delayed by
+latency to mimic the real API, and requests / addresses_requested count the load
+"""
+
+import asyncio
+import threading
+from typing import Optional, Set
+
+from aiohttp import web
+
+
+def standin_price(address: str) -> float:
+    """Deterministic fake USD price for an address"""
+    return round(int(address.lower()[-6:], 16) / 1000 + 0.01, 6)
+
+
+class StandInPriceApi:
+    """Minimal CoinGecko simple/token_price behind a local HTTP server"""
+
+    def __init__(self, latency: float = 0.05, unquoted: Optional[Set[str]] = None):
+        self.latency = latency
+        self.unquoted = {address.lower() for address in (unquoted or set())}
+        self.requests = 0
+        self.addresses_requested = 0
+        self.max_addresses = 0
+        self.fail_next = 0
+
+        self._runner: Optional[web.AppRunner] = None
+        self.url = ""
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        app = web.Application()
+        app.router.add_get("/simple/token_price/{platform}", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+    def start_in_thread(self) -> str:
+        """Serve from a separate event loop so blocking clients in the caller's loop can reach it"""
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(self.start(), self._loop).result()
+
+    def stop_thread(self):
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        addresses = [a for a in request.query.get("contract_addresses", "").split(",") if a]
+        self.addresses_requested += len(addresses)
+        self.max_addresses = max(self.max_addresses, len(addresses))
+        await asyncio.sleep(self.latency)
+        if self.fail_next > 0:
+            self.fail_next -= 1
+            return web.json_response({"error": "rate limited"}, status=429)
+        return web.json_response({
+            address.lower(): {"usd": standin_price(address)}
+            for address in addresses if address.lower() not in self.unquoted
+        })
@@ -0,0 +1,147 @@
+"""
+Benchmark for the concurrent redistribution sender
+Runs against the local JSON-RPC stand-in chain (rpc_standin.py):
+1. one four-way split sent leg by leg (send, wait for receipt, repeat) versus
+   RedistributionSender (sign all, broadcast together, confirm in parallel)
+2. many concurrent redistributions sharing one NonceManager, checking that
+   every nonce is used exactly once
+3. a rejected leg, checking its nonce is filled so the other legs confirm
+4. a redistribution that fails before broadcasting (an invalid recipient),
+   checking its reserved nonces do not hold back the next one
+
+Run: python backend/benchmarks/redistribution_sender_benchmark.py [concurrent]
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from eth_account import Account
+from web3 import AsyncWeb3
+
+from redistribution_sender import NonceManager, RedistributionSender
+from rpc_standin import CHAIN_ID, StandInChain
+
+TOKEN = "0x22aF33FE49fD1Fa80c7149773dDe5890D3c76F3b"
+DISTRIBUTIONS = {
+    "0x000000000000000000000000000000000000dEaD": 880 * 10 ** 18,
+    "0xb1058c959987e3513600eb5b4fd82aeee2a0e4f9": 70 * 10 ** 18,
+    "0xdc5400599723Da6487C54d134EE44e948a22718b": 15 * 10 ** 18,
+    "0x204B520ae6311491cB78d3BAaDfd7eA67FD4456F": 5 * 10 ** 18,
+}
+GAS_PRICE = 1_000_000_000
+POLL_LATENCY = 0.05
+
+
+async def send_sequentially(web3, account, token_address, distributions):
+    """One transfer at a time, each confirmed before the next is sent"""
+    sender = RedistributionSender(web3, account, chain_id=CHAIN_ID)
+    results = {}
+    for recipient, amount in distributions.items():
+        nonce = await web3.eth.get_transaction_count(account.address, "pending")
+        tx = sender.build_transfers(token_address, [(recipient, amount)], [nonce], GAS_PRICE, CHAIN_ID)[0]
+        tx_hash = await web3.eth.send_raw_transaction(account.sign_transaction(tx).rawTransaction)
+        await web3.eth.wait_for_transaction_receipt(tx_hash, poll_latency=POLL_LATENCY)
+        results[recipient] = tx_hash.hex()
+    return results
+
+
+async def compare_latency():
+    chain = StandInChain()
+    url = await chain.start()
+    web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(url))
+    account = Account.create()
+
+    started = time.perf_counter()
+    await send_sequentially(web3, account, TOKEN, DISTRIBUTIONS)
+    sequential = time.perf_counter() - started
+
+    sender = RedistributionSender(web3, account, chain_id=CHAIN_ID, poll_latency=POLL_LATENCY)
+    started = time.perf_counter()
+    results = await sender.send(TOKEN, DISTRIBUTIONS, GAS_PRICE)
+    concurrent = time.perf_counter() - started
+    await chain.stop()
+
+    assert not any(value.startswith("ERROR") for value in results.values()), results
+    print(f"Four-way split, {chain.block_time * 1000:.0f} ms blocks, {chain.latency * 1000:.0f} ms RPC latency")
+    print(f"  leg by leg:  {sequential * 1000:8.1f} ms")
+    print(f"  concurrent:  {concurrent * 1000:8.1f} ms")
+
+
+async def check_concurrent_redistributions(count):
+    chain = StandInChain()
+    url = await chain.start()
+    web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(url))
+    account = Account.create()
+    sender = RedistributionSender(web3, account, NonceManager(web3), chain_id=CHAIN_ID, poll_latency=POLL_LATENCY)
+
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(sender.send(TOKEN, DISTRIBUTIONS, GAS_PRICE) for _ in range(count)))
+    elapsed = time.perf_counter() - started
+    await chain.stop()
+
+    errors = sum(value.startswith("ERROR") for results in outcomes for value in results.values())
+    nonces = sorted(tx["nonce"] for tx in chain.mined)
+    expected = list(range(count * len(DISTRIBUTIONS)))
+    print(f"{count} concurrent redistributions: {len(nonces)} transfers mined in {elapsed * 1000:.1f} ms, "
+          f"{chain.collisions} nonce collisions, {errors} errors")
+    assert nonces == expected, "nonces were skipped or reused"
+    assert chain.collisions == 0 and errors == 0
+
+
+async def check_rejected_leg():
+    rejected = "0xdc5400599723Da6487C54d134EE44e948a22718b"
+    chain = StandInChain(reject_recipients={rejected})
+    url = await chain.start()
+    web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(url))
+    account = Account.create()
+    sender = RedistributionSender(web3, account, chain_id=CHAIN_ID, poll_latency=POLL_LATENCY, receipt_timeout=10)
+
+    first = await sender.send(TOKEN, DISTRIBUTIONS, GAS_PRICE)
+    second = await sender.send(TOKEN, {recipient: amount for recipient, amount in DISTRIBUTIONS.items()
+                                       if recipient != rejected}, GAS_PRICE)
+    await chain.stop()
+
+    failed = [recipient for recipient, value in first.items() if value.startswith("ERROR")]
+    print(f"Rejected leg: failed legs {failed}, later legs confirmed: "
+          f"{all(not value.startswith('ERROR') for value in second.values())}")
+    assert failed == [rejected]
+    assert not any(value.startswith("ERROR") for value in second.values())
+    assert sorted(tx["nonce"] for tx in chain.mined) == list(range(len(first) + len(second)))
+
+
+async def check_unbroadcast_reservation():
+    chain = StandInChain()
+    url = await chain.start()
+    web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(url))
+    account = Account.create()
+    sender = RedistributionSender(web3, account, chain_id=CHAIN_ID, poll_latency=POLL_LATENCY, receipt_timeout=10)
+
+    try:
+        await sender.send(TOKEN, {**DISTRIBUTIONS, "0xnot-an-address": 1}, GAS_PRICE)
+        raise AssertionError("an invalid recipient should fail the redistribution")
+    except ValueError:
+        pass
+    results = await sender.send(TOKEN, DISTRIBUTIONS, GAS_PRICE)
+    await chain.stop()
+
+    print(f"Failed before broadcast: next redistribution confirmed: "
+          f"{all(not value.startswith('ERROR') for value in results.values())}")
+    assert not any(value.startswith("ERROR") for value in results.values()), results
+    assert sorted(tx["nonce"] for tx in chain.mined) == list(range(len(DISTRIBUTIONS)))
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 25
+    await compare_latency()
+    await check_concurrent_redistributions(count)
+    await check_rejected_leg()
+    await check_unbroadcast_reservation()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""
+Benchmark for the cross-chain router's shared session and route cache
+Serves Li.Fi quotes from a local stand-in and runs analyze_cross_chain_route
+repeatedly for the same popular token with slightly different amounts; reports
+upstream requests and latency per analysis, first with a new session per call
+as get_lifi_route used to, then with the router-owned session and route cache.
+Cached routes served for another amount must describe that amount
+
+Run: python backend/benchmarks/route_cache_benchmark.py [analyses]
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import aiohttp
+from aiohttp import web
+
+from cross_chain_router import CrossChainRouter
+
+TOKEN = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
+
+
+async def start_lifi_standin(latency, counter):
+    async def quote(request):
+        counter["requests"] += 1
+        await asyncio.sleep(latency)
+        amount = float(request.query["fromAmount"])
+        return web.json_response({
+            "tool": "standin",
+            "action": {"fromAmount": str(amount)},
+            "estimate": {"executionDuration": 120, "gasCosts": [], "fromAmount": str(amount),
+                         "toAmount": str(amount * 0.99), "toAmountMin": str(amount * 0.98)},
+            "transactionRequest": {"data": request.query["fromAmount"]}
+        })
+
+    app = web.Application()
+    app.router.add_get("/v1/quote", quote)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/v1"
+
+
+class SessionPerCallRouter(CrossChainRouter):
+    """get_lifi_route as it was: a fresh session per call and no cache"""
+
+    def __init__(self):
+        super().__init__()
+        self._call_sessions = {}
+
+    async def get_session(self):
+        session = self._call_sessions[asyncio.current_task()] = aiohttp.ClientSession()
+        return session
+
+    async def get_lifi_route(self, from_chain, to_chain, token_address, amount):
+        try:
+            return await self._fetch_lifi_route(from_chain, to_chain, token_address, amount)
+        finally:
+            await self._call_sessions.pop(asyncio.current_task()).close()
+
+
+async def run(label, router, counter, analyses):
+    before = counter["requests"]
+    started = time.perf_counter()
+    for i in range(analyses):
+        result = await router.analyze_cross_chain_route("polygon", TOKEN, str(1000 + i))
+        assert result["success"], result
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<18} {counter['requests'] - before:>4} Li.Fi requests  "
+          f"{elapsed / analyses * 1000:7.2f} ms per analysis")
+
+
+async def main():
+    analyses = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    counter = {"requests": 0}
+    runner, url = await start_lifi_standin(0.02, counter)
+
+    print(f"{analyses} analyses of one token from polygon, 20 ms Li.Fi latency")
+    legacy = SessionPerCallRouter()
+    legacy.lifi_base_url = url
+    await run("session per call", legacy, counter, analyses)
+
+    router = CrossChainRouter()
+    router.lifi_base_url = url
+    await run("shared + cache", router, counter, analyses)
+    print(f"  route cache: {router.route_cache.stats}")
+
+    await router.get_lifi_route("polygon", "ethereum", TOKEN, "1000")
+    route = await router.get_lifi_route("polygon", "ethereum", TOKEN, "1040")
+    estimate = route["route"]["estimate"]
+    assert route["cached"] and route["estimate_only"] and "transactionRequest" not in route["route"], route
+    assert abs(float(estimate["fromAmount"]) - 1040) < 1e-6, estimate
+    assert abs(float(estimate["toAmount"]) - 1040 * 0.99) < 1e-6, estimate
+    print(f"  hit for 1040 quoted at {route['quoted_amount']}: toAmount {estimate['toAmount']}, "
+          f"toAmountMin {estimate['toAmountMin']}")
+
+    await router.close()
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
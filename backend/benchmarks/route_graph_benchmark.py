@@ -0,0 +1,103 @@
+"""
+Benchmark for the route graph optimizer
+Builds a graph from the router's chain_configs plus synthetic venues for
+hundreds of output tokens, then times choosing a target chain and hops for
+every token from every source chain using the precomputed shortest-path tables,
+and checks the chosen costs against a brute-force search over all paths
+
+Run: python backend/benchmarks/route_graph_benchmark.py [tokens]
+"""
+
+import itertools
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cross_chain_router import CrossChainRouter
+from route_graph import (
+    DEFAULT_BRIDGE_ESTIMATES, DEFAULT_VENUES, TIME_COST_USD_PER_MINUTE, RouteGraph, liquidity_tier
+)
+
+
+def brute_force_score(graph, source, token, tier):
+    """Cheapest score over every simple path to every venue"""
+    best = float("inf")
+    for chain, venue in graph.venues[token].items():
+        if venue.liquidity_usd < tier:
+            continue
+        venue_score = venue.fee_usd + venue.seconds / 60 * TIME_COST_USD_PER_MINUTE
+        if chain == source:
+            best = min(best, venue_score)
+        middle = [c for c in graph.chains if c not in (source, chain)]
+        for length in range(len(middle) + 1):
+            for hops in itertools.permutations(middle, length):
+                path = (source, *hops, chain)
+                score = 0.0
+                for a, b in zip(path, path[1:]):
+                    weights = [e.weight() for e in graph.edges[a] if e.to_chain == b and e.liquidity_usd >= tier]
+                    if not weights:
+                        break
+                    score += min(weights)
+                else:
+                    best = min(best, score + venue_score)
+    return best
+
+
+def main():
+    token_count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    rng = random.Random(7)
+    router = CrossChainRouter()
+    chains = list(router.chain_configs)
+
+    venues = dict(DEFAULT_VENUES)
+    for i in range(token_count):
+        venues[f"TKN{i}"] = {
+            chain: (rng.uniform(1, 20), rng.uniform(15, 300), rng.choice([1e5, 1e6, 1e7, 1e8]))
+            for chain in rng.sample(chains, rng.randint(1, 3))
+        }
+    graph = RouteGraph.from_chain_configs(router.chain_configs, venues=venues)
+    for edge in itertools.chain.from_iterable(graph.edges.values()):
+        edge.fee_usd *= rng.uniform(0.5, 3)
+
+    started = time.perf_counter()
+    graph.precompute(tiers=(None, 5e3, 5e4))
+    print(f"{len(chains)} chains, {sum(map(len, graph.edges.values()))} bridge edges, {len(venues)} tokens")
+    print(f"  precompute      {(time.perf_counter() - started) * 1000:8.2f} ms")
+
+    started = time.perf_counter()
+    plans = {(source, amount): graph.best_routes(source, venues, amount)
+             for source in chains for amount in (None, 5e3, 5e4)}
+    elapsed = time.perf_counter() - started
+    lookups = len(plans) * len(venues)
+    print(f"  {lookups} lookups  {elapsed * 1000:8.2f} ms ({elapsed / lookups * 1e6:.1f} us each)")
+
+    for (source, amount), by_token in plans.items():
+        for token in list(venues)[:40]:
+            expected = brute_force_score(graph, source, token, liquidity_tier(amount))
+            assert abs(by_token[token].score - expected) < 1e-9, (source, token, by_token[token], expected)
+    print("  matches brute force for the first 40 tokens")
+
+    for token in ("DRB", "cbBTC"):
+        plan = graph.best_route("polygon", token)
+        print(f"  polygon -> {token}: {plan.target_chain} via "
+              f"{[(hop.provider, hop.to_chain) for hop in plan.hops]}, ${plan.cost_usd:.2f}, {plan.seconds:.0f}s")
+
+    # Quotes that agree with the estimates keep the tables; finality stays part of the edge time
+    graph = RouteGraph.from_chain_configs(router.chain_configs)
+    graph.precompute()
+    fee, seconds, _ = DEFAULT_BRIDGE_ESTIMATES["Li.Fi"]
+    edge = next(e for e in graph.edges["ethereum"] if e.provider == "Li.Fi" and e.to_chain == "base")
+    before = edge.seconds
+    for _ in range(20):
+        graph.observe("Li.Fi", "ethereum", "base", fee, seconds)
+    assert graph._tables and abs(edge.seconds - before) < 1e-6, (edge.seconds, before)
+    graph.observe("Li.Fi", "ethereum", "base", fee * 4, seconds)
+    assert not graph._tables
+    print(f"  20 matching observations kept the tables; ethereum -> base Li.Fi stays {edge.seconds:.0f}s with finality")
+
+
+if __name__ == "__main__":
+    main()
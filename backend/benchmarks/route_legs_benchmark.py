@@ -0,0 +1,84 @@
+"""
+Benchmark for concurrent route legs in analyze_cross_chain_route
+Serves Li.Fi quotes from a local stand-in with a different latency per leg
+(told apart by amount: the DRB leg is 8% of the burn, cbBTC 4%) and compares awaiting the DRB and cbBTC bridge legs one after the other
+with the concurrent analysis, which also asks Wormhole for every leg. A Li.Fi
+slower than the leg deadline must not stall the analysis; the Wormhole route
+is used instead
+
+Run: python backend/benchmarks/route_legs_benchmark.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aiohttp import web
+
+from cross_chain_router import CrossChainRouter
+
+TOKEN = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
+
+
+async def start_lifi_standin(latency):
+    async def quote(request):
+        leg = "drb" if float(request.query["fromAmount"]) > 60 else "cbbtc"
+        await asyncio.sleep(latency[leg])
+        return web.json_response({
+            "tool": "standin",
+            "estimate": {"executionDuration": 180, "gasCosts": [{"amountUSD": "3.10"}], "feeCosts": [{"amountUSD": "1.25"}]}
+        })
+
+    app = web.Application()
+    app.router.add_get("/v1/quote", quote)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/v1"
+
+
+async def sequential(router):
+    return [
+        await router.get_lifi_route("polygon", "base", TOKEN, "80"),
+        await router.get_lifi_route("polygon", "base", TOKEN, "40")
+    ]
+
+
+async def timed(label, analysis):
+    started = time.perf_counter()
+    result = await analysis()
+    print(f"  {label:<12} {(time.perf_counter() - started) * 1000:8.1f} ms")
+    return result
+
+
+async def main():
+    latency = {"drb": 0.15, "cbbtc": 0.25}
+    runner, url = await start_lifi_standin(latency)
+    router = CrossChainRouter(route_ttl=0, leg_deadline=0.5)
+    router.lifi_base_url = url
+
+    print("Two bridge legs from polygon, Li.Fi 150 ms for DRB and 250 ms for cbBTC")
+    await timed("sequential", lambda: sequential(router))
+    result = await timed("concurrent", lambda: router.analyze_cross_chain_route("polygon", TOKEN, "1000"))
+    picks = [route["bridge_info"]["bridge_provider"] for route in result["routes"][1:]]
+    print(f"  picked: {picks}   metadata: {result['metadata']}")
+    assert result["metadata"]["analysis_ms"] < 400
+
+    print("Li.Fi slower than the 0.5 s leg deadline")
+    latency["cbbtc"] = 3.0
+    result = await timed("concurrent", lambda: router.analyze_cross_chain_route("polygon", TOKEN, "1000"))
+    cbbtc_leg = result["routes"][2]["bridge_info"]
+    assert cbbtc_leg["bridge_provider"] == "Wormhole" and "Li.Fi" in cbbtc_leg["provider_errors"], cbbtc_leg
+    assert result["metadata"]["analysis_ms"] < 700
+    print(f"  cbBTC leg: {cbbtc_leg['bridge_provider']}, {cbbtc_leg['provider_errors']}")
+
+    await router.close()
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+"""
+Benchmark for micro-batched token metadata reads
+Reads decimals, symbol, name and balanceOf from the local JSON-RPC stand-in
+(rpc_standin.py) one eth_call per field, as the per-field contract calls did,
+and through read_token_metadata, which batches the calls; reports HTTP
+round-trips and latency for one token and for many tokens read concurrently
+
+Run: python backend/benchmarks/rpc_batcher_benchmark.py [tokens]
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from eth_account import Account
+
+from rpc_batcher import read_token_metadata
+from rpc_pool import RpcPool
+from rpc_standin import StandInChain
+
+ERC20_ABI = [
+    {"constant": True, "inputs": [], "name": name, "outputs": [{"name": "", "type": output}], "type": "function"}
+    for name, output in (("decimals", "uint8"), ("symbol", "string"), ("name", "string"))
+] + [{
+    "constant": True,
+    "inputs": [{"name": "_owner", "type": "address"}],
+    "name": "balanceOf",
+    "outputs": [{"name": "balance", "type": "uint256"}],
+    "type": "function"
+}]
+
+
+async def read_per_field(web3, token_address, holder):
+    contract = web3.eth.contract(address=token_address, abi=ERC20_ABI)
+    return {
+        "decimals": await contract.functions.decimals().call(),
+        "symbol": await contract.functions.symbol().call(),
+        "name": await contract.functions.name().call(),
+        "balance": await contract.functions.balanceOf(holder).call()
+    }
+
+
+async def measure(chain, label, reads):
+    before = chain.http_requests
+    started = time.perf_counter()
+    results = await reads()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<12} {chain.http_requests - before:>4} round-trips  {elapsed * 1000:8.1f} ms")
+    return results
+
+
+async def main():
+    token_count = int(sys.argv[1]) if len(sys.argv) > 1 else 25
+    chain = StandInChain(latency=0.03)
+    url = await chain.start()
+    pool = RpcPool({"base": [url]})
+    web3, batcher = pool.web3("base"), pool.batcher("base")
+    holder = Account.create().address
+    tokens = [Account.create().address for _ in range(token_count)]
+
+    print("One token, 30 ms RPC latency")
+    per_field = await measure(chain, "per field", lambda: read_per_field(web3, tokens[0], holder))
+    batched = await measure(chain, "batched", lambda: read_token_metadata(batcher, tokens[0], holder))
+    assert per_field == batched, (per_field, batched)
+
+    print(f"{token_count} tokens read concurrently")
+    per_field = await measure(chain, "per field", lambda: asyncio.gather(
+        *(read_per_field(web3, token, holder) for token in tokens)))
+    batched = await measure(chain, "batched", lambda: asyncio.gather(
+        *(read_token_metadata(batcher, token, holder) for token in tokens)))
+    assert per_field == batched
+
+    await pool.close()
+    await chain.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
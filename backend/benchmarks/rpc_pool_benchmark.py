@@ -0,0 +1,137 @@
+"""
+Benchmark for the RPC provider pool
+Starts three local JSON-RPC stand-ins (rpc_standin.py) with different
+latencies plus one dead URL, then:
+1. times eth_blockNumber through the pool against web3's default
+   AsyncHTTPProvider on the slowest endpoint
+2. shows how calls spread over the endpoints (fastest should dominate, the
+   dead one should be ejected)
+3. stops the fastest stand-in mid-run and checks calls fail over without errors
+4. sends a transaction through a gateway that forwards it to the chain and then
+   answers 502, checking it is not sent again through the other endpoints,
+   while a transaction whose first endpoint is unreachable still fails over
+
+Run: python backend/benchmarks/rpc_pool_benchmark.py [calls]
+"""
+
+import asyncio
+import socket
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import aiohttp
+from aiohttp import web
+from eth_account import Account
+from web3 import AsyncWeb3
+
+from rpc_pool import RpcPool, RpcSendUncertainError
+from rpc_standin import CHAIN_ID, StandInChain
+
+
+def dead_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+def print_metrics(pool):
+    for endpoint in pool.metrics()["base"]:
+        latency = f"{endpoint['latency_ms']:.1f}" if endpoint["latency_ms"] is not None else "-"
+        print(f"  {endpoint['url']:<28} requests {endpoint['requests']:>5}  errors {endpoint['errors']:>3}  "
+              f"latency {latency:>6} ms  ejected {endpoint['ejected']}")
+
+
+async def timed(calls, web3):
+    started = time.perf_counter()
+    for _ in range(calls):
+        await web3.eth.block_number
+    return (time.perf_counter() - started) / calls
+
+
+async def start_lossy_gateway(url):
+    """Forwards every request to url, then loses the response"""
+    async def forward(request):
+        async with aiohttp.ClientSession() as session:
+            async with session.post(url, data=await request.read(), headers={"Content-Type": "application/json"}):
+                pass
+        return web.Response(status=502)
+
+    app = web.Application()
+    app.router.add_post("/", forward)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+
+async def check_transactions_do_not_fail_over():
+    chain = StandInChain()
+    url = await chain.start()
+    runner, gateway = await start_lossy_gateway(url)
+    account = Account.create()
+
+    def transfer(nonce):
+        tx = {"to": account.address, "value": 0, "gas": 21000, "gasPrice": 10 ** 9, "nonce": nonce, "chainId": CHAIN_ID}
+        return account.sign_transaction(tx).rawTransaction
+
+    lossy = RpcPool({"base": [gateway, url]})
+    lossy.providers["base"].endpoints[1].latency = 1.0  # keep the gateway first
+    try:
+        await lossy.web3("base").eth.send_raw_transaction(transfer(0))
+        uncertain = None
+    except RpcSendUncertainError as e:
+        uncertain = e
+    unreachable = RpcPool({"base": [dead_url(), url]})
+    await unreachable.web3("base").eth.send_raw_transaction(transfer(1))
+    await asyncio.sleep(chain.block_time * 2)
+
+    print(f"lost response to a transaction: {type(uncertain).__name__}, "
+          f"mined {len(chain.mined)} of 2, collisions {chain.collisions}")
+    await lossy.close()
+    await unreachable.close()
+    await runner.cleanup()
+    await chain.stop()
+    assert uncertain is not None and chain.collisions == 0
+    assert sorted(tx["nonce"] for tx in chain.mined) == [0, 1]
+
+
+async def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    chains = [StandInChain(latency=latency) for latency in (0.005, 0.02, 0.05)]
+    urls = [await chain.start() for chain in chains]
+    dead = dead_url()
+
+    pool = RpcPool({"base": [dead, urls[2], urls[1], urls[0]]}, eject_seconds=60)
+    web3 = pool.web3("base")
+
+    plain = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(urls[2]))
+    print(f"default provider, slowest endpoint: {await timed(calls // 3, plain) * 1000:7.2f} ms/call")
+    print(f"pooled provider:                    {await timed(calls, web3) * 1000:7.2f} ms/call")
+    print_metrics(pool)
+
+    await chains[0].stop()
+    errors = 0
+    for _ in range(calls):
+        try:
+            await web3.eth.block_number
+        except Exception:
+            errors += 1
+    print(f"after stopping the fastest endpoint: {errors} failed calls out of {calls}")
+    print_metrics(pool)
+
+    await pool.close()
+    for chain in chains[1:]:
+        await chain.stop()
+    assert errors == 0
+
+    await check_transactions_do_not_fail_over()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,268 @@
+"""
+Local JSON-RPC stand-in chain for the wallet benchmarks
+Accepts signed legacy transactions, mines contiguous nonces into a block every
+block_time seconds and serves the handful of eth_* methods the wallet uses.
+ERC-20 transfer / approve calls and a Disperse contract at disperse_address are
+modelled well enough to produce Transfer logs, allowances and rough gas usage.
+Every request is delayed by latency to mimic a remote node
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Set
+
+import rlp
+from aiohttp import web
+from eth_abi import decode, encode
+from eth_account import Account
+from eth_utils import keccak, to_checksum_address
+
+CHAIN_ID = 31337
+TRANSFER_SELECTOR = bytes.fromhex("a9059cbb")
+APPROVE_SELECTOR = bytes.fromhex("095ea7b3")
+ALLOWANCE_SELECTOR = bytes.fromhex("dd62ed3e")
+DECIMALS_SELECTOR = bytes.fromhex("313ce567")
+SYMBOL_SELECTOR = bytes.fromhex("95d89b41")
+NAME_SELECTOR = bytes.fromhex("06fdde03")
+BALANCE_OF_SELECTOR = bytes.fromhex("70a08231")
+# Every address answers as an 18-decimal token with this balance for any holder
+STANDIN_BALANCE = 1_000_000 * 10 ** 18
+DISPERSE_TOKEN_SELECTOR = keccak(text="disperseToken(address,address[],uint256[])")[:4]
+TRANSFER_TOPIC = "0x" + keccak(text="Transfer(address,address,uint256)").hex()
+STANDIN_DISPERSE_ADDRESS = "0xd152f549545093347a162dce210e7293f1452150"
+
+# Rough EVM costs: 21k base, a cold-storage token transfer, and the extra
+# cost of each transferFrom made by the disperse contract
+BASE_TX_GAS = 21_000
+TOKEN_TRANSFER_GAS = 30_000
+DISPERSE_CALL_GAS = 8_000
+DISPERSE_LEG_GAS = 32_000
+APPROVE_GAS = 24_000
+
+
+def to_hex(value: int) -> str:
+    return hex(value)
+
+
+class RpcError(Exception):
+    def __init__(self, message: str, code: int = -32000):
+        super().__init__(message)
+        self.code = code
+
+
+class StandInChain:
+    """Minimal in-memory chain behind a JSON-RPC endpoint"""
+
+    def __init__(self, block_time: float = 0.2, latency: float = 0.02,
+                 reject_recipients: Optional[Set[str]] = None,
+                 disperse_address: str = STANDIN_DISPERSE_ADDRESS):
+        self.block_time = block_time
+        self.latency = latency
+        self.reject_recipients = {address.lower() for address in (reject_recipients or set())}
+        self.disperse_address = disperse_address.lower()
+        self.allowances: Dict[tuple, int] = {}
+
+        self.block_number = 0
+        self.confirmed_nonce: Dict[str, int] = {}
+        self.mempool: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self.receipts: Dict[str, Dict[str, Any]] = {}
+        self.mined: List[Dict[str, Any]] = []
+        self.collisions = 0
+        self.requests = 0
+        self.http_requests = 0
+
+        self._runner: Optional[web.AppRunner] = None
+        self._miner: Optional[asyncio.Task] = None
+        self.url = ""
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        app = web.Application()
+        app.router.add_post("/", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}"
+        self._miner = asyncio.create_task(self._mine_loop())
+        return self.url
+
+    async def stop(self):
+        if self._miner:
+            self._miner.cancel()
+        if self._runner:
+            await self._runner.cleanup()
+
+    def pending_nonce(self, sender: str) -> int:
+        nonce = self.confirmed_nonce.get(sender, 0)
+        pending = self.mempool.get(sender, {})
+        while nonce in pending:
+            nonce += 1
+        return nonce
+
+    def _decode(self, raw: bytes) -> Dict[str, Any]:
+        nonce, gas_price, gas, to, value, data, v, r, s = rlp.decode(raw)
+        return {
+            "from": Account.recover_transaction(raw).lower(),
+            "nonce": int.from_bytes(nonce, "big"),
+            "gas_price": int.from_bytes(gas_price, "big"),
+            "gas": int.from_bytes(gas, "big"),
+            "to": "0x" + to.hex(),
+            "data": data,
+            "hash": "0x" + keccak(raw).hex()
+        }
+
+    def send_raw_transaction(self, raw_hex: str) -> str:
+        tx = self._decode(bytes.fromhex(raw_hex[2:]))
+        sender = tx["from"]
+        if tx["nonce"] < self.confirmed_nonce.get(sender, 0):
+            raise RpcError("nonce too low")
+        pending = self.mempool.setdefault(sender, {})
+        if tx["nonce"] in pending:
+            self.collisions += 1
+            raise RpcError("replacement transaction underpriced")
+        if tx["data"][:4] == TRANSFER_SELECTOR:
+            recipient = "0x" + tx["data"][16:36].hex()
+            if recipient in self.reject_recipients:
+                raise RpcError("transfer rejected by stand-in")
+        pending[tx["nonce"]] = tx
+        return tx["hash"]
+
+    def _mine(self):
+        self.block_number += 1
+        block_hash = "0x" + keccak(self.block_number.to_bytes(32, "big")).hex()
+        index = 0
+        for sender, pending in self.mempool.items():
+            nonce = self.confirmed_nonce.get(sender, 0)
+            while nonce in pending:
+                tx = pending.pop(nonce)
+                status, logs = self.execute(tx, block_hash, index)
+                gas_used = self.gas_used(tx)
+                self.receipts[tx["hash"]] = {
+                    "transactionHash": tx["hash"],
+                    "transactionIndex": to_hex(index),
+                    "blockHash": block_hash,
+                    "blockNumber": to_hex(self.block_number),
+                    "from": to_checksum_address(sender),
+                    "to": to_checksum_address(tx["to"]),
+                    "gasUsed": to_hex(gas_used),
+                    "cumulativeGasUsed": to_hex(gas_used),
+                    "effectiveGasPrice": to_hex(tx["gas_price"]),
+                    "contractAddress": None,
+                    "logs": logs,
+                    "logsBloom": "0x" + "00" * 256,
+                    "status": to_hex(status),
+                    "type": "0x0"
+                }
+                self.mined.append(tx)
+                index += 1
+                nonce += 1
+            self.confirmed_nonce[sender] = nonce
+
+    def _transfer_log(self, token: str, sender: str, recipient: str, amount: int,
+                      tx: Dict[str, Any], block_hash: str, tx_index: int, log_index: int) -> Dict[str, Any]:
+        return {
+            "address": to_checksum_address(token),
+            "topics": [
+                TRANSFER_TOPIC,
+                "0x" + sender[2:].rjust(64, "0"),
+                "0x" + recipient.lower()[2:].rjust(64, "0")
+            ],
+            "data": "0x" + amount.to_bytes(32, "big").hex(),
+            "blockNumber": to_hex(self.block_number),
+            "blockHash": block_hash,
+            "transactionHash": tx["hash"],
+            "transactionIndex": to_hex(tx_index),
+            "logIndex": to_hex(log_index),
+            "removed": False
+        }
+
+    def execute(self, tx: Dict[str, Any], block_hash: str, tx_index: int):
+        """Apply a mined transaction; returns (status, logs). Balances are not modelled"""
+        data, sender, to = tx["data"], tx["from"], tx["to"]
+        if data[:4] == TRANSFER_SELECTOR:
+            recipient, amount = decode(["address", "uint256"], data[4:])
+            return 1, [self._transfer_log(to, sender, recipient, amount, tx, block_hash, tx_index, 0)]
+        if data[:4] == APPROVE_SELECTOR:
+            spender, amount = decode(["address", "uint256"], data[4:])
+            self.allowances[(to, sender, spender.lower())] = amount
+            return 1, []
+        if to == self.disperse_address and data[:4] == DISPERSE_TOKEN_SELECTOR:
+            token, recipients, values = decode(["address", "address[]", "uint256[]"], data[4:])
+            key = (token.lower(), sender, self.disperse_address)
+            if len(recipients) != len(values) or self.allowances.get(key, 0) < sum(values):
+                return 0, []
+            self.allowances[key] -= sum(values)
+            return 1, [
+                self._transfer_log(token.lower(), sender, recipient, amount, tx, block_hash, tx_index, index)
+                for index, (recipient, amount) in enumerate(zip(recipients, values))
+            ]
+        return 1, []
+
+    def gas_used(self, tx: Dict[str, Any]) -> int:
+        """Rough gas model: base cost, calldata and the token transfers made"""
+        data = tx["data"]
+        gas = BASE_TX_GAS + sum(4 if byte == 0 else 16 for byte in data)
+        if data[:4] == TRANSFER_SELECTOR:
+            gas += TOKEN_TRANSFER_GAS
+        elif data[:4] == APPROVE_SELECTOR:
+            gas += APPROVE_GAS
+        elif data[:4] == DISPERSE_TOKEN_SELECTOR:
+            recipients = decode(["address", "address[]", "uint256[]"], data[4:])[1]
+            gas += DISPERSE_CALL_GAS + DISPERSE_LEG_GAS * len(recipients)
+        return gas
+
+    def call(self, call: Dict[str, Any]) -> str:
+        data = bytes.fromhex(call.get("data", call.get("input", "0x"))[2:])
+        if data[:4] == ALLOWANCE_SELECTOR:
+            owner, spender = decode(["address", "address"], data[4:])
+            amount = self.allowances.get((call["to"].lower(), owner.lower(), spender.lower()), 0)
+            return "0x" + encode(["uint256"], [amount]).hex()
+        if data[:4] == DECIMALS_SELECTOR:
+            return "0x" + encode(["uint8"], [18]).hex()
+        if data[:4] == SYMBOL_SELECTOR:
+            return "0x" + encode(["string"], ["TKN" + call["to"][2:6].upper()]).hex()
+        if data[:4] == NAME_SELECTOR:
+            return "0x" + encode(["string"], ["Stand-in Token " + call["to"][2:10]]).hex()
+        if data[:4] == BALANCE_OF_SELECTOR:
+            return "0x" + encode(["uint256"], [STANDIN_BALANCE]).hex()
+        raise RpcError("execution reverted")
+
+    async def _mine_loop(self):
+        while True:
+            await asyncio.sleep(self.block_time)
+            self._mine()
+
+    def dispatch(self, method: str, params: List[Any]) -> Any:
+        if method == "eth_chainId":
+            return to_hex(CHAIN_ID)
+        if method == "eth_blockNumber":
+            return to_hex(self.block_number)
+        if method == "eth_gasPrice":
+            return to_hex(1_000_000_000)
+        if method == "eth_getTransactionCount":
+            sender = params[0].lower()
+            if len(params) > 1 and params[1] == "pending":
+                return to_hex(self.pending_nonce(sender))
+            return to_hex(self.confirmed_nonce.get(sender, 0))
+        if method == "eth_sendRawTransaction":
+            return self.send_raw_transaction(params[0])
+        if method == "eth_getTransactionReceipt":
+            return self.receipts.get(params[0])
+        if method == "eth_call":
+            return self.call(params[0])
+        raise RpcError(f"Method {method} not supported", code=-32601)
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.http_requests += 1
+        body = await request.json()
+        await asyncio.sleep(self.latency)
+        calls = body if isinstance(body, list) else [body]
+        responses = []
+        for call in calls:
+            self.requests += 1
+            try:
+                result = self.dispatch(call["method"], call.get("params", []))
+                responses.append({"jsonrpc": "2.0", "id": call["id"], "result": result})
+            except RpcError as e:
+                responses.append({"jsonrpc": "2.0", "id": call["id"], "error": {"code": e.code, "message": str(e)}})
+        return web.json_response(responses if isinstance(body, list) else responses[0])
@@ -0,0 +1,84 @@
+"""
+Microbenchmark for the token classifier
+Compares the compiled index against the legacy linear substring scan while the
+burnable / non-burnable lists grow to tens of thousands of contract addresses
+
+Run: python backend/benchmarks/token_classifier_benchmark.py
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from token_classifier import TokenClassifier
+
+BASE_BURNABLE = ["drb", "$drb", "drb token", "bnkr", "$bnkr", "banker", "banker token", "banker club"]
+BASE_NON_BURNABLE = ["btc", "bitcoin", "eth", "ethereum", "usdc", "usdt", "pepe", "sol", "solana", "link"]
+
+LIST_SIZES = [100, 1_000, 10_000, 50_000]
+LOOKUPS = 20_000
+LEGACY_LOOKUPS = 200
+
+
+def legacy_is_token_burnable(token_identifier, burnable, non_burnable):
+    """The original per-request scan from server.py"""
+    if not token_identifier:
+        return False
+    token_lower = str(token_identifier).lower().strip()
+    for burnable_token in burnable:
+        if burnable_token.lower() in token_lower or token_lower in burnable_token.lower():
+            return True
+    for non_burnable_token in non_burnable:
+        if non_burnable_token.lower() in token_lower or token_lower in non_burnable_token.lower():
+            return False
+    return False
+
+
+def random_address(rng):
+    return "0x" + "".join(rng.choice("0123456789abcdef") for _ in range(40))
+
+
+def time_per_call(func, values):
+    start = time.perf_counter()
+    for value in values:
+        func(value)
+    return (time.perf_counter() - start) / len(values) * 1e9
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'entries':>8} {'build ms':>9} {'index ns':>9} {'legacy ns':>10} {'speedup':>8}")
+
+    for size in LIST_SIZES:
+        burnable = BASE_BURNABLE + [random_address(rng) for _ in range(size // 10)]
+        non_burnable = BASE_NON_BURNABLE + [random_address(rng) for _ in range(size - size // 10)]
+
+        start = time.perf_counter()
+        classifier = TokenClassifier(burnable, non_burnable)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        # Mix of listed addresses, unlisted addresses and symbols
+        probes = (
+            rng.sample(burnable[len(BASE_BURNABLE):], min(50, size // 10))
+            + [random_address(rng) for _ in range(50)]
+            + ["DRB", "pepe", "newcoin", "Banker Club"]
+        )
+        for probe in probes:
+            expected = legacy_is_token_burnable(probe, burnable, non_burnable)
+            assert classifier.is_burnable(probe) == expected, probe
+
+        index_values = [rng.choice(probes) for _ in range(LOOKUPS)]
+        legacy_values = index_values[:LEGACY_LOOKUPS]
+
+        index_ns = time_per_call(classifier.is_burnable, index_values)
+        legacy_ns = time_per_call(
+            lambda value: legacy_is_token_burnable(value, burnable, non_burnable), legacy_values
+        )
+        print(f"{size:>8} {build_ms:>9.1f} {index_ns:>9.0f} {legacy_ns:>10.0f} {legacy_ns / index_ns:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
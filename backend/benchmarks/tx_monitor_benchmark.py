@@ -0,0 +1,189 @@
+"""
+Benchmark for the batched cross-chain transaction monitor
+Two local stand-in chains (an EVM chain with 50 ms blocks and a Solana-like
+chain with 20 ms slots) include a few hundred transactions each over their
+first blocks. Polling every transaction on its own, as clients did through the
+per-hash monitor endpoint, is compared with TxMonitor, which checks each chain
+in one batch per block and pushes confirmations to a subscriber. Hashes that are
+never mined must be dropped after the pending timeout, and the watched set must
+stay within its cap
+
+Run: python backend/benchmarks/tx_monitor_benchmark.py
+"""
+
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aiohttp import web
+
+from rpc_pool import RpcPool
+from tx_monitor import DROPPED, FINAL_STATUSES, REQUIRED_CONFIRMATIONS, TxMonitor
+
+EVM_TXS = 300
+SOLANA_TXS = 600
+# Slots after inclusion until a Solana stand-in transaction is finalized
+SOLANA_FINALITY_SLOTS = 10
+
+
+class StandInChain:
+    """Chain whose head advances every block_time; each transaction lands in a fixed block"""
+
+    def __init__(self, kind: str, block_time: float, hashes, latency: float = 0.005):
+        self.kind = kind
+        self.block_time = block_time
+        self.latency = latency
+        self.included = {tx_hash: random.randint(1, 10) for tx_hash in hashes}
+        self.started = time.monotonic()
+        self.http_requests = 0
+
+    def head(self) -> int:
+        return int((time.monotonic() - self.started) / self.block_time)
+
+    def evm_call(self, call):
+        head = self.head()
+        if call["method"] == "eth_blockNumber":
+            return hex(head)
+        block = self.included.get(call["params"][0])
+        if block is None or block > head:
+            return None
+        return {"blockNumber": hex(block), "status": "0x1"}
+
+    def solana_call(self, call):
+        head = self.head()
+        value = []
+        for signature in call["params"][0]:
+            slot = self.included.get(signature)
+            if slot is None or slot > head:
+                value.append(None)
+            elif head - slot >= SOLANA_FINALITY_SLOTS:
+                value.append({"slot": slot, "confirmations": None, "err": None, "confirmationStatus": "finalized"})
+            else:
+                value.append({"slot": slot, "confirmations": head - slot, "err": None, "confirmationStatus": "confirmed"})
+        return {"context": {"slot": head}, "value": value}
+
+    async def handle(self, request):
+        self.http_requests += 1
+        await asyncio.sleep(self.latency)
+        payload = await request.json()
+        answer = self.evm_call if self.kind == "evm" else self.solana_call
+        calls = payload if isinstance(payload, list) else [payload]
+        responses = [{"jsonrpc": "2.0", "id": call["id"], "result": answer(call)} for call in calls]
+        return web.json_response(responses if isinstance(payload, list) else responses[0])
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        return f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/"
+
+
+async def per_transaction(pool, transactions, interval):
+    """Every transaction polled on its own until it is final"""
+    async def poll(tx_hash, chain):
+        provider = pool.provider(chain)
+        while True:
+            if chain == "solana":
+                response = await provider.post({"jsonrpc": "2.0", "id": 1, "method": "getSignatureStatuses",
+                                                "params": [[tx_hash], {"searchTransactionHistory": True}]})
+                status = response["result"]["value"][0]
+                if status and status["confirmationStatus"] == "finalized":
+                    return
+            else:
+                receipt = (await provider.post({"jsonrpc": "2.0", "id": 1, "method": "eth_getTransactionReceipt",
+                                                "params": [tx_hash]}))["result"]
+                head = int((await provider.post({"jsonrpc": "2.0", "id": 2, "method": "eth_blockNumber",
+                                                 "params": []}))["result"], 16)
+                if receipt and head - int(receipt["blockNumber"], 16) + 1 >= REQUIRED_CONFIRMATIONS["base"]:
+                    return
+            await asyncio.sleep(interval)
+
+    await asyncio.gather(*(poll(tx_hash, chain) for tx_hash, chain in transactions))
+
+
+async def monitored(monitor, transactions):
+    """Subscribe, hand everything to the monitor and wait for pushed final statuses"""
+    updates = monitor.subscribe(transactions)
+    await monitor.check(transactions)
+    final = {(update["tx_hash"], update["chain"]) for update in (monitor.status(*tx) for tx in transactions)
+             if update and update["status"] in FINAL_STATUSES}
+    while len(final) < len(transactions):
+        update = await updates.get()
+        if update["status"] in FINAL_STATUSES:
+            final.add((update["tx_hash"], update["chain"]))
+    monitor.unsubscribe(updates)
+
+
+async def never_mined(pool):
+    """Hashes no chain knows about are dropped after pending_timeout and never exceed max_watched"""
+    monitor = TxMonitor(pool, min_interval=0.01, max_watched=100, pending_timeout=0.3)
+    monitor.block_times["base"] = 0.05
+    fakes = [(f"0x{index:064x}", "base") for index in range(10_000, 10_150)]
+    updates = monitor.subscribe(fakes)
+    results = await monitor.check(fakes)
+    rejected = [result for result in results if result.get("watched") is False]
+    started = time.perf_counter()
+    dropped = 0
+    while dropped < len(fakes) - len(rejected):
+        update = await asyncio.wait_for(updates.get(), timeout=5)
+        dropped += update["status"] == DROPPED
+    await asyncio.sleep(0.2)
+    metrics = monitor.metrics()
+    print(f"  never mined: {len(rejected)} of {len(fakes)} rejected at the cap, {dropped} dropped after "
+          f"{(time.perf_counter() - started) * 1000:.0f} ms, still watched: {metrics['watched']}")
+    assert len(rejected) == len(fakes) - monitor.max_watched, len(rejected)
+    assert not metrics["watched"], metrics
+    assert monitor._pollers["base"].done()
+    await monitor.close()
+
+
+async def run(label, chains, work):
+    evm, solana = chains
+    for chain in chains:
+        chain.started = time.monotonic()
+        chain.http_requests = 0
+    started = time.perf_counter()
+    await work()
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"  {label:<16} {elapsed:8.1f} ms   HTTP requests: evm {evm.http_requests:5d}, solana {solana.http_requests:5d}")
+    return evm.http_requests + solana.http_requests, elapsed
+
+
+async def main():
+    random.seed(7)
+    evm_hashes = [f"0x{index:064x}" for index in range(EVM_TXS)]
+    solana_hashes = [f"sig{index:085d}" for index in range(SOLANA_TXS)]
+    evm = StandInChain("evm", 0.05, evm_hashes)
+    solana = StandInChain("solana", 0.02, solana_hashes)
+    pool = RpcPool({"base": [await evm.start()], "solana": [await solana.start()]})
+    transactions = [(tx_hash, "base") for tx_hash in evm_hashes] + [(sig, "solana") for sig in solana_hashes]
+
+    print(f"{EVM_TXS} EVM transactions (50 ms blocks, 6 confirmations), {SOLANA_TXS} Solana (20 ms slots)")
+    baseline, baseline_ms = await run("per transaction", (evm, solana), lambda: per_transaction(pool, transactions, 0.05))
+
+    monitor = TxMonitor(pool, min_interval=0.01)
+    # Start from guesses a few times too slow; the monitor has to measure the real block times
+    monitor.block_times.update(base=0.2, solana=0.1)
+    batched, monitor_ms = await run("monitor", (evm, solana), lambda: monitored(monitor, transactions))
+    print(f"  measured block times: base {monitor.block_times['base'] * 1000:.0f} ms, "
+          f"solana {monitor.block_times['solana'] * 1000:.0f} ms   metrics: {monitor.metrics()}")
+    assert batched * 10 < baseline, (batched, baseline)
+    assert monitor_ms < baseline_ms * 1.5, (monitor_ms, baseline_ms)
+    assert abs(monitor.block_times["base"] - 0.05) < 0.03, monitor.block_times
+
+    await monitor.close()
+    await never_mined(pool)
+    await pool.close()
+    await evm.runner.cleanup()
+    await solana.runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
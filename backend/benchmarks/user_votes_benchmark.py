@@ -0,0 +1,109 @@
+"""
+Benchmark for the wallet voting history query
+Seeds a throwaway database with projects and votes, then counts the commands
+sent to MongoDB by the legacy find_one-per-vote loop and by the $lookup
+aggregation in vote_queries, along with wall-clock time per request
+
+Needs a reachable MongoDB (MONGO_URL, default mongodb://localhost:27017)
+Run: python backend/benchmarks/user_votes_benchmark.py [votes ...]
+"""
+
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import DESCENDING, monitoring
+
+from db_indexes import INDEX_SPECS, ensure_indexes
+from vote_queries import fetch_user_votes
+
+DATABASE = "burn_relief_bot_benchmark"
+WALLET = "0xbenchmarkvoter"
+REPEATS = 20
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts commands (round-trips) issued to the server"""
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+async def legacy_user_votes(db, wallet_address):
+    """The original get_user_votes loop from server.py"""
+    votes = []
+    cursor = db.votes.find({"voter_wallet": wallet_address}).sort("timestamp", DESCENDING)
+    async for vote in cursor:
+        vote["_id"] = str(vote["_id"])
+        project = await db.projects.find_one({"id": vote["project_id"]})
+        if project:
+            vote["project_name"] = project["name"]
+        votes.append(vote)
+    return votes
+
+
+async def seed(db, vote_count):
+    await db.votes.delete_many({})
+    await db.projects.delete_many({})
+    now = datetime.utcnow()
+    projects = [{"id": str(uuid.uuid4()), "name": f"Project {i}", "status": "active"} for i in range(vote_count)]
+    await db.projects.insert_many(projects)
+    await db.votes.insert_many([
+        {
+            "id": str(uuid.uuid4()),
+            "voter_wallet": WALLET,
+            "project_id": project["id"],
+            "timestamp": now - timedelta(minutes=i)
+        }
+        for i, project in enumerate(projects)
+    ])
+
+
+async def measure(counter, query):
+    counter.count = 0
+    started = time.perf_counter()
+    for _ in range(REPEATS):
+        votes = await query()
+    elapsed = (time.perf_counter() - started) / REPEATS
+    return votes, counter.count // REPEATS, elapsed
+
+
+async def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10, 50, 200, 1000]
+    counter = CommandCounter()
+    client = AsyncIOMotorClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"), event_listeners=[counter])
+    db = client[DATABASE]
+    try:
+        await ensure_indexes(db, {name: INDEX_SPECS[name] for name in ("votes", "projects")})
+        print(f"{'votes':>6} {'legacy cmds':>12} {'legacy ms':>10} {'lookup cmds':>12} {'lookup ms':>10}")
+        for size in sizes:
+            await seed(db, size)
+            legacy, legacy_cmds, legacy_time = await measure(counter, lambda: legacy_user_votes(db, WALLET))
+            joined, joined_cmds, joined_time = await measure(counter, lambda: fetch_user_votes(db.votes, WALLET))
+
+            if [v.get("project_name") for v in legacy] != [v.get("project_name") for v in joined]:
+                raise SystemExit(f"Mismatched results for {size} votes")
+            print(f"{size:>6} {legacy_cmds:>12} {legacy_time * 1000:>10.2f} {joined_cmds:>12} {joined_time * 1000:>10.2f}")
+    finally:
+        await client.drop_database(DATABASE)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -5,15 +5,17 @@ Handles Uniswap V3 (EVM chains) and Jupiter (Solana) integrations
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional, Tuple
+import os
+from typing import Dict, Any, List, Optional, Tuple
 from decimal import Decimal
 import json
 
+import aiohttp
+
 # Web3 and Ethereum imports
-from web3 import Web3
+from web3 import AsyncWeb3
 from eth_account import Account
 from eth_utils import to_checksum_address
-import requests
 
 # Solana imports
 from solana.rpc.async_api import AsyncClient
@@ -25,13 +27,21 @@ from solders.keypair import Keypair
 # Uniswap Python imports
 from uniswap import Uniswap
 
+from rpc_pool import RpcPool, parse_rpc_urls
+from price_service import PriceService
+from quote_cache import SwapQuoteCache, swap_quote_cache
+
 logger = logging.getLogger(__name__)
 
+JUPITER_QUOTE_URL = "https://quote-api.jup.ag/v6/quote"
+# Longest a single quote leg may take before the burn plan goes ahead without it
+QUOTE_TIMEOUT_SECONDS = float(os.getenv("QUOTE_TIMEOUT_SECONDS", "5"))
+
 class BlockchainService:
     """Service for handling real blockchain transactions"""
     
-    def __init__(self):
-        self.web3_clients = {}
+    def __init__(self, rpc_pool: Optional[RpcPool] = None, price_service: Optional[PriceService] = None,
+                 quote_cache: Optional[SwapQuoteCache] = None):
         self.solana_client = None
         self.uniswap_clients = {}
         
@@ -77,16 +87,38 @@ class BlockchainService:
         
         self.burn_address = "0x000000000000000000000000000000000000dEaD"
         
-    def init_web3_client(self, chain: str) -> Web3:
-        """Initialize Web3 client for a specific chain"""
-        if chain not in self.web3_clients:
-            chain_config = self.chains.get(chain)
-            if not chain_config:
-                raise ValueError(f"Unsupported chain: {chain}")
-            
-            self.web3_clients[chain] = Web3(Web3.HTTPProvider(chain_config["rpc_url"]))
+        # <CHAIN>_RPC_URLS (comma-separated) adds failover endpoints per chain
+        self.rpc_pool = rpc_pool or RpcPool({
+            chain: parse_rpc_urls(os.getenv(f"{chain.upper()}_RPC_URLS"), [config["rpc_url"]])
+            for chain, config in self.chains.items()
+        })
+        self.price_service = price_service or PriceService(api_key=os.getenv("COINGECKO_API_KEY"))
+        self.quote_timeout = QUOTE_TIMEOUT_SECONDS
+        # Preview traffic for popular pairs is served from short-lived cached quotes,
+        # the same cache the API reports (None when SWAP_QUOTE_CACHE is off)
+        self.quote_cache = quote_cache if quote_cache is not None else swap_quote_cache
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Keep-alive session for aggregator APIs"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=50, keepalive_timeout=60, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._session
+    
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        await self.price_service.close()
+        await self.rpc_pool.close()
         
-        return self.web3_clients[chain]
+    def init_web3_client(self, chain: str) -> AsyncWeb3:
+        """Get the pooled async Web3 client for a specific chain"""
+        if chain not in self.chains:
+            raise ValueError(f"Unsupported chain: {chain}")
+        return self.rpc_pool.web3(chain)
     
     async def init_solana_client(self) -> AsyncClient:
         """Initialize Solana client"""
@@ -97,25 +129,7 @@ class BlockchainService:
     async def get_token_price(self, token_address: str, chain: str) -> Optional[float]:
         """Get token price from CoinGecko or DEX"""
         try:
-            # For demo purposes, use CoinGecko API
-            if chain == "solana":
-                # Solana token price lookup
-                url = f"https://api.coingecko.com/api/v3/simple/token_price/solana?contract_addresses={token_address}&vs_currencies=usd"
-            else:
-                # Ethereum-based chains
-                platform_map = {
-                    "ethereum": "ethereum",
-                    "base": "base",
-                    "polygon": "polygon-pos",
-                    "arbitrum": "arbitrum-one"
-                }
-                platform = platform_map.get(chain, "ethereum")
-                url = f"https://api.coingecko.com/api/v3/simple/token_price/{platform}?contract_addresses={token_address}&vs_currencies=usd"
-            
-            response = requests.get(url, timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                return data.get(token_address.lower(), {}).get("usd", 0.0)
+            return await self.price_service.get_price(token_address, chain)
         except Exception as e:
             logger.error(f"Error fetching token price: {e}")
         
@@ -128,21 +142,27 @@ class BlockchainService:
                            chain: str) -> Dict[str, Any]:
         """Get swap quote from DEX"""
         try:
-            if chain == "solana":
-                return await self._get_jupiter_quote(input_token, output_token, amount)
-            else:
-                return await self._get_uniswap_quote(input_token, output_token, amount, chain)
+            if self.quote_cache is None:
+                return await self._fetch_swap_quote(input_token, output_token, amount, chain)
+            return await self.quote_cache.get_quote(
+                chain, input_token, output_token, amount,
+                lambda: self._fetch_swap_quote(input_token, output_token, amount, chain)
+            )
         except Exception as e:
             logger.error(f"Error getting swap quote: {e}")
             return {"error": str(e)}
     
+    async def _fetch_swap_quote(self, input_token: str, output_token: str, amount: str, chain: str) -> Dict[str, Any]:
+        if chain == "solana":
+            return await self._get_jupiter_quote(input_token, output_token, amount)
+        return await self._get_uniswap_quote(input_token, output_token, amount, chain)
+    
     async def _get_jupiter_quote(self, 
                                input_mint: str, 
                                output_mint: str, 
                                amount: str) -> Dict[str, Any]:
         """Get quote from Jupiter aggregator"""
         try:
-            url = "https://quote-api.jup.ag/v6/quote"
             params = {
                 "inputMint": input_mint,
                 "outputMint": output_mint,
@@ -150,11 +170,11 @@ class BlockchainService:
                 "slippageBps": 300  # 3% slippage
             }
             
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return {"error": f"Jupiter API error: {response.status_code}"}
+            session = await self.get_session()
+            async with session.get(JUPITER_QUOTE_URL, params=params) as response:
+                if response.status == 200:
+                    return await response.json(content_type=None)
+                return {"error": f"Jupiter API error: {response.status}"}
         except Exception as e:
             return {"error": f"Jupiter quote error: {str(e)}"}
     
@@ -182,6 +202,22 @@ class BlockchainService:
         except Exception as e:
             return {"error": f"Uniswap quote error: {str(e)}"}
     
+    async def _quote_legs(self, legs: List[Tuple[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Run every (name, quote coroutine) leg at once, each bounded by quote_timeout.
+        A leg that fails or times out gets an error quote instead of failing the others"""
+        async def run(name: str, quote) -> Dict[str, Any]:
+            try:
+                return await asyncio.wait_for(quote, timeout=self.quote_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Quote leg {name} timed out after {self.quote_timeout}s")
+                return {"error": f"Quote timed out after {self.quote_timeout}s"}
+            except Exception as e:
+                logger.error(f"Quote leg {name} failed: {e}")
+                return {"error": str(e)}
+        
+        quotes = await asyncio.gather(*(run(name, quote) for name, quote in legs))
+        return {name: quote for (name, _), quote in zip(legs, quotes)}
+    
     async def execute_burn_transaction(self, 
                                      token_address: str, 
                                      amount: str, 
@@ -240,10 +276,19 @@ class BlockchainService:
             }
             transactions.append(burn_tx)
             
-            # 2. Swap 6% to DRB
+            # 2./3. Quote the DRB and cbBTC swaps concurrently
             drb_token = self.tokens["DRB"].get(chain)
+            cbbtc_token = self.tokens["cbBTC"].get(chain)
+            legs = []
             if drb_token:
-                swap_quote = await self.get_swap_quote(token_address, drb_token, str(drb_amount), chain)
+                legs.append(("swap_to_drb", self.get_swap_quote(token_address, drb_token, str(drb_amount), chain)))
+            if cbbtc_token:
+                legs.append(("swap_to_cbbtc", self.get_swap_quote(token_address, cbbtc_token, str(cbbtc_amount), chain)))
+            quotes = await self._quote_legs(legs)
+            
+            # 2. Swap 6% to DRB
+            if drb_token:
+                swap_quote = quotes["swap_to_drb"]
                 drb_tx = {
                     "type": "swap_to_drb",
                     "amount": str(drb_amount),
@@ -256,9 +301,8 @@ class BlockchainService:
                 transactions.append(drb_tx)
             
             # 3. Swap 6% to cbBTC
-            cbbtc_token = self.tokens["cbBTC"].get(chain)
             if cbbtc_token:
-                swap_quote = await self.get_swap_quote(token_address, cbbtc_token, str(cbbtc_amount), chain)
+                swap_quote = quotes["swap_to_cbbtc"]
                 cbbtc_tx = {
                     "type": "swap_to_cbbtc",
                     "amount": str(cbbtc_amount),
@@ -275,7 +319,8 @@ class BlockchainService:
                 "chain": chain,
                 "transactions": transactions,
                 "total_gas_estimate": "450000",
-                "estimated_completion": "2-5 minutes"
+                "estimated_completion": "2-5 minutes",
+                "failed_quotes": [name for name, quote in quotes.items() if "error" in quote]
             }
             
         except Exception as e:
@@ -307,8 +352,14 @@ class BlockchainService:
             }
             transactions.append(burn_tx)
             
+            # 2./3. Quote both Jupiter swaps concurrently
+            quotes = await self._quote_legs([
+                ("swap_to_drb", self._get_jupiter_quote(token_address, "DRB_SOLANA_MINT", str(drb_amount))),
+                ("swap_to_cbbtc", self._get_jupiter_quote(token_address, "CBBTC_SOLANA_MINT", str(cbbtc_amount)))
+            ])
+            
             # 2. Swap 6% to DRB (via Jupiter)
-            drb_quote = await self._get_jupiter_quote(token_address, "DRB_SOLANA_MINT", str(drb_amount))
+            drb_quote = quotes["swap_to_drb"]
             drb_tx = {
                 "type": "swap_to_drb",
                 "amount": str(drb_amount),
@@ -320,7 +371,7 @@ class BlockchainService:
             transactions.append(drb_tx)
             
             # 3. Swap 6% to cbBTC (via Jupiter)
-            cbbtc_quote = await self._get_jupiter_quote(token_address, "CBBTC_SOLANA_MINT", str(cbbtc_amount))
+            cbbtc_quote = quotes["swap_to_cbbtc"]
             cbbtc_tx = {
                 "type": "swap_to_cbbtc", 
                 "amount": str(cbbtc_amount),
@@ -336,7 +387,8 @@ class BlockchainService:
                 "chain": "solana",
                 "transactions": transactions,
                 "total_compute_units": "200000",
-                "estimated_completion": "30 seconds"
+                "estimated_completion": "30 seconds",
+                "failed_quotes": [name for name, quote in quotes.items() if "error" in quote]
             }
             
         except Exception as e:
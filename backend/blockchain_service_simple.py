@@ -13,6 +13,8 @@ import requests
 # Web3 imports
 from web3 import Web3
 
+from price_service import PriceService
+
 logger = logging.getLogger(__name__)
 
 class BlockchainService:
@@ -20,6 +22,7 @@ class BlockchainService:
     
     def __init__(self):
         self.web3_clients = {}
+        self.price_service = PriceService()
         
         # Chain configurations  
         self.chains = {
@@ -80,22 +83,7 @@ class BlockchainService:
     async def get_token_price(self, token_address: str, chain: str) -> Optional[float]:
         """Get token price from CoinGecko"""
         try:
-            if chain == "solana":
-                url = f"https://api.coingecko.com/api/v3/simple/token_price/solana?contract_addresses={token_address}&vs_currencies=usd"
-            else:
-                platform_map = {
-                    "ethereum": "ethereum",
-                    "base": "base", 
-                    "polygon": "polygon-pos",
-                    "arbitrum": "arbitrum-one"
-                }
-                platform = platform_map.get(chain, "ethereum")
-                url = f"https://api.coingecko.com/api/v3/simple/token_price/{platform}?contract_addresses={token_address}&vs_currencies=usd"
-            
-            response = requests.get(url, timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                return data.get(token_address.lower(), {}).get("usd", 0.0)
+            return await self.price_service.get_price(token_address, chain)
         except Exception as e:
             logger.error(f"Error fetching token price: {e}")
         
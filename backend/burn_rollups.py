@@ -0,0 +1,323 @@
+"""
+Burn rollups for Burn Relief Bot - Hourly and daily burn totals per wallet, token and chain
+Rollup documents are upserted as burns complete, so windowed leaderboards and
+volume charts read a bounded number of buckets instead of scanning burns
+"""
+
+import logging
+import re
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+
+from burn_stats import REBUILD_SETTLE, completed_burn_amounts, completed_since, to_decimal, to_decimal128
+from leaderboard import burn_wallet
+
+logger = logging.getLogger(__name__)
+
+HOUR = "hour"
+DAY = "day"
+GRANULARITIES = {HOUR: timedelta(hours=1), DAY: timedelta(days=1)}
+
+# Rollups are kept per dimension key, plus one "all" series for global charts
+DIMENSIONS = ("wallet", "token", "chain", "all")
+ALL_KEY = "*"
+
+# Hourly buckets are only needed for short windows
+HOURLY_RETENTION = timedelta(days=90)
+# Windows up to this length are served from hourly buckets
+HOURLY_WINDOW_LIMIT = timedelta(hours=48)
+
+BURN_PROJECTION = {
+    "_id": 0, "wallet_address": 1, "wallet": 1, "token_address": 1, "chain": 1,
+    "amount": 1, "total_amount": 1, "timestamp": 1
+}
+
+_WINDOW_RE = re.compile(r"^(\d+)([hdw])$")
+_WINDOW_UNITS = {"h": timedelta(hours=1), "d": timedelta(days=1), "w": timedelta(weeks=1)}
+MAX_WINDOW = timedelta(days=366)
+
+
+def parse_window(window: str) -> timedelta:
+    """Parse windows such as 24h, 7d or 4w"""
+    match = _WINDOW_RE.match(str(window).strip().lower())
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"Invalid window '{window}', expected e.g. 24h, 7d or 4w")
+    span = int(match.group(1)) * _WINDOW_UNITS[match.group(2)]
+    if span > MAX_WINDOW:
+        raise ValueError("Window cannot be longer than 366 days")
+    return span
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    """Floor a timestamp to the start of its bucket"""
+    if granularity == HOUR:
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def granularity_for(span: timedelta) -> str:
+    return HOUR if span <= HOURLY_WINDOW_LIMIT else DAY
+
+
+def burn_dimension_keys(burn: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """(dimension, key) pairs a burn is rolled up under"""
+    keys = [("all", ALL_KEY), ("chain", str(burn.get("chain") or "base").lower())]
+    wallet = burn_wallet(burn)
+    if wallet:
+        keys.append(("wallet", wallet))
+    token = burn.get("token_address")
+    if token:
+        keys.append(("token", str(token).lower()))
+    return keys
+
+
+def rollup_id(granularity: str, dimension: str, key: str, bucket: datetime) -> str:
+    return f"{granularity}:{dimension}:{key}:{bucket.isoformat()}"
+
+
+class BurnRollups:
+    """Time-bucketed burn totals"""
+
+    def __init__(self, rollups_collection, burns_collection):
+        self.collection = rollups_collection
+        self.burns_collection = burns_collection
+
+    async def ensure_indexes(self, collection=None):
+        collection = collection if collection is not None else self.collection
+        await collection.create_index(
+            [("granularity", ASCENDING), ("dimension", ASCENDING), ("bucket", ASCENDING), ("key", ASCENDING)],
+            name="granularity_dimension_bucket_key"
+        )
+        await collection.create_index(
+            [("granularity", ASCENDING), ("dimension", ASCENDING), ("key", ASCENDING), ("bucket", ASCENDING)],
+            name="granularity_dimension_key_bucket"
+        )
+        # Hourly buckets expire, daily buckets have no expires_at and are kept
+        await collection.create_index("expires_at", expireAfterSeconds=0, name="expires_at_ttl")
+
+    async def ensure_initialized(self):
+        """Build rollups from existing burns the first time the API starts"""
+        await self.ensure_indexes()
+        if await self.collection.estimated_document_count() == 0:
+            await self.rebuild()
+
+    def _updates(self, burn: Dict[str, Any], amount: Decimal) -> List[UpdateOne]:
+        burned_at = burn.get("timestamp")
+        if not isinstance(burned_at, datetime):
+            burned_at = datetime.utcnow()
+
+        updates = []
+        for granularity in GRANULARITIES:
+            bucket = bucket_start(burned_at, granularity)
+            for dimension, key in burn_dimension_keys(burn):
+                on_insert: Dict[str, Any] = {
+                    "granularity": granularity,
+                    "dimension": dimension,
+                    "key": key,
+                    "bucket": bucket
+                }
+                if granularity == HOUR:
+                    on_insert["expires_at"] = bucket + HOURLY_RETENTION
+                updates.append(UpdateOne(
+                    {"_id": rollup_id(granularity, dimension, key, bucket)},
+                    {
+                        "$inc": {"total_burned": to_decimal128(amount), "transaction_count": 1},
+                        "$setOnInsert": on_insert
+                    },
+                    upsert=True
+                ))
+        return updates
+
+    async def record_burn(self, burn: Dict[str, Any]):
+        """Add a completed burn to every bucket it belongs to, in one round-trip"""
+        amount = completed_burn_amounts(burn)["total_volume"]
+        await self.collection.bulk_write(self._updates(burn, amount), ordered=False)
+
+    async def top_keys(self, dimension: str, span: timedelta, limit: int,
+                       now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Highest totals per key over a window aligned to bucket boundaries"""
+        granularity = granularity_for(span)
+        start = bucket_start((now or datetime.utcnow()) - span, granularity)
+        pipeline = [
+            {"$match": {"granularity": granularity, "dimension": dimension, "bucket": {"$gte": start}}},
+            {"$group": {
+                "_id": "$key",
+                "total_burned": {"$sum": "$total_burned"},
+                "transaction_count": {"$sum": "$transaction_count"}
+            }},
+            {"$sort": {"total_burned": DESCENDING}},
+            {"$limit": limit}
+        ]
+        results = []
+        async for doc in self.collection.aggregate(pipeline):
+            results.append({
+                "key": doc["_id"],
+                "total_burned": float(to_decimal(doc["total_burned"])),
+                "transaction_count": doc["transaction_count"]
+            })
+        return results
+
+    async def timeseries(self, span: timedelta, granularity: Optional[str] = None,
+                         dimension: str = "all", key: str = ALL_KEY,
+                         now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Zero-filled bucket series for one dimension key over a window"""
+        granularity = granularity or granularity_for(span)
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Granularity must be one of {', '.join(GRANULARITIES)}")
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Dimension must be one of {', '.join(DIMENSIONS)}")
+        if dimension != "all" and (not key or key == ALL_KEY):
+            raise ValueError(f"A key is required for the {dimension} dimension")
+        if dimension in ("token", "chain"):
+            key = key.lower()
+
+        step = GRANULARITIES[granularity]
+        end = bucket_start(now or datetime.utcnow(), granularity)
+        start = bucket_start((now or datetime.utcnow()) - span, granularity)
+        if (end - start) / step > 24 * 366:
+            raise ValueError("Too many buckets, use a coarser granularity")
+
+        found = {}
+        cursor = self.collection.find(
+            {"granularity": granularity, "dimension": dimension, "key": key, "bucket": {"$gte": start, "$lte": end}},
+            {"_id": 0, "bucket": 1, "total_burned": 1, "transaction_count": 1}
+        )
+        async for doc in cursor:
+            found[doc["bucket"]] = doc
+
+        points = []
+        total = Decimal(0)
+        bucket = start
+        while bucket <= end:
+            doc = found.get(bucket, {})
+            amount = to_decimal(doc.get("total_burned"))
+            total += amount
+            points.append({
+                "bucket": bucket.isoformat(),
+                "total_burned": float(amount),
+                "transaction_count": doc.get("transaction_count", 0)
+            })
+            bucket += step
+
+        return {
+            "granularity": granularity,
+            "dimension": dimension,
+            "key": key,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "total_burned": float(total),
+            "points": points
+        }
+
+    async def window_total(self, span: timedelta, now: Optional[datetime] = None) -> float:
+        """Total burned across all wallets in a window"""
+        granularity = granularity_for(span)
+        start = bucket_start((now or datetime.utcnow()) - span, granularity)
+        total = Decimal(0)
+        cursor = self.collection.find(
+            {"granularity": granularity, "dimension": "all", "key": ALL_KEY, "bucket": {"$gte": start}},
+            {"_id": 0, "total_burned": 1}
+        )
+        async for doc in cursor:
+            total += to_decimal(doc.get("total_burned"))
+        return float(total)
+
+    async def window_participants(self, span: timedelta, now: Optional[datetime] = None) -> int:
+        """Distinct wallets with a burn in a window"""
+        granularity = granularity_for(span)
+        start = bucket_start((now or datetime.utcnow()) - span, granularity)
+        pipeline = [
+            {"$match": {"granularity": granularity, "dimension": "wallet", "bucket": {"$gte": start}}},
+            {"$group": {"_id": "$key"}},
+            {"$count": "participants"}
+        ]
+        async for doc in self.collection.aggregate(pipeline):
+            return doc["participants"]
+        return 0
+
+    def _documents(self, burns: List[Dict[str, Any]], now: datetime) -> List[Dict[str, Any]]:
+        """Rollup documents for a set of completed burns"""
+        buckets: Dict[Tuple[str, str, str, datetime], List[Decimal]] = {}
+        for burn in burns:
+            burned_at = burn.get("timestamp")
+            if not isinstance(burned_at, datetime):
+                continue
+            amount = completed_burn_amounts(burn)["total_volume"]
+            for granularity in GRANULARITIES:
+                bucket = bucket_start(burned_at, granularity)
+                if granularity == HOUR and bucket + HOURLY_RETENTION < now:
+                    continue
+                for dimension, key in burn_dimension_keys(burn):
+                    entry = buckets.setdefault((granularity, dimension, key, bucket), [Decimal(0), 0])
+                    entry[0] += amount
+                    entry[1] += 1
+
+        documents = []
+        for (granularity, dimension, key, bucket), (amount, count) in buckets.items():
+            document = {
+                "_id": rollup_id(granularity, dimension, key, bucket),
+                "granularity": granularity,
+                "dimension": dimension,
+                "key": key,
+                "bucket": bucket,
+                "total_burned": to_decimal128(amount),
+                "transaction_count": count
+            }
+            if granularity == HOUR:
+                document["expires_at"] = bucket + HOURLY_RETENTION
+            documents.append(document)
+        return documents
+
+    async def rebuild(self) -> int:
+        """Recompute every rollup bucket from completed burns"""
+        settled_before = datetime.utcnow() - REBUILD_SETTLE
+        now = datetime.utcnow()
+        burns = [burn async for burn in self.burns_collection.find({"status": "completed"}, BURN_PROJECTION)]
+        documents = self._documents(burns, now)
+
+        # Build the buckets aside and swap them in with one rename, so windowed
+        # leaderboards and charts never read an empty or half-written collection
+        staging = self.collection.database[f"{self.collection.name}_rebuild_{uuid.uuid4().hex}"]
+        try:
+            await self.ensure_indexes(staging)
+            if documents:
+                await staging.insert_many(documents, ordered=False)
+            await staging.rename(self.collection.name, dropTarget=True)
+        except Exception:
+            await staging.drop()
+            raise
+
+        # Burns completed around the scan may be missing from the new buckets or may
+        # add their increments on top of them; re-derive the days they fall in
+        days = set()
+        async for burn in self.burns_collection.find(completed_since(settled_before), {"_id": 0, "timestamp": 1}):
+            if isinstance(burn.get("timestamp"), datetime):
+                days.add(bucket_start(burn["timestamp"], DAY))
+        for day in days:
+            await self._recompute_day(day)
+
+        logger.info(f"Burn rollups rebuilt: {len(documents)} buckets, {len(days)} recent days re-derived")
+        return len(documents)
+
+    async def _recompute_day(self, day: datetime):
+        """Set every bucket within one day to what its completed burns add up to right now"""
+        end = day + GRANULARITIES[DAY]
+        burns = [
+            burn async for burn in self.burns_collection.find(
+                {"status": "completed", "timestamp": {"$gte": day, "$lt": end}}, BURN_PROJECTION
+            )
+        ]
+        documents = self._documents(burns, datetime.utcnow())
+        for document in documents:
+            await self.collection.replace_one({"_id": document["_id"]}, document, upsert=True)
+        await self.collection.delete_many({
+            "_id": {"$nin": [document["_id"] for document in documents]},
+            "$or": [
+                {"granularity": HOUR, "bucket": {"$gte": day, "$lt": end}},
+                {"granularity": DAY, "bucket": day}
+            ]
+        })
@@ -0,0 +1,170 @@
+"""
+Burn statistics for Burn Relief Bot - Materialized counters in the stats collection
+Counters are bumped with $inc as burns are created and completed, so /stats is a
+single document read; rebuild() recomputes them from burns for drift correction
+
+Run: python burn_stats.py rebuild
+"""
+
+import asyncio
+import logging
+import os
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation, localcontext
+from typing import Any, Dict
+
+from bson.decimal128 import Decimal128, create_decimal128_context
+
+logger = logging.getLogger(__name__)
+
+STATS_DOCUMENT_ID = "burn_totals"
+
+AMOUNT_COUNTERS = ("total_volume", "total_burned", "total_drb", "total_bnkr")
+
+# How far before a rebuild's scan a completed burn may still be applying its increments
+REBUILD_SETTLE = timedelta(seconds=60)
+
+
+def to_decimal(value: Any) -> Decimal:
+    """Parse a stored amount, treating missing or invalid values as zero"""
+    if value is None:
+        return Decimal(0)
+    if isinstance(value, Decimal128):
+        return value.to_decimal()
+    try:
+        result = Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return Decimal(0)
+    return result if result.is_finite() else Decimal(0)
+
+
+def to_decimal128(value: Decimal) -> Decimal128:
+    """Round to the 34 significant digits Decimal128 can hold"""
+    with localcontext(create_decimal128_context()) as context:
+        return Decimal128(context.create_decimal(value))
+
+
+def completed_burn_amounts(burn: Dict[str, Any]) -> Dict[str, Decimal]:
+    """Amounts a completed burn adds to the counters"""
+    # Wallet-executed burns keep their split under allocations
+    allocations = burn.get("allocations") or {}
+    return {
+        "total_volume": to_decimal(burn.get("amount", burn.get("total_amount"))),
+        "total_burned": to_decimal(burn.get("burn_amount", allocations.get("burn_amount"))),
+        "total_drb": to_decimal(burn.get("drb_total_amount", allocations.get("drb_total_amount"))),
+        "total_bnkr": to_decimal(burn.get("bnkr_total_amount", allocations.get("bnkr_total_amount")))
+    }
+
+
+def completed_since(since: datetime) -> Dict[str, Any]:
+    """Query for burns that completed at or after since. Burns moved to completed get
+    status_updated_at; burns inserted as completed only have their timestamp"""
+    return {
+        "status": "completed",
+        "$or": [{"status_updated_at": {"$gte": since}}, {"timestamp": {"$gte": since}}]
+    }
+
+
+class BurnStats:
+    """Incrementally maintained burn totals"""
+
+    def __init__(self, stats_collection, burns_collection):
+        self.stats_collection = stats_collection
+        self.burns_collection = burns_collection
+
+    async def ensure_initialized(self):
+        """Build the counters from existing burns the first time the API starts"""
+        if await self.stats_collection.find_one({"_id": STATS_DOCUMENT_ID}, {"_id": 1}) is None:
+            await self.rebuild()
+
+    async def record_created(self, count: int = 1):
+        """Count newly inserted burn documents"""
+        await self.stats_collection.update_one(
+            {"_id": STATS_DOCUMENT_ID},
+            {"$inc": {"total_transactions": count}, "$set": {"updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+
+    async def record_completed(self, burn: Dict[str, Any], newly_created: bool = False):
+        """Add a completed burn to the counters"""
+        increments: Dict[str, Any] = {"completed_transactions": 1}
+        if newly_created:
+            increments["total_transactions"] = 1
+        for counter, amount in completed_burn_amounts(burn).items():
+            increments[counter] = to_decimal128(amount)
+
+        await self.stats_collection.update_one(
+            {"_id": STATS_DOCUMENT_ID},
+            {"$inc": increments, "$set": {"updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+
+    async def read(self) -> Dict[str, Any]:
+        """Current counters as plain numbers"""
+        doc = await self.stats_collection.find_one({"_id": STATS_DOCUMENT_ID}) or {}
+        stats = {
+            "total_transactions": doc.get("total_transactions", 0),
+            "completed_transactions": doc.get("completed_transactions", 0),
+            "updated_at": doc.get("updated_at")
+        }
+        for counter in AMOUNT_COUNTERS:
+            stats[counter] = float(to_decimal(doc.get(counter)))
+        return stats
+
+    async def rebuild(self) -> Dict[str, Any]:
+        """Recompute every counter from burns and overwrite the stats document
+
+        Burns completing while the scan runs may be counted twice or not at all;
+        run it again if that matters.
+        """
+        totals = {counter: Decimal(0) for counter in AMOUNT_COUNTERS}
+        total_transactions = 0
+        completed_transactions = 0
+
+        projection = {
+            "_id": 0, "status": 1, "amount": 1, "total_amount": 1, "allocations": 1,
+            "burn_amount": 1, "drb_total_amount": 1, "bnkr_total_amount": 1
+        }
+
+        async for burn in self.burns_collection.find({}, projection):
+            total_transactions += 1
+            if burn.get("status") != "completed":
+                continue
+            completed_transactions += 1
+            for counter, amount in completed_burn_amounts(burn).items():
+                totals[counter] += amount
+
+        document = {
+            "total_transactions": total_transactions,
+            "completed_transactions": completed_transactions,
+            "updated_at": datetime.utcnow(),
+            "rebuilt_at": datetime.utcnow()
+        }
+        document.update({counter: to_decimal128(value) for counter, value in totals.items()})
+
+        await self.stats_collection.replace_one({"_id": STATS_DOCUMENT_ID}, document, upsert=True)
+        logger.info(f"Burn stats rebuilt from {total_transactions} burns")
+        return await self.read()
+
+
+async def _rebuild_from_environment():
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    load_dotenv()
+    client = AsyncIOMotorClient(os.getenv("MONGO_URL", "mongodb://localhost:27017"))
+    db = client.burn_relief_bot
+    try:
+        stats = await BurnStats(db.stats, db.burns).rebuild()
+        print(stats)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if sys.argv[1:] != ["rebuild"]:
+        print("Usage: python burn_stats.py rebuild")
+        sys.exit(1)
+    asyncio.run(_rebuild_from_environment())
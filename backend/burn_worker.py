@@ -0,0 +1,37 @@
+"""
+Burn worker for Burn Relief Bot - Processes queued burns outside the API
+Run any number of these next to the API (optionally with BURN_WORKERS=0 on the
+API itself); jobs are leased, so each burn is worked on by one process at a time
+
+Run: python backend/burn_worker.py
+"""
+
+import asyncio
+import logging
+import signal
+
+from server import burn_queue, client, enqueue_unfinished_burns, rpc_pool
+
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    if burn_queue.workers < 1:
+        burn_queue.workers = 4
+    await burn_queue.start()
+    await enqueue_unfinished_burns()
+
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopped.set)
+
+    await stopped.wait()
+    logger.info("Stopping burn worker")
+    await burn_queue.stop()
+    await rpc_pool.close()
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -5,21 +5,169 @@ Integrates Li.Fi, Wormhole, and advanced routing for full cross-chain token burn
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List, Tuple
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from decimal import Decimal
 import json
+import uuid
 import aiohttp
 from datetime import datetime
 
+from plan_scheduler import COMPLETED, MemoryPlanStore, PlanScheduler, plan_node
+from quote_cache import amount_bucket, scale_amount
+from route_graph import (
+    BURN_ESTIMATE, DEFAULT_BRIDGE_ESTIMATES, TIME_COST_USD_PER_MINUTE, RouteGraph, RoutePlan,
+    format_cost, format_duration
+)
+from tx_monitor import CONFIRMED, FINAL_STATUSES
+
 logger = logging.getLogger(__name__)
 
+RouteKey = Tuple[str, str, str, int]
+
+# Li.Fi quote amounts that follow the amount sent; fee and gas costs are left as quoted
+LIFI_ESTIMATE_AMOUNT_FIELDS = ("fromAmount", "toAmount", "toAmountMin", "fromAmountUSD", "toAmountUSD")
+
+# Token address Li.Fi uses for a chain's native asset
+NATIVE_TOKEN = "0x0000000000000000000000000000000000000000"
+
+
+def range_midpoint(text: Optional[str]) -> Optional[float]:
+    """Midpoint of an estimate such as $10-25 or 15-20 minutes; None when there is none"""
+    words = (text or "").replace("$", "").split()
+    if not words:
+        return None
+    numbers = []
+    for part in words[0].split("-"):
+        try:
+            numbers.append(float(part))
+        except ValueError:
+            return None
+    return sum(numbers) / len(numbers) if numbers else None
+
+
+def bridge_estimates(route: Dict[str, Any]) -> Tuple[Optional[float], Optional[float]]:
+    """(cost in USD, time in seconds) of a Li.Fi or Wormhole route, None where unknown"""
+    if "route" in route:
+        estimate = route["route"].get("estimate", {})
+        costs = estimate.get("gasCosts", []) + estimate.get("feeCosts", [])
+        # A cost Li.Fi could not price in USD leaves the total unknown rather than understated
+        priced = costs and all(item.get("amountUSD") not in (None, "") for item in costs)
+        cost = sum(float(item["amountUSD"]) for item in costs) if priced else None
+        duration = estimate.get("executionDuration")
+        return cost, float(duration) if duration is not None else None
+    cost = range_midpoint(route.get("estimated_cost", ""))
+    minutes = range_midpoint(route.get("estimated_time", ""))
+    return cost, minutes * 60 if minutes is not None else None
+
+
+def delivered_amount(route: Dict[str, Any], amount: str) -> str:
+    """Amount a bridge route hands over on the destination chain; Wormhole moves it one to one"""
+    return str(route.get("route", {}).get("estimate", {}).get("toAmount") or amount)
+
+
+def rescale_lifi_route(route: Dict[str, Any], quoted_amount: Decimal, amount: Decimal) -> Dict[str, Any]:
+    """Route quoted for quoted_amount restated for amount, assuming a linear price.
+    The quote's transactionRequest encodes the quoted amount, so it is dropped and the
+    route is marked as an estimate that has to be quoted again before it is executed"""
+    ratio = amount / quoted_amount
+    data = dict(route.get("route", {}))
+    estimate = dict(data.get("estimate", {}))
+    for field in LIFI_ESTIMATE_AMOUNT_FIELDS:
+        if field in estimate:
+            estimate[field] = scale_amount(estimate[field], ratio)
+    data["estimate"] = estimate
+    if "fromAmount" in data.get("action", {}):
+        data["action"] = {**data["action"], "fromAmount": scale_amount(data["action"]["fromAmount"], ratio)}
+    data.pop("transactionRequest", None)
+    return {**route, "route": data, "estimate_only": True, "quoted_amount": str(quoted_amount)}
+
+
+class RouteCache:
+    """Bridge routes kept for ttl seconds per (from chain, to chain, token, amount bucket).
+    A hit for another amount in the bucket is rescaled from the cached route"""
+    
+    def __init__(self, ttl: float = 60.0, buckets_per_decade: int = 10, max_entries: int = 2_000):
+        self.ttl = ttl
+        self.buckets_per_decade = buckets_per_decade
+        self.max_entries = max_entries
+        # key -> (expires_at, quoted amount, route)
+        self._entries: "OrderedDict[RouteKey, Tuple[float, Decimal, Dict[str, Any]]]" = OrderedDict()
+        self._in_flight: Dict[RouteKey, asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0}
+    
+    def key(self, from_chain: str, to_chain: str, token_address: str, amount: str) -> Optional[RouteKey]:
+        """None for amounts that cannot be bucketed, which are never cached"""
+        try:
+            value = Decimal(amount)
+        except Exception:
+            return None
+        if not value > 0:
+            return None
+        return from_chain, to_chain, token_address.lower(), amount_bucket(float(value), self.buckets_per_decade)
+    
+    def _get(self, key: RouteKey) -> Optional[Tuple[Decimal, Dict[str, Any]]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1], entry[2]
+    
+    def _put(self, key: RouteKey, amount: Decimal, route: Dict[str, Any]):
+        self._entries[key] = (time.monotonic() + self.ttl, amount, route)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    async def get_route(self, key: RouteKey, amount: str,
+                        fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Cached route or fetch() one; concurrent misses share one fetch and only successful routes are kept"""
+        amount = Decimal(amount)
+        cached = self._get(key)
+        if cached is None and key in self._in_flight:
+            await asyncio.shield(self._in_flight[key])
+            cached = self._get(key)
+        if cached is not None:
+            self.stats["hits"] += 1
+            quoted_amount, route = cached
+            if quoted_amount != amount:
+                route = rescale_lifi_route(route, quoted_amount, amount)
+            return {**route, "cached": True}
+        
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            route = await fetch()
+            if route.get("success"):
+                self._put(key, amount, route)
+            return {**route, "cached": False}
+        finally:
+            del self._in_flight[key]
+            future.set_result(None)
+
 class CrossChainRouter:
     """Advanced cross-chain routing and bridging service"""
     
-    def __init__(self):
+    def __init__(self, route_ttl: float = float(os.getenv("ROUTE_CACHE_TTL_SECONDS", "60")),
+                 max_connections: int = 50, request_timeout: float = 15.0,
+                 leg_deadline: float = float(os.getenv("ROUTE_LEG_DEADLINE_SECONDS", "8"))):
         # Li.Fi API configuration
         self.lifi_base_url = "https://li.quest/v1"
         
+        # One keep-alive session for every bridge API call, created on first use
+        self.max_connections = max_connections
+        self.request_timeout = request_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.route_cache = RouteCache(ttl=route_ttl)
+        # Bridge providers still running when a leg's deadline passes are dropped
+        self.leg_deadline = leg_deadline
+        
         # Wormhole configuration
         self.wormhole_endpoints = {
             "ethereum": "https://api.wormholescan.io/api/v1/ethereum",
@@ -29,12 +177,6 @@ class CrossChainRouter:
             "solana": "https://api.wormholescan.io/api/v1/solana"
         }
         
-        # Optimal chains for $DRB and $cbBTC (based on liquidity)
-        self.optimal_chains = {
-            "DRB": "base",  # Base has best $DRB liquidity
-            "cbBTC": "ethereum"  # Ethereum has best $cbBTC liquidity
-        }
-        
         # Chain configurations for cross-chain operations
         self.chain_configs = {
             "ethereum": {"chain_id": 1, "wormhole_id": 2, "lifi_id": "ETH"},
@@ -45,15 +187,44 @@ class CrossChainRouter:
             "bitcoin": {"chain_id": "mainnet", "wormhole_id": 0, "lifi_id": "BTC"}
         }
         
+        # Target chain and bridge hops for $DRB and $cbBTC, chosen by cost, time and liquidity
+        self.route_graph = RouteGraph.from_chain_configs(self.chain_configs)
+        self.route_graph.precompute()
+        
+        # Execution plans run as DAGs; swap in a persistent store so plans survive restarts
+        self.plan_store = MemoryPlanStore()
+        self.max_concurrent_steps = int(os.getenv("MAX_CONCURRENT_STEPS", "8"))
+        
+        # Batched receipt / signature status polling (tx_monitor.TxMonitor), set up by the server
+        self.tx_monitor = None
+        self.confirmation_timeout = float(os.getenv("STEP_CONFIRMATION_TIMEOUT_SECONDS", "1800"))
+        
+    async def get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections, limit_per_host=20, keepalive_timeout=60, ttl_dns_cache=300
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+            )
+        return self._session
+    
+    async def close(self):
+        if self.tx_monitor is not None:
+            await self.tx_monitor.close()
+        if self._session and not self._session.closed:
+            await self._session.close()
+    
     async def analyze_cross_chain_route(self, 
                                       source_chain: str,
                                       source_token: str, 
-                                      amount: str) -> Dict[str, Any]:
-        """Analyze optimal cross-chain route for burning"""
+                                      amount: str,
+                                      amount_usd: Optional[float] = None) -> Dict[str, Any]:
+        """Analyze optimal cross-chain route for burning.
+        amount_usd, when known, keeps legs away from bridges and pools too shallow for them"""
         try:
-            # Determine optimal target chains for $DRB and $cbBTC
-            drb_target_chain = self.optimal_chains["DRB"]
-            cbbtc_target_chain = self.optimal_chains["cbBTC"]
+            started = time.monotonic()
+            first_route_at: List[float] = []
             
             # Calculate amounts based on new allocation
             total_amount = Decimal(amount)
@@ -61,130 +232,218 @@ class CrossChainRouter:
             drb_total = total_amount * Decimal("0.08")  # 8% total DRB
             cbbtc_total = total_amount * Decimal("0.04")  # 4% total cbBTC
             
-            routes = []
+            # Determine optimal target chains and hops for $DRB and $cbBTC
+            drb_plan = self.route_graph.best_route(source_chain, "DRB", amount_usd * 0.08 if amount_usd else None)
+            cbbtc_plan = self.route_graph.best_route(source_chain, "cbBTC", amount_usd * 0.04 if amount_usd else None)
             
             # Route 1: Burn on source chain (always happens locally)
-            routes.append({
+            burn_cost, burn_seconds = BURN_ESTIMATE
+            burn_route = {
                 "step": 1,
                 "type": "burn",
                 "source_chain": source_chain,
                 "target_chain": source_chain,
                 "amount": str(burn_amount),
-                "estimated_time": "30 seconds",
-                "estimated_cost": "$2-5"
-            })
-            
-            # Route 2: DRB routing
-            if source_chain == drb_target_chain:
-                # Same chain - direct swap
-                routes.append({
-                    "step": 2,
-                    "type": "direct_swap_drb",
-                    "source_chain": source_chain,
-                    "target_chain": drb_target_chain,
-                    "amount": str(drb_total),
-                    "estimated_time": "1-2 minutes",
-                    "estimated_cost": "$5-15"
-                })
-            else:
-                # Cross-chain - bridge then swap
-                bridge_route = await self.get_lifi_route(
-                    source_chain, drb_target_chain, source_token, str(drb_total)
-                )
-                routes.append({
-                    "step": 2,
-                    "type": "bridge_and_swap_drb",
-                    "source_chain": source_chain,
-                    "target_chain": drb_target_chain,
-                    "amount": str(drb_total),
-                    "estimated_time": "5-15 minutes",
-                    "estimated_cost": "$15-50",
-                    "bridge_info": bridge_route
-                })
+                "estimated_time": format_duration(burn_seconds),
+                "estimated_cost": format_cost(burn_cost),
+                "estimated_time_seconds": burn_seconds,
+                "estimated_cost_usd": burn_cost
+            }
             
-            # Route 3: cbBTC routing  
-            if source_chain == cbbtc_target_chain:
-                # Same chain - direct swap
-                routes.append({
-                    "step": 3,
-                    "type": "direct_swap_cbbtc",
-                    "source_chain": source_chain,
-                    "target_chain": cbbtc_target_chain,
-                    "amount": str(cbbtc_total),
-                    "estimated_time": "1-2 minutes",
-                    "estimated_cost": "$5-15"
-                })
-            else:
-                # Cross-chain - bridge then swap
-                bridge_route = await self.get_lifi_route(
-                    source_chain, cbbtc_target_chain, source_token, str(cbbtc_total)
-                )
-                routes.append({
-                    "step": 3,
-                    "type": "bridge_and_swap_cbbtc",
-                    "source_chain": source_chain,
-                    "target_chain": cbbtc_target_chain,
-                    "amount": str(cbbtc_total),
-                    "estimated_time": "5-15 minutes",
-                    "estimated_cost": "$15-50",
-                    "bridge_info": bridge_route
-                })
+            # Routes 2 and 3: DRB and cbBTC legs are independent, so route them together
+            drb_route, cbbtc_route = await asyncio.gather(
+                self._route_leg(2, "drb", drb_plan, source_token, drb_total, first_route_at),
+                self._route_leg(3, "cbbtc", cbbtc_plan, source_token, cbbtc_total, first_route_at)
+            )
+            routes = [burn_route, drb_route, cbbtc_route]
             
-            # Calculate total estimates
-            total_time = "10-20 minutes" if source_chain != drb_target_chain or source_chain != cbbtc_target_chain else "3-5 minutes"
-            total_cost = "$25-80" if len([r for r in routes if "bridge" in r["type"]]) > 0 else "$12-35"
+            # Calculate total estimates; the burn and both legs execute concurrently
+            total_seconds = max(route["estimated_time_seconds"] for route in routes)
+            total_cost_usd = sum(route["estimated_cost_usd"] for route in routes)
+            cross_chain_required = any(plan.hops for plan in (drb_plan, cbbtc_plan))
             
             return {
                 "success": True,
                 "source_chain": source_chain,
                 "optimal_routing": True,
                 "routes": routes,
-                "total_estimated_time": total_time,
-                "total_estimated_cost": total_cost,
-                "cross_chain_required": source_chain != drb_target_chain or source_chain != cbbtc_target_chain
+                "total_estimated_time": format_duration(total_seconds),
+                "total_estimated_cost": format_cost(total_cost_usd),
+                "cross_chain_required": cross_chain_required,
+                "metadata": {
+                    # None when every leg is a direct swap and no bridge route was requested
+                    "time_to_first_route_ms": round((first_route_at[0] - started) * 1000, 1) if first_route_at else None,
+                    "analysis_ms": round((time.monotonic() - started) * 1000, 1),
+                    "leg_deadline_seconds": self.leg_deadline
+                }
             }
             
         except Exception as e:
             logger.error(f"Error analyzing cross-chain route: {e}")
             return {"success": False, "error": str(e)}
     
+    async def _route_leg(self,
+                       step: int,
+                       token_type: str,
+                       plan: RoutePlan,
+                       source_token: str,
+                       amount: Decimal,
+                       first_route_at: List[float]) -> Dict[str, Any]:
+        """Direct swap when the plan stays on the source chain, otherwise its bridge hops then swap.
+        first_route_at collects when each bridge route comes back from a provider"""
+        leg = {
+            "step": step,
+            "source_chain": plan.source_chain,
+            "target_chain": plan.target_chain,
+            "amount": str(amount),
+            "estimated_time": format_duration(plan.seconds),
+            "estimated_cost": format_cost(plan.cost_usd),
+            "estimated_time_seconds": round(plan.seconds),
+            "estimated_cost_usd": round(plan.cost_usd, 2)
+        }
+        if not plan.hops:
+            # Same chain - direct swap; no provider is asked, so it does not count as a first route
+            return {**leg, "type": f"direct_swap_{token_type}"}
+        
+        # Cross-chain - bridge then swap. Routes arrive in the native token, so each later hop
+        # moves the native token and the amount the hop before it delivers
+        hop_routes = []
+        hop_token, hop_amount = source_token, str(amount)
+        for hop in plan.hops:
+            route = await self.get_best_bridge_route(hop.from_chain, hop.to_chain, hop_token, hop_amount, first_route_at)
+            hop_routes.append({**route, "from_token": hop_token, "from_amount": hop_amount})
+            if not route.get("success"):
+                # Later hops cannot be quoted without knowing what this one delivers
+                break
+            hop_token, hop_amount = NATIVE_TOKEN, delivered_amount(route, hop_amount)
+        if len(hop_routes) == 1:
+            bridge_info = hop_routes[0]
+        else:
+            bridge_info = {
+                "success": len(hop_routes) == len(plan.hops) and all(route.get("success") for route in hop_routes),
+                "bridge_provider": " -> ".join(
+                    route.get("bridge_provider", hop.provider) for hop, route in zip(plan.hops, hop_routes)
+                ),
+                "hops": hop_routes
+            }
+        return {
+            **leg,
+            "type": f"bridge_and_swap_{token_type}",
+            "route_hops": [hop.to_dict() for hop in plan.hops],
+            "bridge_info": bridge_info
+        }
+    
+    async def get_best_bridge_route(self,
+                                  from_chain: str,
+                                  to_chain: str,
+                                  token_address: str,
+                                  amount: str,
+                                  first_route_at: Optional[List[float]] = None) -> Dict[str, Any]:
+        """Ask Li.Fi and Wormhole at once and keep the cheapest route, counting time as cost.
+        Providers that have not answered by leg_deadline are left out"""
+        loop = asyncio.get_running_loop()
+        providers = {
+            asyncio.ensure_future(self.get_lifi_route(from_chain, to_chain, token_address, amount)): "Li.Fi",
+            asyncio.ensure_future(self.get_wormhole_route(from_chain, to_chain, token_address, amount)): "Wormhole"
+        }
+        deadline = loop.time() + self.leg_deadline
+        pending = set(providers)
+        candidates, errors = [], {}
+        
+        while pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                provider = providers[task]
+                route = task.result() if task.exception() is None else {"success": False, "error": str(task.exception())}
+                if not route.get("success"):
+                    errors[provider] = route.get("error", "unknown error")
+                    continue
+                if first_route_at is not None:
+                    first_route_at.append(time.monotonic())
+                cost, seconds = bridge_estimates(route)
+                self.route_graph.observe(provider, from_chain, to_chain, cost, seconds)
+                # Unknown figures are scored with the provider's default estimate rather than ruling it out
+                default_cost, default_seconds, _ = DEFAULT_BRIDGE_ESTIMATES.get(provider, (None, None, None))
+                score_cost = cost if cost is not None else default_cost
+                score_seconds = seconds if seconds is not None else default_seconds
+                score = (score_cost if score_cost is not None else float("inf")) + \
+                    (score_seconds / 60 * TIME_COST_USD_PER_MINUTE if score_seconds is not None else 0)
+                candidates.append((score, provider, cost, seconds, route))
+        
+        for task in pending:
+            task.cancel()
+            errors[providers[task]] = f"No route within {self.leg_deadline}s"
+        
+        if not candidates:
+            logger.warning(f"No bridge route from {from_chain} to {to_chain}: {errors}")
+            return {"success": False, "error": "No bridge route available", "provider_errors": errors}
+        
+        candidates.sort(key=lambda candidate: candidate[0])
+        _, provider, cost, seconds, route = candidates[0]
+        return {
+            **route,
+            "bridge_provider": route.get("bridge_provider", provider),
+            "estimated_cost_usd": cost,
+            "estimated_time_seconds": seconds,
+            "alternatives": [
+                {"bridge_provider": alt_provider, "estimated_cost_usd": alt_cost, "estimated_time_seconds": alt_seconds}
+                for _, alt_provider, alt_cost, alt_seconds, _ in candidates[1:]
+            ],
+            "provider_errors": errors
+        }
+    
     async def get_lifi_route(self, 
                            from_chain: str, 
                            to_chain: str, 
                            token_address: str, 
                            amount: str) -> Dict[str, Any]:
-        """Get optimal route from Li.Fi"""
+        """Get optimal route from Li.Fi, served from the route cache when a similar amount was routed recently"""
+        key = self.route_cache.key(from_chain, to_chain, token_address, amount)
+        if key is None:
+            return await self._fetch_lifi_route(from_chain, to_chain, token_address, amount)
+        return await self.route_cache.get_route(
+            key, amount, lambda: self._fetch_lifi_route(from_chain, to_chain, token_address, amount)
+        )
+    
+    async def _fetch_lifi_route(self, 
+                              from_chain: str, 
+                              to_chain: str, 
+                              token_address: str, 
+                              amount: str) -> Dict[str, Any]:
         try:
-            async with aiohttp.ClientSession() as session:
-                # Li.Fi quote endpoint
-                url = f"{self.lifi_base_url}/quote"
-                
-                from_chain_id = self.chain_configs[from_chain]["lifi_id"]
-                to_chain_id = self.chain_configs[to_chain]["lifi_id"]
-                
-                params = {
-                    "fromChain": from_chain_id,
-                    "toChain": to_chain_id,
-                    "fromToken": token_address,
-                    "toToken": "0x0000000000000000000000000000000000000000",  # Native token
-                    "fromAmount": amount,
-                    "fromAddress": "0x0000000000000000000000000000000000000000",  # Placeholder
-                    "toAddress": "0x0000000000000000000000000000000000000000"   # Placeholder
-                }
-                
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return {
-                            "success": True,
-                            "route": data,
-                            "bridge_provider": data.get("tool", "Li.Fi"),
-                            "estimated_time": data.get("estimate", {}).get("executionDuration", 300),
-                            "gas_cost": data.get("estimate", {}).get("gasCosts", [])
-                        }
-                    else:
-                        return {"success": False, "error": f"Li.Fi API error: {response.status}"}
-                        
+            session = await self.get_session()
+            # Li.Fi quote endpoint
+            url = f"{self.lifi_base_url}/quote"
+            
+            from_chain_id = self.chain_configs[from_chain]["lifi_id"]
+            to_chain_id = self.chain_configs[to_chain]["lifi_id"]
+            
+            params = {
+                "fromChain": from_chain_id,
+                "toChain": to_chain_id,
+                "fromToken": token_address,
+                "toToken": NATIVE_TOKEN,
+                "fromAmount": amount,
+                "fromAddress": "0x0000000000000000000000000000000000000000",  # Placeholder
+                "toAddress": "0x0000000000000000000000000000000000000000"   # Placeholder
+            }
+            
+            async with session.get(url, params=params) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return {
+                        "success": True,
+                        "route": data,
+                        "bridge_provider": data.get("tool", "Li.Fi"),
+                        "estimated_time": data.get("estimate", {}).get("executionDuration", 300),
+                        "gas_cost": data.get("estimate", {}).get("gasCosts", [])
+                    }
+                else:
+                    return {"success": False, "error": f"Li.Fi API error: {response.status}"}
+                    
         except Exception as e:
             logger.error(f"Li.Fi route error: {e}")
             return {"success": False, "error": str(e)}
@@ -214,41 +473,135 @@ class CrossChainRouter:
             logger.error(f"Wormhole route error: {e}")
             return {"success": False, "error": str(e)}
     
+    def build_execution_dag(self, routes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Plan nodes for routes; a leg's bridge hops run one after another and its swap waits
+        for the last of them. Node ids avoid dots so they can be used as MongoDB field names"""
+        nodes = []
+        for route in routes:
+            if route["type"] == "burn":
+                nodes.append(plan_node(f"burn-{route['step']}", "burn", route))
+                
+            elif "bridge_and_swap" in route["type"]:
+                bridge_ids = []
+                for hop_route in self._hop_routes(route):
+                    bridge_id = f"bridge-{route['step']}" + (f"-{hop_route['hop']}" if "hop" in hop_route else "")
+                    nodes.append(plan_node(bridge_id, "bridge", hop_route, depends_on=bridge_ids[-1:]))
+                    bridge_ids.append(bridge_id)
+                nodes.append(plan_node(f"swap-{route['step']}", "swap", route, depends_on=bridge_ids[-1:]))
+                
+            elif "direct_swap" in route["type"]:
+                nodes.append(plan_node(f"swap-{route['step']}", "swap", route))
+        return nodes
+    
+    def _hop_routes(self, route: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """One bridge route per hop of a leg, each moving what the hop before it delivered"""
+        hops = route.get("route_hops") or []
+        if len(hops) < 2:
+            return [route]
+        quotes = route.get("bridge_info", {}).get("hops", [])
+        hop_routes = []
+        for index, hop in enumerate(hops):
+            quote = quotes[index] if index < len(quotes) else {"success": False, "bridge_provider": hop["provider"]}
+            hop_routes.append({
+                **route,
+                "hop": index + 1,
+                "source_chain": hop["from_chain"],
+                "target_chain": hop["to_chain"],
+                "amount": quote.get("from_amount", route["amount"]),
+                "bridge_info": quote
+            })
+        return hop_routes
+    
+    def _plan_scheduler(self, user_address: str) -> PlanScheduler:
+        executors = {
+            "burn": lambda node: self._execute_burn_step(node["route"], user_address),
+            "bridge": lambda node: self._execute_bridge_step(node["route"], user_address),
+            "swap": lambda node: self._execute_swap_step(node["route"], user_address)
+        }
+        return PlanScheduler(self.plan_store, executors, max_concurrency=self.max_concurrent_steps,
+                             confirm=lambda node, tx: self._await_confirmation(tx))
+    
+    async def _await_confirmation(self, tx: Dict[str, Any]) -> Dict[str, Any]:
+        """Hold a step until its transaction confirms so dependent steps can start.
+        Raises when it fails, is dropped or does not confirm within confirmation_timeout"""
+        if tx.get("simulated") or self.tx_monitor is None or not tx.get("tx_hash"):
+            # Nothing on chain to wait for
+            return tx
+        transaction = (tx["tx_hash"], tx.get("chain") or tx["from_chain"])
+        updates = self.tx_monitor.subscribe([transaction])
+        
+        async def final_status() -> Dict[str, Any]:
+            status = (await self.tx_monitor.check([transaction]))[0]
+            while status["status"] not in FINAL_STATUSES:
+                if "error" in status or status.get("watched") is False:
+                    # Not being watched, so no update will be pushed; check again after a block
+                    await asyncio.sleep(self.tx_monitor.poll_interval(transaction[1].lower()))
+                    status = (await self.tx_monitor.check([transaction]))[0]
+                else:
+                    status = await updates.get()
+            return status
+        
+        try:
+            status = await asyncio.wait_for(final_status(), timeout=self.confirmation_timeout)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"Transaction {tx['tx_hash']} not confirmed within {self.confirmation_timeout:.0f}s")
+        finally:
+            self.tx_monitor.unsubscribe(updates)
+        if status["status"] != CONFIRMED:
+            raise RuntimeError(f"Transaction {tx['tx_hash']} {status['status']}: {status.get('error') or status.get('transaction_error')}")
+        return {**tx, "status": CONFIRMED, "confirmations": status.get("confirmations")}
+    
+    def _execution_result(self, plan_id: str, nodes: List[Dict[str, Any]],
+                          state: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        execution_plan = [state[node["id"]]["result"] for node in nodes if state[node["id"]]["status"] == COMPLETED]
+        failed_steps = {
+            node["id"]: {"status": state[node["id"]]["status"], "error": state[node["id"]].get("error")}
+            for node in nodes if state[node["id"]]["status"] != COMPLETED
+        }
+        result = {
+            "success": not failed_steps,
+            "plan_id": plan_id,
+            "execution_plan": execution_plan,
+            "total_transactions": len(execution_plan),
+            "step_status": {node["id"]: state[node["id"]]["status"] for node in nodes},
+            "failed_steps": failed_steps,
+            "monitoring_required": True
+        }
+        if failed_steps:
+            result["error"] = f"{len(failed_steps)} of {len(nodes)} steps did not complete"
+        return result
+    
     async def execute_cross_chain_burn(self, 
                                      routes: List[Dict[str, Any]], 
-                                     user_address: str) -> Dict[str, Any]:
-        """Execute complete cross-chain burn sequence"""
+                                     user_address: str,
+                                     plan_id: Optional[str] = None) -> Dict[str, Any]:
+        """Execute complete cross-chain burn sequence.
+        Independent steps run concurrently and every step's state is saved under plan_id"""
         try:
-            execution_plan = []
-            
-            for route in routes:
-                if route["type"] == "burn":
-                    # Execute burn on source chain
-                    burn_tx = await self._execute_burn_step(route, user_address)
-                    execution_plan.append(burn_tx)
-                    
-                elif "bridge_and_swap" in route["type"]:
-                    # Execute bridge + swap sequence
-                    bridge_tx = await self._execute_bridge_step(route, user_address)
-                    swap_tx = await self._execute_swap_step(route, user_address)
-                    execution_plan.extend([bridge_tx, swap_tx])
-                    
-                elif "direct_swap" in route["type"]:
-                    # Execute direct swap on same chain
-                    swap_tx = await self._execute_swap_step(route, user_address)
-                    execution_plan.append(swap_tx)
-            
-            return {
-                "success": True,
-                "execution_plan": execution_plan,
-                "total_transactions": len(execution_plan),
-                "monitoring_required": True
-            }
+            plan_id = plan_id or str(uuid.uuid4())
+            nodes = self.build_execution_dag(routes)
+            state = await self._plan_scheduler(user_address).run(
+                plan_id, nodes, context={"user_address": user_address}
+            )
+            return self._execution_result(plan_id, nodes, state)
             
         except Exception as e:
             logger.error(f"Cross-chain execution error: {e}")
             return {"success": False, "error": str(e)}
     
+    async def resume_cross_chain_burn(self, plan_id: str) -> Dict[str, Any]:
+        """Continue a saved plan; completed steps are kept and the rest run as their parents confirm"""
+        try:
+            plan = await self.plan_store.load(plan_id)
+            if plan is None:
+                return {"success": False, "error": f"Unknown plan: {plan_id}"}
+            state = await self._plan_scheduler(plan["context"]["user_address"]).run(plan_id)
+            return self._execution_result(plan_id, plan["nodes"], state)
+            
+        except Exception as e:
+            logger.error(f"Cross-chain resume error: {e}")
+            return {"success": False, "error": str(e)}
+    
     async def _execute_burn_step(self, route: Dict[str, Any], user_address: str) -> Dict[str, Any]:
         """Execute burn step"""
         return {
@@ -257,6 +610,7 @@ class CrossChainRouter:
             "chain": route["source_chain"],
             "tx_hash": f"0x{'burn123456' * 8}",
             "status": "pending",
+            "simulated": True,
             "amount": route["amount"],
             "estimated_confirmation": "30 seconds"
         }
@@ -264,12 +618,13 @@ class CrossChainRouter:
     async def _execute_bridge_step(self, route: Dict[str, Any], user_address: str) -> Dict[str, Any]:
         """Execute bridge step"""
         return {
-            "step": f"{route['step']}.1",
+            "step": f"{route['step']}.1" + (f".{route['hop']}" if "hop" in route else ""),
             "type": "bridge",
             "from_chain": route["source_chain"],
             "to_chain": route["target_chain"],
             "tx_hash": f"0x{'bridge123456' * 8}",
             "status": "pending",
+            "simulated": True,
             "amount": route["amount"],
             "estimated_confirmation": "10-15 minutes",
             "bridge_provider": route.get("bridge_info", {}).get("bridge_provider", "Li.Fi")
@@ -284,6 +639,7 @@ class CrossChainRouter:
             "chain": route["target_chain"],
             "tx_hash": f"0x{'swap123456' * 8}",
             "status": "pending",
+            "simulated": True,
             "amount": route["amount"],
             "output_token": token_type,
             "estimated_confirmation": "1-2 minutes"
@@ -291,26 +647,20 @@ class CrossChainRouter:
     
     async def monitor_cross_chain_transaction(self, tx_hash: str, chain: str) -> Dict[str, Any]:
         """Monitor cross-chain transaction status"""
+        results = await self.monitor_cross_chain_transactions([(tx_hash, chain)])
+        return results[0] if results else {"error": "Transaction monitoring failed"}
+    
+    async def monitor_cross_chain_transactions(self, transactions: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Current status of many (tx_hash, chain) pairs, checked in one batch per chain.
+        Unconfirmed transactions stay watched and their updates go to tx_monitor subscribers"""
         try:
-            # Simulate transaction monitoring
-            # In production, this would check actual blockchain status
-            
-            import random
-            statuses = ["pending", "confirming", "confirmed"]
-            current_status = random.choice(statuses)
-            
-            return {
-                "tx_hash": tx_hash,
-                "chain": chain,
-                "status": current_status,
-                "confirmations": random.randint(0, 20),
-                "estimated_completion": "2-15 minutes",
-                "last_updated": datetime.utcnow().isoformat()
-            }
+            if self.tx_monitor is None:
+                raise RuntimeError("Transaction monitoring is not configured")
+            return await self.tx_monitor.check(transactions)
             
         except Exception as e:
             logger.error(f"Transaction monitoring error: {e}")
-            return {"error": str(e)}
+            return [{"tx_hash": tx_hash, "chain": chain, "error": str(e)} for tx_hash, chain in transactions]
     
     async def get_supported_tokens(self, chain: str) -> List[Dict[str, Any]]:
         """Get supported tokens for cross-chain operations on a specific chain"""
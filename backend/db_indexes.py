@@ -0,0 +1,110 @@
+"""
+Index manager for Burn Relief Bot - Declares the indexes the API's queries rely on
+ensure_indexes() runs at startup and is idempotent; explain_report() runs every
+known query shape through explain() and logs the ones still doing a COLLSCAN
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Collection name -> indexes
+INDEX_SPECS: Dict[str, List[IndexModel]] = {
+    "burns": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True, sparse=True),
+        # Keyset pagination sorts on (timestamp, id)
+        IndexModel([("wallet_address", ASCENDING), ("timestamp", DESCENDING), ("id", DESCENDING)], name="wallet_timestamp_id"),
+        IndexModel([("timestamp", DESCENDING), ("id", DESCENDING)], name="timestamp_id"),
+        IndexModel([("status", ASCENDING), ("timestamp", DESCENDING)], name="status_timestamp"),
+        IndexModel([("transaction_hash", ASCENDING)], name="transaction_hash", sparse=True),
+    ],
+    "votes": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("voter_wallet", ASCENDING), ("project_id", ASCENDING)], name="voter_project_unique", unique=True),
+        IndexModel([("voter_wallet", ASCENDING), ("timestamp", DESCENDING)], name="voter_timestamp"),
+    ],
+    "projects": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True, sparse=True),
+        IndexModel([("status", ASCENDING), ("total_votes", DESCENDING)], name="status_total_votes"),
+        IndexModel([("is_active", ASCENDING)], name="is_active"),
+    ],
+    "voting_periods": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING)], name="status_created_at"),
+    ],
+}
+
+# Query shapes issued by the API: (name, collection, filter, sort)
+QUERY_SHAPES = [
+    ("burn by id", "burns", {"id": "x"}, None),
+    ("wallet transactions", "burns", {"wallet_address": "0x0"}, [("timestamp", DESCENDING), ("id", DESCENDING)]),
+    ("recent transactions", "burns", {}, [("timestamp", DESCENDING), ("id", DESCENDING)]),
+    ("recent completed burns", "burns", {"status": "completed"}, [("timestamp", DESCENDING)]),
+    ("burn by transaction hash", "burns", {"transaction_hash": "0x0"}, None),
+    ("project by id", "projects", {"id": "x"}, None),
+    ("active projects", "projects", {"status": "active"}, [("total_votes", DESCENDING)]),
+    ("active contest projects", "projects", {"is_active": True}, None),
+    ("existing vote", "votes", {"voter_wallet": "0x0", "project_id": "x"}, None),
+    ("wallet votes", "votes", {"voter_wallet": "0x0"}, [("timestamp", DESCENDING)]),
+    ("active voting period", "voting_periods", {"status": "active"}, [("created_at", DESCENDING)]),
+]
+
+
+async def ensure_indexes(db, specs: Optional[Dict[str, List[IndexModel]]] = None) -> Dict[str, List[str]]:
+    """Create any missing indexes; existing identical indexes are left alone"""
+    created = {}
+    for collection_name, indexes in (specs or INDEX_SPECS).items():
+        try:
+            created[collection_name] = await db[collection_name].create_indexes(indexes)
+        except OperationFailure as e:
+            # e.g. duplicate data blocking a unique index; keep starting up
+            logger.error(f"Index creation failed on {collection_name}: {e}")
+            created[collection_name] = []
+    logger.info(f"Indexes ensured on {', '.join(created)}")
+    return created
+
+
+def _plan_stages(plan: Dict[str, Any]) -> Iterable[str]:
+    """Walk an explain() plan tree and yield every stage name"""
+    if not isinstance(plan, dict):
+        return
+    if "stage" in plan:
+        yield plan["stage"]
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            yield from _plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from _plan_stages(child)
+
+
+async def explain_report(db, shapes=None) -> List[Dict[str, Any]]:
+    """Explain each known query shape and log those that scan a whole collection"""
+    report = []
+    for name, collection_name, query, sort in shapes or QUERY_SHAPES:
+        try:
+            cursor = db[collection_name].find(query)
+            if sort:
+                cursor = cursor.sort(sort)
+            explanation = await cursor.limit(1).explain()
+            winning_plan = explanation.get("queryPlanner", {}).get("winningPlan", {})
+            stages = list(_plan_stages(winning_plan))
+            entry = {
+                "query": name,
+                "collection": collection_name,
+                "stages": stages,
+                "collscan": "COLLSCAN" in stages
+            }
+        except Exception as e:
+            entry = {"query": name, "collection": collection_name, "error": str(e)}
+            logger.warning(f"Explain failed for '{name}' on {collection_name}: {e}")
+        report.append(entry)
+
+    collscans = [entry for entry in report if entry.get("collscan")]
+    for entry in collscans:
+        logger.warning(f"COLLSCAN: '{entry['query']}' on {entry['collection']} ({' <- '.join(entry['stages'])})")
+    logger.info(f"Index report: {len(report)} query shapes checked, {len(collscans)} collection scans")
+    return report
@@ -0,0 +1,247 @@
+"""
+Job queue for Burn Relief Bot - Durable background jobs stored in MongoDB
+Workers claim jobs with a time-limited lease, so work survives restarts and any
+number of processes can share one queue; failed jobs are retried with backoff
+and dead-lettered after max_attempts
+"""
+
+import asyncio
+import logging
+import os
+import random
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pymongo import ASCENDING, ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+PROCESSING = "processing"
+COMPLETED = "completed"
+FAILED = "failed"
+JOB_STATUSES = (PENDING, PROCESSING, COMPLETED, FAILED)
+
+# Finished jobs are removed after a week; dead-lettered jobs are kept
+COMPLETED_RETENTION = timedelta(days=7)
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+DeadLetterHook = Callable[[Dict[str, Any], str], Awaitable[None]]
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter for the given (1-based) attempt"""
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
+
+
+class JobQueue:
+    """Leased-claim job queue with a pool of async workers"""
+
+    def __init__(self, jobs_collection, handler: JobHandler, workers: int = 4,
+                 lease_seconds: float = 60.0, max_attempts: int = 5,
+                 backoff_base: float = 2.0, backoff_cap: float = 300.0,
+                 poll_interval: float = 1.0, on_dead_letter: Optional[DeadLetterHook] = None):
+        self.collection = jobs_collection
+        self.handler = handler
+        self.workers = workers
+        self.lease = timedelta(seconds=lease_seconds)
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.poll_interval = poll_interval
+        self.on_dead_letter = on_dead_letter
+
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    async def ensure_indexes(self):
+        await self.collection.create_index(
+            [("status", ASCENDING), ("available_at", ASCENDING)], name="status_available_at"
+        )
+        await self.collection.create_index(
+            [("status", ASCENDING), ("lease_expires_at", ASCENDING)], name="status_lease_expires_at"
+        )
+        await self.collection.create_index("expires_at", expireAfterSeconds=0, name="expires_at_ttl")
+
+    async def start(self):
+        """Start this process's workers"""
+        await self.ensure_indexes()
+        self._stopping = False
+        for index in range(self.workers - len(self._tasks)):
+            self._tasks.append(asyncio.create_task(self._worker(index)))
+        logger.info(f"Job queue started {self.workers} workers as {self.owner}")
+
+    async def stop(self):
+        """Stop claiming; in-flight jobs are cancelled and their leases left to expire"""
+        self._stopping = True
+        self._wakeup.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def enqueue(self, job_id: str, kind: str, payload: Dict[str, Any]) -> bool:
+        """Add a job; enqueueing an existing job_id is a no-op. Returns True if created"""
+        now = datetime.utcnow()
+        result = await self.collection.update_one(
+            {"_id": job_id},
+            {"$setOnInsert": {
+                "kind": kind,
+                "payload": payload,
+                "status": PENDING,
+                "attempts": 0,
+                "available_at": now,
+                "created_at": now,
+                "updated_at": now
+            }},
+            upsert=True
+        )
+        self._wakeup.set()
+        return result.upserted_id is not None
+
+    async def claim(self, owner: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Atomically lease the next due job, or one whose lease has expired, to owner"""
+        now = datetime.utcnow()
+        return await self.collection.find_one_and_update(
+            {"$or": [
+                {"status": PENDING, "available_at": {"$lte": now}},
+                {"status": PROCESSING, "lease_expires_at": {"$lt": now}}
+            ]},
+            {
+                "$set": {
+                    "status": PROCESSING,
+                    "lease_owner": owner or self.owner,
+                    "lease_expires_at": now + self.lease,
+                    "started_at": now,
+                    "updated_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("available_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _owned_update(self, job: Dict[str, Any], update: Dict[str, Any]) -> bool:
+        """Update a job only while the worker that claimed it still holds its lease"""
+        result = await self.collection.update_one(
+            {"_id": job["_id"], "status": PROCESSING, "lease_owner": job["lease_owner"]},
+            update
+        )
+        return result.modified_count == 1
+
+    async def _renew_lease(self, job: Dict[str, Any]):
+        while True:
+            await asyncio.sleep(self.lease.total_seconds() / 3)
+            renewed = await self._owned_update(job, {"$set": {"lease_expires_at": datetime.utcnow() + self.lease}})
+            if not renewed:
+                logger.warning(f"Lost lease on job {job['_id']}")
+                return
+
+    async def _complete(self, job: Dict[str, Any]):
+        now = datetime.utcnow()
+        await self._owned_update(job, {
+            "$set": {"status": COMPLETED, "completed_at": now, "updated_at": now, "expires_at": now + COMPLETED_RETENTION},
+            "$unset": {"lease_owner": "", "lease_expires_at": ""}
+        })
+
+    async def _fail(self, job: Dict[str, Any], error: str):
+        now = datetime.utcnow()
+        if job["attempts"] >= self.max_attempts:
+            dead = await self._owned_update(job, {
+                "$set": {"status": FAILED, "last_error": error, "dead_lettered_at": now, "updated_at": now},
+                "$unset": {"lease_owner": "", "lease_expires_at": ""}
+            })
+            if dead:
+                logger.error(f"Job {job['_id']} dead-lettered after {job['attempts']} attempts: {error}")
+                if self.on_dead_letter:
+                    await self.on_dead_letter(job, error)
+            return
+
+        delay = backoff_delay(job["attempts"], self.backoff_base, self.backoff_cap)
+        await self._owned_update(job, {
+            "$set": {
+                "status": PENDING,
+                "last_error": error,
+                "available_at": now + timedelta(seconds=delay),
+                "updated_at": now
+            },
+            "$unset": {"lease_owner": "", "lease_expires_at": ""}
+        })
+        logger.warning(f"Job {job['_id']} attempt {job['attempts']} failed, retrying in {delay:.1f}s: {error}")
+
+    async def run_job(self, job: Dict[str, Any]):
+        """Run one claimed job under a renewed lease and record the outcome"""
+        if job["attempts"] > self.max_attempts:
+            # Reclaimed after its worker died once too often
+            await self._fail(job, job.get("last_error") or "Lease expired")
+            return
+
+        renewer = asyncio.create_task(self._renew_lease(job))
+        error = None
+        try:
+            await self.handler(job)
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+        finally:
+            renewer.cancel()
+
+        if error is None:
+            await self._complete(job)
+        else:
+            await self._fail(job, error)
+
+    async def _worker(self, index: int):
+        # Each worker leases under its own name, so a reclaimed job cannot be
+        # completed by another worker of this process
+        owner = f"{self.owner}:{index}"
+        while not self._stopping:
+            # Cleared before claiming, so an enqueue that lands after an empty claim still wakes us
+            self._wakeup.clear()
+            try:
+                job = await self.claim(owner)
+            except Exception as e:
+                logger.error(f"Job claim failed on worker {index}: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self.run_job(job)
+            except Exception as e:
+                logger.error(f"Job {job['_id']} bookkeeping failed on worker {index}: {e}")
+
+    async def counts(self) -> Dict[str, int]:
+        """Number of jobs in each state"""
+        counts = {status: 0 for status in JOB_STATUSES}
+        async for doc in self.collection.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}]):
+            counts[doc["_id"]] = doc["count"]
+        return counts
+
+    async def dead_letters(self, limit: int = 50) -> List[Dict[str, Any]]:
+        jobs = []
+        cursor = self.collection.find({"status": FAILED}).sort("dead_lettered_at", -1).limit(limit)
+        async for job in cursor:
+            jobs.append(job)
+        return jobs
+
+    async def requeue(self, job_id: str) -> bool:
+        """Give a dead-lettered job a fresh set of attempts"""
+        now = datetime.utcnow()
+        result = await self.collection.update_one(
+            {"_id": job_id, "status": FAILED},
+            {
+                "$set": {"status": PENDING, "attempts": 0, "available_at": now, "updated_at": now},
+                "$unset": {"dead_lettered_at": ""}
+            }
+        )
+        self._wakeup.set()
+        return result.modified_count == 1
@@ -0,0 +1,186 @@
+"""
+Leaderboard for Burn Relief Bot - Per-wallet burn totals maintained on completion
+Each completed burn updates its wallet's row and a grand-total document, so the
+top K burners are a single indexed read instead of an aggregation over burns
+"""
+
+import logging
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Set
+
+from bson.decimal128 import Decimal128
+from pymongo import DESCENDING
+
+from burn_stats import REBUILD_SETTLE, completed_burn_amounts, completed_since, to_decimal, to_decimal128
+
+logger = logging.getLogger(__name__)
+
+LEADERBOARD_TOTALS_ID = "leaderboard_totals"
+BURN_PROJECTION = {"_id": 0, "wallet_address": 1, "wallet": 1, "amount": 1, "total_amount": 1, "timestamp": 1}
+
+
+def burn_wallet(burn: Dict[str, Any]) -> Optional[str]:
+    """Wallet credited for a burn (older records use "wallet")"""
+    return burn.get("wallet_address") or burn.get("wallet")
+
+
+class Leaderboard:
+    """Incrementally maintained per-wallet burn totals"""
+
+    def __init__(self, leaderboard_collection, stats_collection, burns_collection):
+        self.collection = leaderboard_collection
+        self.stats_collection = stats_collection
+        self.burns_collection = burns_collection
+
+    async def ensure_indexes(self):
+        await self.collection.create_index([("total_burned", DESCENDING)], name="total_burned_desc")
+
+    async def ensure_initialized(self):
+        """Build the leaderboard from existing burns the first time the API starts"""
+        await self.ensure_indexes()
+        if await self.stats_collection.find_one({"_id": LEADERBOARD_TOTALS_ID}, {"_id": 1}) is None:
+            await self.rebuild()
+
+    async def record_burn(self, burn: Dict[str, Any]):
+        """Credit a completed burn to its wallet"""
+        wallet = burn_wallet(burn)
+        if not wallet:
+            return
+
+        amount = to_decimal128(completed_burn_amounts(burn)["total_volume"])
+        burned_at = burn.get("timestamp") or datetime.utcnow()
+
+        result = await self.collection.update_one(
+            {"_id": wallet},
+            {
+                "$inc": {"total_burned": amount, "transaction_count": 1},
+                "$max": {"last_burn_at": burned_at},
+                "$setOnInsert": {"wallet_address": wallet}
+            },
+            upsert=True
+        )
+
+        increments: Dict[str, Any] = {"total_burned": amount}
+        if result.upserted_id is not None:
+            increments["participants"] = 1
+        await self.stats_collection.update_one(
+            {"_id": LEADERBOARD_TOTALS_ID},
+            {"$inc": increments, "$set": {"updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+
+    async def top(self, limit: int) -> List[Dict[str, Any]]:
+        """Top burners by total, highest first"""
+        entries = []
+        cursor = self.collection.find({}).sort("total_burned", DESCENDING).limit(limit)
+        async for doc in cursor:
+            entries.append({
+                "wallet_address": doc["_id"],
+                "total_burned": float(to_decimal(doc.get("total_burned"))),
+                "transaction_count": doc.get("transaction_count", 0),
+                "last_burn_at": doc.get("last_burn_at")
+            })
+        return entries
+
+    async def totals(self) -> Dict[str, Any]:
+        """Grand total burned across all wallets and the number of wallets"""
+        doc = await self.stats_collection.find_one({"_id": LEADERBOARD_TOTALS_ID}) or {}
+        return {
+            "total_burned": float(to_decimal(doc.get("total_burned"))),
+            "participants": doc.get("participants", 0),
+            "updated_at": doc.get("updated_at")
+        }
+
+    async def rebuild(self) -> Dict[str, Any]:
+        """Recompute every wallet row and the grand total from completed burns"""
+        settled_before = datetime.utcnow() - REBUILD_SETTLE
+        await self._rebuild()
+
+        # A burn that completed around the scan may have incremented rows the rename
+        # replaced, or may land its increment on top of the new rows; either way its
+        # wallet is recomputed outright, whichever process completed it
+        wallets: Set[str] = set()
+        recent = self.burns_collection.find(completed_since(settled_before), {"_id": 0, "wallet_address": 1, "wallet": 1})
+        async for burn in recent:
+            wallet = burn_wallet(burn)
+            if wallet:
+                wallets.add(wallet)
+        await self._recompute_wallets(wallets)
+        totals = await self._recompute_totals()
+        logger.info(f"Leaderboard rebuilt; {len(wallets)} wallets with recent burns recomputed")
+        return totals
+
+    def _accumulate(self, rows: Dict[str, Dict[str, Any]], burn: Dict[str, Any], wallet: str):
+        amount = completed_burn_amounts(burn)["total_volume"]
+        row = rows.setdefault(wallet, {"total_burned": Decimal(0), "transaction_count": 0, "last_burn_at": None})
+        row["total_burned"] += amount
+        row["transaction_count"] += 1
+        burned_at = burn.get("timestamp")
+        if isinstance(burned_at, datetime) and (row["last_burn_at"] is None or burned_at > row["last_burn_at"]):
+            row["last_burn_at"] = burned_at
+
+    def _row(self, wallet: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "_id": wallet,
+            "wallet_address": wallet,
+            "total_burned": to_decimal128(row["total_burned"]),
+            "transaction_count": row["transaction_count"],
+            "last_burn_at": row["last_burn_at"]
+        }
+
+    async def _rebuild(self):
+        """Replace every row with totals scanned from completed burns"""
+        rows: Dict[str, Dict[str, Any]] = {}
+        async for burn in self.burns_collection.find({"status": "completed"}, BURN_PROJECTION):
+            wallet = burn_wallet(burn)
+            if wallet:
+                self._accumulate(rows, burn, wallet)
+
+        # Build the new rows aside and swap them in with one rename, so readers never
+        # see an empty leaderboard. Each rebuild gets its own staging collection, so
+        # processes rebuilding at the same time cannot drop each other's rows
+        staging = self.collection.database[f"{self.collection.name}_rebuild_{uuid.uuid4().hex}"]
+        try:
+            await staging.create_index([("total_burned", DESCENDING)], name="total_burned_desc")
+            if rows:
+                await staging.insert_many([self._row(wallet, row) for wallet, row in rows.items()])
+            await staging.rename(self.collection.name, dropTarget=True)
+        except Exception:
+            await staging.drop()
+            raise
+        logger.info(f"Leaderboard rows replaced for {len(rows)} wallets")
+
+    async def _recompute_wallets(self, wallets: Set[str]):
+        """Set each wallet's row to what its completed burns add up to right now"""
+        if not wallets:
+            return
+        rows: Dict[str, Dict[str, Any]] = {}
+        query = {
+            "status": "completed",
+            "$or": [{"wallet_address": {"$in": list(wallets)}}, {"wallet": {"$in": list(wallets)}}]
+        }
+        async for burn in self.burns_collection.find(query, BURN_PROJECTION):
+            wallet = burn_wallet(burn)
+            if wallet in wallets:
+                self._accumulate(rows, burn, wallet)
+        for wallet in wallets:
+            if wallet in rows:
+                await self.collection.replace_one({"_id": wallet}, self._row(wallet, rows[wallet]), upsert=True)
+            else:
+                await self.collection.delete_one({"_id": wallet})
+
+    async def _recompute_totals(self) -> Dict[str, Any]:
+        """Set the grand total and participant count from the rows"""
+        totals = {"total_burned": Decimal128("0"), "participants": 0}
+        pipeline = [{"$group": {"_id": None, "total_burned": {"$sum": "$total_burned"}, "participants": {"$sum": 1}}}]
+        async for doc in self.collection.aggregate(pipeline):
+            totals = {"total_burned": doc["total_burned"], "participants": doc["participants"]}
+        now = datetime.utcnow()
+        await self.stats_collection.update_one(
+            {"_id": LEADERBOARD_TOTALS_ID},
+            {"$set": {**totals, "updated_at": now, "rebuilt_at": now}},
+            upsert=True
+        )
+        return await self.totals()
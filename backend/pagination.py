@@ -0,0 +1,87 @@
+"""
+Keyset pagination for Burn Relief Bot - Opaque (timestamp, id) cursors
+Each page continues strictly after the last row of the previous one, so page
+cost stays flat no matter how deep a client pages
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import DESCENDING
+
+# Sort order matching the (..., timestamp, id) compound indexes
+KEYSET_SORT = [("timestamp", DESCENDING), ("id", DESCENDING)]
+
+# Large subdocuments only returned when asked for
+HEAVY_FIELDS = ("allocations", "transaction_hashes")
+
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(doc: Dict[str, Any]) -> str:
+    """Opaque cursor pointing just after doc"""
+    payload = json.dumps({"ts": doc["timestamp"].isoformat(), "id": doc["id"]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of encode_cursor; raises ValueError on tampered or malformed input"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["ts"]), str(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid pagination cursor")
+
+
+def keyset_filter(base_filter: Dict[str, Any], cursor: Optional[str]) -> Dict[str, Any]:
+    """Restrict base_filter to rows after the cursor in KEYSET_SORT order"""
+    if not cursor:
+        return dict(base_filter)
+    timestamp, last_id = decode_cursor(cursor)
+    return {
+        **base_filter,
+        "$or": [
+            {"timestamp": {"$lt": timestamp}},
+            {"timestamp": timestamp, "id": {"$lt": last_id}}
+        ]
+    }
+
+
+def page_projection(include: Optional[str]) -> Dict[str, int]:
+    """Exclude heavy subdocuments unless listed in a comma-separated include"""
+    requested = {field.strip() for field in (include or "").split(",") if field.strip()}
+    unknown = requested - set(HEAVY_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown include fields: {', '.join(sorted(unknown))}")
+    return {field: 0 for field in HEAVY_FIELDS if field not in requested}
+
+
+def clamp_page_size(limit: int, default: int) -> int:
+    if limit is None:
+        return default
+    if limit < 1:
+        raise ValueError("Limit must be at least 1")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+async def fetch_page(collection, base_filter: Dict[str, Any], cursor: Optional[str],
+                     limit: int, include: Optional[str] = None) -> Dict[str, Any]:
+    """Fetch one page plus the cursor for the next one"""
+    query = keyset_filter(base_filter, cursor)
+    projection = page_projection(include) or None
+
+    rows: List[Dict[str, Any]] = []
+    async for doc in collection.find(query, projection).sort(KEYSET_SORT).limit(limit + 1):
+        doc["_id"] = str(doc["_id"])
+        rows.append(doc)
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "transactions": rows,
+        "next_cursor": encode_cursor(rows[-1]) if has_more and rows else None,
+        "has_more": has_more
+    }
@@ -0,0 +1,189 @@
+"""
+Plan scheduler for Burn Relief Bot - Runs execution plans as dependency DAGs
+Each node starts as soon as every node it depends on has confirmed, so
+independent legs run side by side. Node state is saved after every change,
+which lets a plan interrupted by a crash resume from where it stopped
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+# node -> step result; raising fails the node and skips everything that depends on it
+NodeExecutor = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+# (node, submitted step result) -> confirmed result; raising fails the node
+NodeConfirmer = Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+def plan_node(node_id: str, kind: str, route: Dict[str, Any], depends_on: Optional[List[str]] = None) -> Dict[str, Any]:
+    return {"id": node_id, "kind": kind, "route": route, "depends_on": depends_on or []}
+
+
+def validate_dag(nodes: List[Dict[str, Any]]):
+    """Reject unknown dependencies and cycles"""
+    ids = {node["id"] for node in nodes}
+    if len(ids) != len(nodes):
+        raise ValueError("Duplicate node ids in plan")
+    for node in nodes:
+        unknown = set(node["depends_on"]) - ids
+        if unknown:
+            raise ValueError(f"Node {node['id']} depends on unknown nodes: {', '.join(sorted(unknown))}")
+
+    remaining = {node["id"]: set(node["depends_on"]) for node in nodes}
+    while remaining:
+        ready = [node_id for node_id, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Plan has a dependency cycle among: {', '.join(sorted(remaining))}")
+        for node_id in ready:
+            del remaining[node_id]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+class MemoryPlanStore:
+    """Plan state kept in process; a restart forgets every plan"""
+
+    def __init__(self):
+        self.plans: Dict[str, Dict[str, Any]] = {}
+
+    async def create(self, plan_id: str, nodes: List[Dict[str, Any]], context: Dict[str, Any]):
+        self.plans.setdefault(plan_id, {
+            "nodes": nodes,
+            "context": context,
+            "state": {node["id"]: {"status": PENDING} for node in nodes}
+        })
+
+    async def load(self, plan_id: str) -> Optional[Dict[str, Any]]:
+        return self.plans.get(plan_id)
+
+    async def save_node(self, plan_id: str, node_id: str, state: Dict[str, Any]):
+        self.plans[plan_id]["state"][node_id] = dict(state)
+
+
+class MongoPlanStore:
+    """One document per plan; node states are updated in place with $set"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def create(self, plan_id: str, nodes: List[Dict[str, Any]], context: Dict[str, Any]):
+        await self.collection.update_one(
+            {"_id": plan_id},
+            {"$setOnInsert": {
+                "nodes": nodes,
+                "context": context,
+                "state": {node["id"]: {"status": PENDING} for node in nodes},
+                "created_at": datetime.utcnow()
+            }},
+            upsert=True
+        )
+
+    async def load(self, plan_id: str) -> Optional[Dict[str, Any]]:
+        return await self.collection.find_one({"_id": plan_id})
+
+    async def save_node(self, plan_id: str, node_id: str, state: Dict[str, Any]):
+        await self.collection.update_one(
+            {"_id": plan_id},
+            {"$set": {f"state.{node_id}": state, "updated_at": datetime.utcnow()}}
+        )
+
+
+class PlanScheduler:
+    """Runs a plan's nodes in dependency order with as much concurrency as the DAG allows.
+
+    An executor submits a node's step. Its result is saved as "submitted" before
+    confirm waits for it to land, so a resumed plan confirms a step it already
+    sent instead of sending it again.
+    """
+
+    def __init__(self, store, executors: Dict[str, NodeExecutor], max_concurrency: int = 8,
+                 confirm: Optional[NodeConfirmer] = None):
+        self.store = store
+        self.executors = executors
+        self.max_concurrency = max_concurrency
+        self.confirm = confirm
+
+    async def run(self, plan_id: str, nodes: Optional[List[Dict[str, Any]]] = None,
+                  context: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+        """Start or resume plan_id; nodes are only needed the first time.
+        Returns the final state of every node"""
+        if nodes is not None:
+            validate_dag(nodes)
+            await self.store.create(plan_id, nodes, context or {})
+        plan = await self.store.load(plan_id)
+        if plan is None:
+            raise ValueError(f"Unknown plan: {plan_id}")
+
+        nodes_by_id = {node["id"]: node for node in plan["nodes"]}
+        state = {node_id: dict(node_state) for node_id, node_state in plan["state"].items()}
+        for node_id, node_state in state.items():
+            if node_state["status"] == RUNNING:
+                # Interrupted mid-step; a step that was submitted is only confirmed again
+                if node_state.get("submitted") is not None:
+                    logger.info(f"Plan {plan_id}: confirming interrupted node {node_id} from its saved submission")
+                else:
+                    logger.info(f"Plan {plan_id}: re-running interrupted node {node_id}, which had not submitted")
+                node_state["status"] = PENDING
+                node_state["resumed"] = True
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        running: Dict[asyncio.Task, str] = {}
+
+        async def save(node_id: str):
+            await self.store.save_node(plan_id, node_id, state[node_id])
+
+        async def execute(node: Dict[str, Any]):
+            async with semaphore:
+                node_state = state[node["id"]]
+                node_state.update(status=RUNNING, started_at=datetime.utcnow())
+                await save(node["id"])
+                try:
+                    result = node_state.get("submitted")
+                    if result is None:
+                        result = await self.executors[node["kind"]](node)
+                        node_state["submitted"] = result
+                        await save(node["id"])
+                    if self.confirm is not None:
+                        result = await self.confirm(node, result)
+                    node_state.update(status=COMPLETED, result=result, finished_at=datetime.utcnow())
+                except Exception as e:
+                    logger.error(f"Plan {plan_id}: node {node['id']} failed: {e}")
+                    node_state.update(status=FAILED, error=str(e), finished_at=datetime.utcnow())
+                await save(node["id"])
+
+        async def schedule_ready():
+            changed = True
+            while changed:
+                changed = False
+                for node_id, node in nodes_by_id.items():
+                    if state[node_id]["status"] != PENDING or node_id in running.values():
+                        continue
+                    parents = [state[parent]["status"] for parent in node["depends_on"]]
+                    if any(status in (FAILED, SKIPPED) for status in parents):
+                        state[node_id].update(status=SKIPPED, error="A step it depends on did not complete")
+                        await save(node_id)
+                        changed = True
+                    elif all(status == COMPLETED for status in parents):
+                        running[asyncio.ensure_future(execute(node))] = node_id
+
+        await schedule_ready()
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    del running[task]
+                    task.result()
+                await schedule_ready()
+        finally:
+            for task in running:
+                task.cancel()
+        return state
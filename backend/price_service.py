@@ -0,0 +1,223 @@
+"""
+Price service for Burn Relief Bot - Cached USD token prices from CoinGecko
+Prices are kept per token for ttl seconds; after that the cached price is still
+served for up to stale_ttl seconds while a single background request refreshes it.
+Lookups that miss the cache within a few milliseconds of each other are sent to
+CoinGecko as one multi-address request per platform
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+COINGECKO_API_URL = "https://api.coingecko.com/api/v3"
+
+# Our chain names -> CoinGecko asset platform ids
+PLATFORMS = {
+    "ethereum": "ethereum",
+    "base": "base",
+    "polygon": "polygon-pos",
+    "arbitrum": "arbitrum-one",
+    "solana": "solana"
+}
+
+
+def price_key(chain: str, token_address: str) -> Tuple[str, str]:
+    """(platform, address) a price is cached under; EVM addresses are case-insensitive"""
+    chain = chain.lower()
+    platform = PLATFORMS.get(chain, "ethereum")
+    return platform, token_address if chain == "solana" else token_address.lower()
+
+
+class PriceService:
+    """TTL cache with stale-while-revalidate in front of CoinGecko's simple/token_price"""
+
+    def __init__(self, base_url: str = COINGECKO_API_URL, api_key: Optional[str] = None,
+                 ttl: float = 60.0, stale_ttl: float = 600.0, timeout: float = 5.0,
+                 max_entries: int = 10_000, window: float = 0.005, max_batch: int = 50):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self.window = window
+        self.max_batch = max_batch
+
+        # (platform, address) -> (fetched_at, price); price is None when CoinGecko has no quote
+        self._prices: Dict[Tuple[str, str], Tuple[float, Optional[float]]] = {}
+        self._in_flight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._refreshes: Set[asyncio.Task] = set()
+        # platform -> addresses waiting for the next multi-address request
+        self._pending: Dict[str, Dict[str, asyncio.Future]] = {}
+        self._flush_handles: Dict[str, asyncio.TimerHandle] = {}
+        self._batches: Set[asyncio.Task] = set()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.stats = {
+            "hits": 0, "stale_hits": 0, "misses": 0,
+            "upstream_requests": 0, "upstream_tokens": 0, "upstream_errors": 0
+        }
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            headers = {"x-cg-demo-api-key": self.api_key} if self.api_key else None
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=60, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers=headers
+            )
+        return self._session
+
+    async def close(self):
+        for handle in self._flush_handles.values():
+            handle.cancel()
+        for task in list(self._refreshes) + list(self._batches):
+            task.cancel()
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    async def _request(self, platform: str, addresses: List[str]) -> Dict[str, Optional[float]]:
+        """One simple/token_price call for many addresses; tokens CoinGecko does not track map to None"""
+        session = await self.get_session()
+        self.stats["upstream_requests"] += 1
+        self.stats["upstream_tokens"] += len(addresses)
+        url = f"{self.base_url}/simple/token_price/{platform}"
+        params = {"contract_addresses": ",".join(addresses), "vs_currencies": "usd"}
+        async with session.get(url, params=params) as response:
+            response.raise_for_status()
+            data = await response.json(content_type=None)
+        # CoinGecko lower-cases EVM addresses in its response
+        quotes = {address.lower(): quote for address, quote in data.items() if isinstance(quote, dict)}
+        prices = {}
+        for address in addresses:
+            price = quotes.get(address.lower(), {}).get("usd")
+            prices[address] = float(price) if price is not None else None
+        return prices
+
+    def _enqueue(self, platform: str, address: str) -> asyncio.Future:
+        """Queue an address for the platform's next multi-address request"""
+        loop = asyncio.get_running_loop()
+        pending = self._pending.setdefault(platform, {})
+        future = pending.get(address)
+        if future is None:
+            future = pending[address] = loop.create_future()
+        if len(pending) >= self.max_batch:
+            self._flush(platform)
+        elif platform not in self._flush_handles:
+            self._flush_handles[platform] = loop.call_later(self.window, self._flush, platform)
+        return future
+
+    def _flush(self, platform: str):
+        handle = self._flush_handles.pop(platform, None)
+        if handle is not None:
+            handle.cancel()
+        batch = self._pending.pop(platform, None)
+        if batch:
+            task = asyncio.ensure_future(self._send(platform, batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _send(self, platform: str, batch: Dict[str, asyncio.Future]):
+        try:
+            prices = await self._request(platform, list(batch))
+        except Exception as e:
+            self.stats["upstream_errors"] += 1
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for address, future in batch.items():
+            if not future.done():
+                future.set_result(prices.get(address))
+
+    def _remember(self, key: Tuple[str, str], price: Optional[float]):
+        now = time.monotonic()
+        if len(self._prices) >= self.max_entries and key not in self._prices:
+            cutoff = now - self.stale_ttl
+            self._prices = {k: v for k, v in self._prices.items() if v[0] > cutoff}
+            if len(self._prices) >= self.max_entries:
+                del self._prices[min(self._prices, key=lambda k: self._prices[k][0])]
+        self._prices[key] = (now, price)
+
+    async def _fetch(self, key: Tuple[str, str]) -> Optional[float]:
+        """Upstream lookup; concurrent callers for one token share a single request"""
+        if key in self._in_flight:
+            return await asyncio.shield(self._in_flight[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            price = await self._enqueue(*key)
+            self._remember(key, price)
+            future.set_result(price)
+            return price
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a failure nobody else waited on is not logged as unhandled
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    def _refresh(self, key: Tuple[str, str]):
+        if key in self._in_flight:
+            return
+
+        async def refresh():
+            try:
+                await self._fetch(key)
+            except Exception as e:
+                logger.warning(f"Background price refresh failed for {key[0]}:{key[1]}: {e}")
+
+        task = asyncio.ensure_future(refresh())
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+
+    async def get_price(self, token_address: str, chain: str) -> Optional[float]:
+        """USD price of a token, or None if CoinGecko does not quote it.
+        Raises when the price API fails and there is no cached price to fall back on"""
+        key = price_key(chain, token_address)
+        cached = self._prices.get(key)
+        if cached is not None:
+            age = time.monotonic() - cached[0]
+            if age < self.ttl:
+                self.stats["hits"] += 1
+                return cached[1]
+            if age < self.stale_ttl:
+                self.stats["stale_hits"] += 1
+                self._refresh(key)
+                return cached[1]
+
+        self.stats["misses"] += 1
+        return await self._fetch(key)
+
+    async def get_prices(self, token_addresses: Iterable[str], chain: str) -> Dict[str, Optional[float]]:
+        """USD prices for many tokens on one chain; cache misses go upstream together.
+        A token whose lookup failed maps to its last known price, or None"""
+        addresses = list(dict.fromkeys(token_addresses))
+        results = await asyncio.gather(
+            *(self.get_price(address, chain) for address in addresses), return_exceptions=True
+        )
+        prices, failures = {}, []
+        for address, result in zip(addresses, results):
+            if isinstance(result, Exception):
+                failures.append(result)
+                result = self.cached_price(address, chain)
+            prices[address] = result
+        if failures:
+            logger.warning(f"Price lookup failed for {len(failures)} of {len(addresses)} {chain} tokens: "
+                           f"{failures[0].__class__.__name__}")
+        return prices
+
+    def cached_price(self, token_address: str, chain: str) -> Optional[float]:
+        """Last known price regardless of age, without contacting CoinGecko"""
+        cached = self._prices.get(price_key(chain, token_address))
+        return cached[1] if cached else None
+
+    def metrics(self) -> Dict[str, Any]:
+        return {**self.stats, "cached_tokens": len(self._prices), "in_flight": len(self._in_flight)}
@@ -0,0 +1,152 @@
+"""
+Swap quote cache for Burn Relief Bot - Short-lived quotes shared across similar amounts
+Quotes are cached per (chain, input token, output token, amount bucket), where
+buckets are log-scaled so each covers a fixed ratio of amounts. A hit for a
+different amount in the same bucket is rescaled linearly from the cached quote
+"""
+
+import asyncio
+import math
+import os
+import time
+from collections import OrderedDict
+from decimal import Decimal, InvalidOperation
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+QuoteFetcher = Callable[[], Awaitable[Dict[str, Any]]]
+
+# Amount fields in the quote formats we cache: our own API, Uniswap and Jupiter
+INPUT_FIELDS = ("input_amount", "inputAmount", "inAmount")
+OUTPUT_FIELDS = ("output_amount", "outputAmount", "outAmount", "otherAmountThreshold")
+# Per-hop breakdowns that cannot be rescaled as a whole; dropped from rescaled quotes
+ROUTE_FIELDS = ("routePlan",)
+
+
+def amount_bucket(amount: float, buckets_per_decade: int) -> int:
+    """Log-scaled bucket; amounts in one bucket differ by at most 10 ** (1 / buckets_per_decade)"""
+    if amount <= 0:
+        raise ValueError("Amount must be positive")
+    return math.floor(math.log10(amount) * buckets_per_decade)
+
+
+def scale_amount(value: Any, ratio: Decimal) -> Any:
+    """Scale a quote amount, keeping integer base-unit strings as integers"""
+    try:
+        scaled = Decimal(str(value)) * ratio
+    except (InvalidOperation, ValueError):
+        return value
+    if isinstance(value, str) and value.lstrip("-").isdigit():
+        return str(int(scaled))
+    if isinstance(value, str):
+        return str(float(scaled))
+    return type(value)(scaled)
+
+
+def requested_amount(value: Any, amount: Decimal, requested: Any) -> Any:
+    """The requested amount in the type of the quote field it replaces"""
+    if isinstance(value, str):
+        return str(requested)
+    return type(value)(amount)
+
+
+def parse_amount(amount: Any) -> Decimal:
+    """Decimal amount; NaN, infinity and non-numbers are rejected"""
+    try:
+        value = Decimal(str(amount))
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"Invalid amount: {amount}")
+    if not value.is_finite():
+        raise ValueError("Amount must be a finite number")
+    return value
+
+
+class SwapQuoteCache:
+    """TTL cache of swap quotes keyed by token pair and log-scaled amount bucket"""
+
+    def __init__(self, ttl: float = 5.0, buckets_per_decade: int = 20, max_entries: int = 5_000,
+                 input_fields: Iterable[str] = INPUT_FIELDS, output_fields: Iterable[str] = OUTPUT_FIELDS):
+        self.ttl = ttl
+        self.buckets_per_decade = buckets_per_decade
+        self.max_entries = max_entries
+        self.input_fields = tuple(input_fields)
+        self.output_fields = tuple(output_fields)
+
+        # key -> (expires_at, quoted amount, quote)
+        self._entries: "OrderedDict[Tuple[str, str, str, int], Tuple[float, Decimal, Dict[str, Any]]]" = OrderedDict()
+        self._in_flight: Dict[Tuple[str, str, str, int], asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+    def key(self, chain: str, input_token: str, output_token: str, amount: float) -> Tuple[str, str, str, int]:
+        return (chain.lower(), input_token.lower(), output_token.lower(),
+                amount_bucket(amount, self.buckets_per_decade))
+
+    def rescale(self, quote: Dict[str, Any], quoted_amount: Decimal, amount: Decimal,
+                requested: Any = None) -> Dict[str, Any]:
+        """Quote for amount from one made for quoted_amount, assuming a linear price within the bucket.
+        Input fields carry the requested amount as given; only the output fields are scaled.
+        Route breakdowns such as Jupiter's routePlan still describe the quoted amount, so they are dropped"""
+        if amount == quoted_amount:
+            return dict(quote)
+        ratio = amount / quoted_amount
+        scaled = dict(quote)
+        for field in self.input_fields:
+            if field in scaled:
+                scaled[field] = requested_amount(scaled[field], amount, amount if requested is None else requested)
+        for field in self.output_fields:
+            if field in scaled:
+                scaled[field] = scale_amount(scaled[field], ratio)
+        for field in ROUTE_FIELDS:
+            scaled.pop(field, None)
+        return scaled
+
+    def _remember(self, key, amount: Decimal, quote: Dict[str, Any]):
+        self._entries[key] = (time.monotonic() + self.ttl, amount, quote)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _cached(self, key) -> Optional[Tuple[Decimal, Dict[str, Any]]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        return entry[1], entry[2]
+
+    async def get_quote(self, chain: str, input_token: str, output_token: str, amount: Any,
+                        fetch: QuoteFetcher) -> Dict[str, Any]:
+        """Cached quote for amount, or fetch() one; the result carries cached: True / False.
+        Quotes with an "error" key are passed through and never cached. Raises ValueError for an
+        amount that is not a finite number"""
+        requested, amount = amount, parse_amount(amount)
+        if amount <= 0:
+            return {**await fetch(), "cached": False}
+        key = self.key(chain, input_token, output_token, float(amount))
+
+        cached = self._cached(key)
+        if cached is None and key in self._in_flight:
+            self.stats["coalesced"] += 1
+            await asyncio.shield(self._in_flight[key])
+            cached = self._cached(key)
+        if cached is not None:
+            self.stats["hits"] += 1
+            return {**self.rescale(cached[1], cached[0], amount, requested), "cached": True}
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            quote = await fetch()
+            if "error" not in quote:
+                self._remember(key, amount, quote)
+            return {**quote, "cached": False}
+        finally:
+            del self._in_flight[key]
+            future.set_result(None)
+
+
+# One cache for the process, shared by the API's quote previews and BlockchainService
+SWAP_QUOTE_CACHE_ENABLED = os.getenv("SWAP_QUOTE_CACHE", "true").lower() == "true"
+swap_quote_cache = SwapQuoteCache(ttl=float(os.getenv("SWAP_QUOTE_TTL_SECONDS", "5"))) \
+    if SWAP_QUOTE_CACHE_ENABLED else None
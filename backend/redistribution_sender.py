@@ -0,0 +1,395 @@
+"""
+Redistribution sender for Burn Relief Bot - Concurrent ERC-20 transfers from one wallet
+Nonces are assigned locally by a per-wallet NonceManager, every transfer of a
+redistribution is signed up front, broadcast together and confirmed in parallel.
+BatchedDistributionSender instead sends all legs as one disperse contract call
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from web3 import Web3
+
+logger = logging.getLogger(__name__)
+
+# Plenty for a standard ERC-20 transfer; unused gas is not charged
+TRANSFER_GAS_LIMIT = 100_000
+# Zero-value transfer to self, used to fill the nonce of a rejected broadcast
+GAP_FILL_GAS_LIMIT = 21_000
+# disperseToken gas: fixed overhead plus one transferFrom per leg
+DISPERSE_BASE_GAS = 60_000
+DISPERSE_GAS_PER_LEG = 45_000
+APPROVE_GAS_LIMIT = 80_000
+
+# Disperse (disperse.app), deployed at the same address on Base and most EVM chains
+DEFAULT_DISPERSE_ADDRESS = "0xD152f549545093347A162Dce210e7293f1452150"
+
+TRANSFER_TOPIC = Web3.to_hex(Web3.keccak(text="Transfer(address,address,uint256)"))
+
+TRANSFER_ABI = [{
+    "constant": False,
+    "inputs": [{"name": "_to", "type": "address"}, {"name": "_value", "type": "uint256"}],
+    "name": "transfer",
+    "outputs": [{"name": "", "type": "bool"}],
+    "type": "function"
+}]
+
+ALLOWANCE_ABI = [
+    {
+        "constant": True,
+        "inputs": [{"name": "_owner", "type": "address"}, {"name": "_spender", "type": "address"}],
+        "name": "allowance",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "type": "function"
+    },
+    {
+        "constant": False,
+        "inputs": [{"name": "_spender", "type": "address"}, {"name": "_value", "type": "uint256"}],
+        "name": "approve",
+        "outputs": [{"name": "", "type": "bool"}],
+        "type": "function"
+    }
+]
+
+DISPERSE_ABI = [{
+    "constant": False,
+    "inputs": [
+        {"name": "token", "type": "address"},
+        {"name": "recipients", "type": "address[]"},
+        {"name": "values", "type": "uint256[]"}
+    ],
+    "name": "disperseToken",
+    "outputs": [],
+    "type": "function"
+}]
+
+
+def transfer_logs(receipt, token_address: str, sender: str) -> List[Tuple[str, int]]:
+    """(recipient, amount) for each ERC-20 Transfer of token_address from sender in a receipt"""
+    token = token_address.lower()
+    sender_topic = "0x" + sender.lower()[2:].rjust(64, "0")
+    transfers = []
+    for log in receipt["logs"]:
+        topics = [Web3.to_hex(topic) for topic in log["topics"]]
+        if log["address"].lower() != token or len(topics) != 3:
+            continue
+        if topics[0] != TRANSFER_TOPIC or topics[1] != sender_topic:
+            continue
+        transfers.append(("0x" + topics[2][-40:], int(Web3.to_hex(log["data"]), 16)))
+    return transfers
+
+
+class NonceManager:
+    """Sequential nonces per sending address, shared by concurrent redistributions.
+
+    Callers release() each reservation once its transactions have been
+    broadcast (or given up on). A resync is deferred until no reservation is
+    outstanding, since re-reading the pending count earlier would hand out
+    nonces that are reserved but not yet broadcast.
+    """
+
+    def __init__(self, web3):
+        self.web3 = web3
+        self._next: Dict[str, int] = {}
+        self._outstanding: Dict[str, int] = {}
+        self._stale: Set[str] = set()
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def _lock(self, address: str) -> asyncio.Lock:
+        return self._locks.setdefault(address, asyncio.Lock())
+
+    async def reserve(self, address: str, count: int) -> List[int]:
+        """Reserve count consecutive nonces; the first call reads the pending count from the node"""
+        async with self._lock(address):
+            if address not in self._next:
+                self._next[address] = await self.web3.eth.get_transaction_count(address, "pending")
+            start = self._next[address]
+            self._next[address] = start + count
+            self._outstanding[address] = self._outstanding.get(address, 0) + 1
+            return list(range(start, start + count))
+
+    async def release(self, address: str):
+        """Mark one reservation as broadcast; applies a deferred resync once none are outstanding"""
+        async with self._lock(address):
+            self._outstanding[address] = max(self._outstanding.get(address, 0) - 1, 0)
+            if self._outstanding[address] == 0 and address in self._stale:
+                self._stale.discard(address)
+                self._next.pop(address, None)
+
+    async def resync(self, address: str):
+        """Re-read the counter from the node on the next reservation after all outstanding ones are released"""
+        async with self._lock(address):
+            if self._outstanding.get(address, 0) > 0:
+                self._stale.add(address)
+            else:
+                self._next.pop(address, None)
+
+
+class RedistributionSender:
+    """Signs, broadcasts and confirms all transfers of one redistribution at once"""
+
+    def __init__(self, web3, account, nonce_manager: Optional[NonceManager] = None,
+                 chain_id: Optional[int] = None, gas_limit: int = TRANSFER_GAS_LIMIT,
+                 receipt_timeout: float = 120.0, poll_latency: float = 0.5):
+        self.web3 = web3
+        self.account = account
+        self.nonces = nonce_manager or NonceManager(web3)
+        self.chain_id = chain_id
+        self.gas_limit = gas_limit
+        self.receipt_timeout = receipt_timeout
+        self.poll_latency = poll_latency
+
+    async def _get_chain_id(self) -> int:
+        if self.chain_id is None:
+            self.chain_id = await self.web3.eth.chain_id
+        return self.chain_id
+
+    def build_transfers(self, token_address: str, legs: List[Tuple[str, int]],
+                        nonces: List[int], gas_price: int, chain_id: int) -> List[Dict[str, Any]]:
+        """Unsigned transfer transactions, one per (recipient, amount) leg"""
+        token = self.web3.eth.contract(address=Web3.to_checksum_address(token_address), abi=TRANSFER_ABI)
+        return [
+            {
+                "to": token.address,
+                "value": 0,
+                "data": token.encodeABI(fn_name="transfer", args=[Web3.to_checksum_address(recipient), amount]),
+                "nonce": nonce,
+                "gas": self.gas_limit,
+                "gasPrice": gas_price,
+                "chainId": chain_id
+            }
+            for (recipient, amount), nonce in zip(legs, nonces)
+        ]
+
+    async def _fill_gap(self, nonce: int, gas_price: int, chain_id: int):
+        """Use up the nonce of a rejected transfer so later nonces are not stuck behind it"""
+        signed = self.account.sign_transaction({
+            "to": self.account.address,
+            "value": 0,
+            "nonce": nonce,
+            "gas": GAP_FILL_GAS_LIMIT,
+            "gasPrice": gas_price,
+            "chainId": chain_id
+        })
+        await self.web3.eth.send_raw_transaction(signed.rawTransaction)
+
+    async def _confirm(self, tx_hash) -> str:
+        receipt = await self.web3.eth.wait_for_transaction_receipt(
+            tx_hash, timeout=self.receipt_timeout, poll_latency=self.poll_latency
+        )
+        if receipt["status"] != 1:
+            raise RuntimeError(f"Transfer reverted in block {receipt['blockNumber']}")
+        return Web3.to_hex(tx_hash)
+
+    async def send(self, token_address: str, distributions: Dict[str, int], gas_price: int) -> Dict[str, str]:
+        """Send every non-zero leg; returns recipient -> tx hash, or "ERROR: ..." for failed legs"""
+        legs = [(recipient, amount) for recipient, amount in distributions.items() if amount > 0]
+        if not legs:
+            return {}
+
+        address = self.account.address
+        chain_id = await self._get_chain_id()
+        nonces = await self.nonces.reserve(address, len(legs))
+        try:
+            signed = [
+                self.account.sign_transaction(tx)
+                for tx in self.build_transfers(token_address, legs, nonces, gas_price, chain_id)
+            ]
+
+            sent = await asyncio.gather(
+                *(self.web3.eth.send_raw_transaction(tx.rawTransaction) for tx in signed),
+                return_exceptions=True
+            )
+            rejected = [nonce for nonce, outcome in zip(nonces, sent) if isinstance(outcome, Exception)]
+            if rejected:
+                filled = await asyncio.gather(
+                    *(self._fill_gap(nonce, gas_price, chain_id) for nonce in rejected),
+                    return_exceptions=True
+                )
+                if any(isinstance(outcome, Exception) for outcome in filled):
+                    logger.warning(f"Could not fill nonces {rejected} for {address}, resyncing")
+                    await self.nonces.resync(address)
+        except BaseException:
+            # Building, signing or a cancellation left reserved nonces unbroadcast
+            await self.nonces.resync(address)
+            raise
+        finally:
+            await self.nonces.release(address)
+
+        confirmed = await asyncio.gather(
+            *(self._confirm(outcome) for outcome in sent if not isinstance(outcome, Exception)),
+            return_exceptions=True
+        )
+
+        results = {}
+        confirmations = iter(confirmed)
+        for (recipient, amount), nonce, outcome in zip(legs, nonces, sent):
+            if not isinstance(outcome, Exception):
+                outcome = next(confirmations)
+            if isinstance(outcome, Exception):
+                logger.error(f"Transfer of {amount} to {recipient} (nonce {nonce}) failed: {outcome}")
+                results[recipient] = f"ERROR: {str(outcome) or outcome.__class__.__name__}"
+            else:
+                results[recipient] = outcome
+        return results
+
+
+class BatchedDistributionSender:
+    """Sends every leg of a redistribution in one disperseToken call.
+
+    Disperse pulls the tokens with transferFrom, so the wallet approves it
+    first when the allowance is short: for the batch total, or for the
+    maximum amount once when approve_unlimited is set. Per-leg results are
+    read back from the Transfer events in the disperse receipt.
+
+    approve() replaces the allowance rather than adding to it, so batches of
+    one token are planned under a per-token lock against the allowance left
+    once every earlier in-flight batch has executed, not the on-chain value.
+    """
+
+    def __init__(self, web3, account, nonce_manager: Optional[NonceManager] = None,
+                 chain_id: Optional[int] = None, disperse_address: str = DEFAULT_DISPERSE_ADDRESS,
+                 approve_unlimited: bool = False,
+                 receipt_timeout: float = 120.0, poll_latency: float = 0.5):
+        self.web3 = web3
+        self.account = account
+        self.nonces = nonce_manager or NonceManager(web3)
+        self.chain_id = chain_id
+        self.disperse = web3.eth.contract(address=Web3.to_checksum_address(disperse_address), abi=DISPERSE_ABI)
+        self.approve_unlimited = approve_unlimited
+        self.receipt_timeout = receipt_timeout
+        self.poll_latency = poll_latency
+
+        # token -> allowance after every in-flight batch has executed; absent when unknown
+        self._expected_allowance: Dict[str, int] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._token_locks: Dict[str, asyncio.Lock] = {}
+
+    async def _get_chain_id(self) -> int:
+        if self.chain_id is None:
+            self.chain_id = await self.web3.eth.chain_id
+        return self.chain_id
+
+    async def _plan(self, token, total: int) -> Tuple[Optional[int], List[int]]:
+        """Approval amount (None if the allowance suffices) and nonces for one batch of token"""
+        key = token.address.lower()
+        address = self.account.address
+        async with self._token_locks.setdefault(key, asyncio.Lock()):
+            if self._in_flight.get(key, 0) == 0:
+                expected = await token.functions.allowance(address, self.disperse.address).call()
+            else:
+                expected = self._expected_allowance.get(key)
+            approval = None
+            if expected is None or expected < total:
+                approval = 2 ** 256 - 1 if self.approve_unlimited else total
+                expected = approval
+            nonces = await self.nonces.reserve(address, 2 if approval is not None else 1)
+            self._expected_allowance[key] = expected - total
+            self._in_flight[key] = self._in_flight.get(key, 0) + 1
+            return approval, nonces
+
+    def _settle(self, token, succeeded: bool):
+        """A batch of token is done; a failed one leaves the allowance unknown until a fresh read"""
+        key = token.address.lower()
+        self._in_flight[key] -= 1
+        if not succeeded or self._in_flight[key] == 0:
+            self._expected_allowance.pop(key, None)
+
+    def build_disperse(self, token_address: str, legs: List[Tuple[str, int]],
+                       nonce: int, gas_price: int, chain_id: int) -> Dict[str, Any]:
+        recipients = [Web3.to_checksum_address(recipient) for recipient, _ in legs]
+        values = [amount for _, amount in legs]
+        return {
+            "to": self.disperse.address,
+            "value": 0,
+            "data": self.disperse.encodeABI(
+                fn_name="disperseToken",
+                args=[Web3.to_checksum_address(token_address), recipients, values]
+            ),
+            "nonce": nonce,
+            "gas": DISPERSE_BASE_GAS + DISPERSE_GAS_PER_LEG * len(legs),
+            "gasPrice": gas_price,
+            "chainId": chain_id
+        }
+
+    def build_approve(self, token, amount: int, nonce: int, gas_price: int, chain_id: int) -> Dict[str, Any]:
+        return {
+            "to": token.address,
+            "value": 0,
+            "data": token.encodeABI(fn_name="approve", args=[self.disperse.address, amount]),
+            "nonce": nonce,
+            "gas": APPROVE_GAS_LIMIT,
+            "gasPrice": gas_price,
+            "chainId": chain_id
+        }
+
+    async def send(self, token_address: str, distributions: Dict[str, int], gas_price: int) -> Dict[str, str]:
+        """Send every non-zero leg in one transaction; returns recipient -> tx hash, or "ERROR: ..." per leg"""
+        legs = [(recipient, amount) for recipient, amount in distributions.items() if amount > 0]
+        if not legs:
+            return {}
+
+        chain_id = await self._get_chain_id()
+        token = self.web3.eth.contract(address=Web3.to_checksum_address(token_address), abi=ALLOWANCE_ABI)
+        total = sum(amount for _, amount in legs)
+
+        try:
+            approval, nonces = await self._plan(token, total)
+        except Exception as e:
+            logger.error(f"Batched distribution of {len(legs)} legs failed to send: {e}")
+            return {recipient: f"ERROR: {str(e)}" for recipient, _ in legs}
+
+        succeeded = False
+        try:
+            results = await self._send_batch(token, token_address, legs, approval, nonces, gas_price, chain_id)
+            succeeded = all(not value.startswith("ERROR") for value in results.values())
+            return results
+        finally:
+            self._settle(token, succeeded)
+
+    async def _send_batch(self, token, token_address: str, legs: List[Tuple[str, int]], approval: Optional[int],
+                          nonces: List[int], gas_price: int, chain_id: int) -> Dict[str, str]:
+        address = self.account.address
+        hashes = []
+        try:
+            try:
+                transactions = [self.build_disperse(token_address, legs, nonces[-1], gas_price, chain_id)]
+                if approval is not None:
+                    transactions.insert(0, self.build_approve(token, approval, nonces[0], gas_price, chain_id))
+                # Broadcast in nonce order; the node holds the disperse call until the approval is in
+                for tx in transactions:
+                    hashes.append(await self.web3.eth.send_raw_transaction(self.account.sign_transaction(tx).rawTransaction))
+            except BaseException:
+                # Includes cancellation, which would otherwise leave the reserved nonces as a gap
+                await self.nonces.resync(address)
+                raise
+            finally:
+                await self.nonces.release(address)
+        except Exception as e:
+            logger.error(f"Batched distribution of {len(legs)} legs failed to send: {e}")
+            return {recipient: f"ERROR: {str(e)}" for recipient, _ in legs}
+
+        try:
+            receipt = await self.web3.eth.wait_for_transaction_receipt(
+                hashes[-1], timeout=self.receipt_timeout, poll_latency=self.poll_latency
+            )
+        except Exception as e:
+            return {recipient: f"ERROR: {str(e) or e.__class__.__name__}" for recipient, _ in legs}
+
+        tx_hash = Web3.to_hex(hashes[-1])
+        if receipt["status"] != 1:
+            return {recipient: f"ERROR: Disperse reverted in {tx_hash}" for recipient, _ in legs}
+
+        # Match each leg to one Transfer event with the same recipient and amount
+        remaining = transfer_logs(receipt, token_address, address)
+        results = {}
+        for recipient, amount in legs:
+            leg = (recipient.lower(), amount)
+            if leg in remaining:
+                remaining.remove(leg)
+                results[recipient] = tx_hash
+            else:
+                logger.error(f"No Transfer of {amount} to {recipient} in {tx_hash}")
+                results[recipient] = f"ERROR: No matching Transfer event in {tx_hash}"
+        return results
@@ -0,0 +1,231 @@
+"""
+Route graph for Burn Relief Bot - Cheapest bridge path and target chain per output token
+Chains are nodes and bridge providers are edges carrying fee, latency and
+liquidity estimates. Shortest paths from every source chain are computed once
+per liquidity tier, so choosing target chains for many tokens is a table lookup
+"""
+
+import heapq
+import itertools
+import math
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Dollar value put on a minute of bridging time when comparing routes
+TIME_COST_USD_PER_MINUTE = 0.5
+# Weight of a newly observed fee / latency in an edge's moving average
+OBSERVATION_ALPHA = 0.3
+# Relative change in an edge's weight, since the tables were last dropped, that makes them stale
+REPLAN_THRESHOLD = 0.05
+
+# Default (fee USD, seconds, liquidity USD) per bridge provider until routes are observed
+DEFAULT_BRIDGE_ESTIMATES = {
+    "Li.Fi": (8.0, 300.0, 5_000_000.0),
+    "Wormhole": (17.5, 1050.0, 2_000_000.0)
+}
+# Chains Li.Fi routes between; Wormhole reaches every chain with a wormhole_id
+LIFI_CHAINS = {"ethereum", "base", "polygon", "arbitrum", "solana"}
+# Extra seconds to wait for finality before a bridge releases funds, by source chain
+FINALITY_SECONDS = {"ethereum": 180.0, "solana": 15.0, "bitcoin": 3600.0}
+DEFAULT_FINALITY_SECONDS = 60.0
+
+# Where each output token can be bought: chain -> (swap fee USD, seconds, pool liquidity USD)
+DEFAULT_VENUES = {
+    "DRB": {"base": (3.0, 60.0, 2_000_000.0)},
+    "cbBTC": {"ethereum": (6.0, 90.0, 50_000_000.0), "base": (2.0, 60.0, 20_000_000.0)}
+}
+# Burning on the source chain, the same everywhere for now
+BURN_ESTIMATE = (3.5, 30.0)
+
+
+class SwapVenue(NamedTuple):
+    fee_usd: float
+    seconds: float
+    liquidity_usd: float
+
+
+class BridgeEdge:
+    """One provider's bridge between two chains with its running estimates"""
+
+    def __init__(self, provider: str, from_chain: str, to_chain: str,
+                 fee_usd: float, seconds: float, liquidity_usd: float):
+        self.provider = provider
+        self.from_chain = from_chain
+        self.to_chain = to_chain
+        self.fee_usd = fee_usd
+        self.seconds = seconds
+        self.liquidity_usd = liquidity_usd
+        # Weight when the shortest-path tables were last dropped
+        self.planned_weight = self.weight()
+
+    def weight(self) -> float:
+        return self.fee_usd + self.seconds / 60 * TIME_COST_USD_PER_MINUTE
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "provider": self.provider,
+            "from_chain": self.from_chain,
+            "to_chain": self.to_chain,
+            "estimated_cost_usd": round(self.fee_usd, 2),
+            "estimated_time_seconds": round(self.seconds)
+        }
+
+
+class RoutePlan(NamedTuple):
+    """Cheapest way to turn source-chain value into token on target_chain"""
+    token: str
+    source_chain: str
+    target_chain: str
+    hops: List[BridgeEdge]
+    cost_usd: float
+    seconds: float
+    score: float
+
+
+def format_cost(usd: float) -> str:
+    return f"${usd:,.2f}"
+
+
+def format_duration(seconds: float) -> str:
+    if seconds < 90:
+        return f"{round(seconds)} seconds"
+    return f"{round(seconds / 60)} minutes"
+
+
+def liquidity_tier(amount_usd: Optional[float]) -> float:
+    """Edges and venues must hold at least this much; rounds up to a power of ten so tables are shared"""
+    if not amount_usd or amount_usd <= 0:
+        return 0.0
+    return 10.0 ** math.ceil(math.log10(amount_usd))
+
+
+class RouteGraph:
+    """Weighted multi-hop bridge graph with precomputed shortest paths per liquidity tier"""
+
+    def __init__(self, chains: Iterable[str], edges: Iterable[BridgeEdge],
+                 venues: Dict[str, Dict[str, Tuple[float, float, float]]]):
+        self.chains = list(chains)
+        self.edges: Dict[str, List[BridgeEdge]] = {chain: [] for chain in self.chains}
+        for edge in edges:
+            self.edges[edge.from_chain].append(edge)
+        self.venues = {
+            token: {chain: SwapVenue(*venue) for chain, venue in chains_.items()}
+            for token, chains_ in venues.items()
+        }
+        # tier -> source chain -> (cost to reach each chain, edge used to arrive there)
+        self._tables: Dict[float, Dict[str, Tuple[Dict[str, float], Dict[str, BridgeEdge]]]] = {}
+
+    @classmethod
+    def from_chain_configs(cls, chain_configs: Dict[str, Dict[str, Any]],
+                           bridge_estimates: Dict[str, Tuple[float, float, float]] = DEFAULT_BRIDGE_ESTIMATES,
+                           venues: Dict[str, Dict[str, Tuple[float, float, float]]] = DEFAULT_VENUES) -> "RouteGraph":
+        """Wormhole between every chain with a wormhole_id, Li.Fi between the chains it supports"""
+        edges = []
+        for from_chain in chain_configs:
+            for to_chain in chain_configs:
+                if from_chain == to_chain:
+                    continue
+                finality = FINALITY_SECONDS.get(from_chain, DEFAULT_FINALITY_SECONDS)
+                for provider, (fee, seconds, liquidity) in bridge_estimates.items():
+                    if provider == "Li.Fi" and not {from_chain, to_chain} <= LIFI_CHAINS:
+                        continue
+                    if provider == "Wormhole" and (chain_configs[from_chain].get("wormhole_id") is None
+                                                   or chain_configs[to_chain].get("wormhole_id") is None):
+                        continue
+                    edges.append(BridgeEdge(provider, from_chain, to_chain, fee, seconds + finality, liquidity))
+        return cls(chain_configs, edges, venues)
+
+    def _shortest_paths(self, source: str, tier: float) -> Tuple[Dict[str, float], Dict[str, BridgeEdge]]:
+        """Dijkstra over edges with at least tier liquidity"""
+        costs = {source: 0.0}
+        arrived_by: Dict[str, BridgeEdge] = {}
+        queue = [(0.0, source)]
+        while queue:
+            cost, chain = heapq.heappop(queue)
+            if cost > costs.get(chain, math.inf):
+                continue
+            for edge in self.edges.get(chain, []):
+                if edge.liquidity_usd < tier:
+                    continue
+                next_cost = cost + edge.weight()
+                if next_cost < costs.get(edge.to_chain, math.inf):
+                    costs[edge.to_chain] = next_cost
+                    arrived_by[edge.to_chain] = edge
+                    heapq.heappush(queue, (next_cost, edge.to_chain))
+        return costs, arrived_by
+
+    def _table(self, source: str, tier: float) -> Tuple[Dict[str, float], Dict[str, BridgeEdge]]:
+        tables = self._tables.setdefault(tier, {})
+        if source not in tables:
+            tables[source] = self._shortest_paths(source, tier)
+        return tables[source]
+
+    def precompute(self, tiers: Iterable[Optional[float]] = (None,)):
+        """Fill the shortest-path tables for every source chain ahead of requests"""
+        for amount_usd in tiers:
+            tier = liquidity_tier(amount_usd)
+            for chain in self.chains:
+                self._table(chain, tier)
+
+    def best_route(self, source_chain: str, token: str, amount_usd: Optional[float] = None) -> RoutePlan:
+        """Cheapest target chain and hops for token; amount_usd, when known, rules out shallow pools and bridges"""
+        if token not in self.venues:
+            raise ValueError(f"No venues known for {token}")
+        if source_chain not in self.edges:
+            raise ValueError(f"Unsupported chain: {source_chain}")
+        tier = liquidity_tier(amount_usd)
+        costs, arrived_by = self._table(source_chain, tier)
+
+        best = None
+        for chain, venue in self.venues[token].items():
+            if venue.liquidity_usd < tier or chain not in costs:
+                continue
+            score = costs[chain] + venue.fee_usd + venue.seconds / 60 * TIME_COST_USD_PER_MINUTE
+            if best is None or score < best[0]:
+                best = (score, chain, venue)
+        if best is None:
+            raise ValueError(f"No route for {token} from {source_chain}")
+
+        score, target_chain, venue = best
+        hops = []
+        chain = target_chain
+        while chain != source_chain:
+            edge = arrived_by[chain]
+            hops.append(edge)
+            chain = edge.from_chain
+        hops.reverse()
+        return RoutePlan(
+            token=token,
+            source_chain=source_chain,
+            target_chain=target_chain,
+            hops=hops,
+            cost_usd=sum(edge.fee_usd for edge in hops) + venue.fee_usd,
+            seconds=sum(edge.seconds for edge in hops) + venue.seconds,
+            score=score
+        )
+
+    def best_routes(self, source_chain: str, tokens: Iterable[str],
+                    amount_usd: Optional[float] = None) -> Dict[str, RoutePlan]:
+        return {token: self.best_route(source_chain, token, amount_usd) for token in tokens}
+
+    def invalidate(self):
+        """Drop the shortest-path tables; they are rebuilt on the next lookup"""
+        self._tables.clear()
+        for edge in itertools.chain.from_iterable(self.edges.values()):
+            edge.planned_weight = edge.weight()
+
+    def observe(self, provider: str, from_chain: str, to_chain: str,
+                fee_usd: Optional[float] = None, seconds: Optional[float] = None):
+        """Fold a quoted route's fee and time into the matching edge.
+        seconds is the provider's own estimate; the source chain's finality wait is added
+        as for the default edges. Tables are dropped only once the edge's weight has moved
+        by more than REPLAN_THRESHOLD"""
+        for edge in self.edges.get(from_chain, []):
+            if edge.provider == provider and edge.to_chain == to_chain:
+                if fee_usd is not None:
+                    edge.fee_usd = OBSERVATION_ALPHA * fee_usd + (1 - OBSERVATION_ALPHA) * edge.fee_usd
+                if seconds is not None:
+                    seconds += FINALITY_SECONDS.get(from_chain, DEFAULT_FINALITY_SECONDS)
+                    edge.seconds = OBSERVATION_ALPHA * seconds + (1 - OBSERVATION_ALPHA) * edge.seconds
+                if abs(edge.weight() - edge.planned_weight) > REPLAN_THRESHOLD * edge.planned_weight:
+                    self.invalidate()
+                return
@@ -0,0 +1,151 @@
+"""
+RPC batcher for Burn Relief Bot - Micro-batched JSON-RPC reads
+Calls issued within a short window are sent together as one JSON-RPC batch and
+the results are handed back to each waiting caller, so reading a token's
+decimals, symbol, name and balance costs one round-trip instead of four
+"""
+
+import asyncio
+import itertools
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from eth_abi import decode, encode
+from web3 import Web3
+
+logger = logging.getLogger(__name__)
+
+DECIMALS_SELECTOR = bytes.fromhex("313ce567")
+SYMBOL_SELECTOR = bytes.fromhex("95d89b41")
+NAME_SELECTOR = bytes.fromhex("06fdde03")
+BALANCE_OF_SELECTOR = bytes.fromhex("70a08231")
+
+
+class RpcCallError(Exception):
+    """A call in a batch came back with a JSON-RPC error"""
+
+    def __init__(self, error: Dict[str, Any]):
+        super().__init__(error.get("message", str(error)))
+        self.code = error.get("code")
+
+
+class JsonRpcBatcher:
+    """Collects JSON-RPC calls for window seconds and sends them as one batch.
+
+    provider must have an async post(payload) that sends a JSON-RPC request
+    or batch and returns the decoded response (see rpc_pool).
+    """
+
+    def __init__(self, provider, window: float = 0.002, max_batch: int = 50):
+        self.provider = provider
+        self.window = window
+        self.max_batch = max_batch
+        self.batches_sent = 0
+        self.calls_sent = 0
+
+        self._ids = itertools.count()
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._in_flight: Set[asyncio.Task] = set()
+
+    async def request(self, method: str, params: List[Any]) -> Any:
+        """Queue one call and wait for its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(({"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+        return await future
+
+    async def eth_call(self, to: str, data: bytes, block: str = "latest") -> bytes:
+        result = await self.request("eth_call", [{"to": to, "data": Web3.to_hex(data)}, block])
+        return Web3.to_bytes(hexstr=result)
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._send(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _send(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        self.batches_sent += 1
+        self.calls_sent += len(batch)
+        try:
+            if len(batch) == 1:
+                responses = [await self.provider.post(batch[0][0])]
+            else:
+                responses = await self.provider.post([call for call, _ in batch])
+            if isinstance(responses, dict):
+                # Whole batch rejected, e.g. by a node that does not accept batches
+                raise RpcCallError(responses.get("error") or {"message": f"Unexpected batch response: {responses}"})
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        by_id = {response.get("id"): response for response in responses}
+        for call, future in batch:
+            if future.done():
+                continue
+            response = by_id.get(call["id"])
+            if response is None:
+                future.set_exception(RpcCallError({"message": f"No response for {call['method']} in batch"}))
+            elif "error" in response:
+                future.set_exception(RpcCallError(response["error"]))
+            else:
+                future.set_result(response["result"])
+
+
+def decode_string(data: bytes) -> str:
+    """ABI string, or the bytes32 some older tokens return for name / symbol"""
+    try:
+        return decode(["string"], data)[0]
+    except Exception:
+        return data[:32].rstrip(b"\x00").decode("utf-8", errors="replace")
+
+
+async def read_token_metadata(batcher: JsonRpcBatcher, token_address: str,
+                              holder: Optional[str] = None) -> Dict[str, Any]:
+    """decimals, symbol, name (and holder's balance) of an ERC-20 token in one batch.
+    A symbol or name whose call failed is None and listed under failed_fields"""
+    token = Web3.to_checksum_address(token_address)
+    calls = [
+        batcher.eth_call(token, DECIMALS_SELECTOR),
+        batcher.eth_call(token, SYMBOL_SELECTOR),
+        batcher.eth_call(token, NAME_SELECTOR)
+    ]
+    if holder:
+        calls.append(batcher.eth_call(token, BALANCE_OF_SELECTOR + encode(["address"], [Web3.to_checksum_address(holder)])))
+
+    results = await asyncio.gather(*calls, return_exceptions=True)
+    decimals, symbol, name = results[:3]
+    if isinstance(decimals, Exception):
+        raise decimals
+
+    metadata = {
+        "decimals": decode(["uint256"], decimals)[0],
+        "symbol": None if isinstance(symbol, Exception) else decode_string(symbol),
+        "name": None if isinstance(name, Exception) else decode_string(name)
+    }
+    failed = [field for field, result in (("symbol", symbol), ("name", name)) if isinstance(result, Exception)]
+    if failed:
+        metadata["failed_fields"] = failed
+    if holder:
+        balance = results[3]
+        if isinstance(balance, Exception):
+            raise balance
+        metadata["balance"] = decode(["uint256"], balance)[0]
+    return metadata
+
+
+async def read_token_balance(batcher: JsonRpcBatcher, token_address: str, holder: str) -> int:
+    """holder's balance of an ERC-20 token"""
+    data = BALANCE_OF_SELECTOR + encode(["address"], [Web3.to_checksum_address(holder)])
+    return decode(["uint256"], await batcher.eth_call(Web3.to_checksum_address(token_address), data))[0]
@@ -0,0 +1,213 @@
+"""
+RPC pool for Burn Relief Bot - Async web3 providers with keep-alive and failover
+Each chain has several RPC URLs behind one AsyncWeb3. Calls go to the endpoint
+with the lowest recent latency over a shared keep-alive session; endpoints that
+keep failing are ejected for a while and retried once their ejection expires
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import aiohttp
+from web3 import AsyncWeb3
+from web3.providers.async_base import AsyncJSONBaseProvider
+
+from rpc_batcher import JsonRpcBatcher
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest sample in the latency moving average
+LATENCY_ALPHA = 0.3
+# Share of calls sent to a random healthy endpoint so stale latencies get refreshed
+EXPLORE_RATE = 0.05
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+# Methods whose request may take effect even when the response is lost; they only
+# move to another endpoint when the first one provably never received them
+NON_IDEMPOTENT_METHODS = {"eth_sendRawTransaction", "eth_sendTransaction"}
+# Statuses returned before a request is processed
+REJECTED_STATUSES = {429}
+
+
+class RpcUnavailableError(ConnectionError):
+    """Every endpoint for a chain failed the request"""
+
+
+class RpcSendUncertainError(RpcUnavailableError):
+    """An endpoint failed after receiving a transaction, which may or may not have been accepted;
+    it is not sent to another endpoint, so callers must check the chain before sending again"""
+
+
+def is_idempotent(payload: Any) -> bool:
+    calls = payload if isinstance(payload, list) else [payload]
+    return not any(call.get("method") in NON_IDEMPOTENT_METHODS for call in calls)
+
+
+class RpcEndpoint:
+    """One RPC URL with its latency and error history"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.latency: Optional[float] = None
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.last_error: Optional[str] = None
+
+    def is_ejected(self, now: float) -> bool:
+        return self.ejected_until > now
+
+    def record_success(self, elapsed: float):
+        self.requests += 1
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.latency = elapsed if self.latency is None else (
+            LATENCY_ALPHA * elapsed + (1 - LATENCY_ALPHA) * self.latency
+        )
+
+    def record_failure(self, error: str, eject_after: int, eject_seconds: float):
+        self.requests += 1
+        self.errors += 1
+        self.consecutive_failures += 1
+        self.last_error = error
+        if self.consecutive_failures >= eject_after:
+            self.ejected_until = time.monotonic() + eject_seconds
+            logger.warning(f"Ejecting RPC endpoint {self.url} for {eject_seconds:.0f}s: {error}")
+
+    def metrics(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "url": self.url,
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.requests, 4) if self.requests else 0.0,
+            "consecutive_failures": self.consecutive_failures,
+            "ejected": self.is_ejected(now),
+            "ejected_for_seconds": round(self.ejected_until - now, 1) if self.is_ejected(now) else 0,
+            "last_error": self.last_error
+        }
+
+
+class PooledAsyncHTTPProvider(AsyncJSONBaseProvider):
+    """web3 provider that spreads JSON-RPC calls over a chain's endpoints"""
+
+    def __init__(self, pool: "RpcPool", chain: str, urls: Iterable[str]):
+        super().__init__()
+        self.pool = pool
+        self.chain = chain
+        self.endpoints = [RpcEndpoint(url) for url in urls]
+        if not self.endpoints:
+            raise ValueError(f"No RPC URLs configured for {chain}")
+
+    def ranked_endpoints(self) -> List[RpcEndpoint]:
+        """Healthy endpoints fastest first (unmeasured ones are tried first), then ejected ones"""
+        now = time.monotonic()
+        healthy = [endpoint for endpoint in self.endpoints if not endpoint.is_ejected(now)]
+        ejected = sorted(
+            (endpoint for endpoint in self.endpoints if endpoint.is_ejected(now)),
+            key=lambda endpoint: endpoint.ejected_until
+        )
+        healthy.sort(key=lambda endpoint: -1.0 if endpoint.latency is None else endpoint.latency)
+        if len(healthy) > 1 and random.random() < EXPLORE_RATE:
+            healthy.insert(0, healthy.pop(random.randrange(1, len(healthy))))
+        return healthy + ejected
+
+    async def post(self, payload: Any) -> Any:
+        """POST a JSON-RPC request (or batch) to the best endpoint, failing over on transport errors.
+        Transactions only fail over when the endpoint could not be reached or turned them away unread"""
+        session = await self.pool.get_session()
+        body = json.dumps(payload)
+        idempotent = is_idempotent(payload)
+        errors = []
+        for endpoint in self.ranked_endpoints():
+            started = time.monotonic()
+            try:
+                async with session.post(endpoint.url, data=body, headers={"Content-Type": "application/json"}) as response:
+                    if response.status in RETRYABLE_STATUSES:
+                        raise aiohttp.ClientResponseError(
+                            response.request_info, response.history, status=response.status, message=response.reason or ""
+                        )
+                    response.raise_for_status()
+                    result = await response.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                error = str(e) or e.__class__.__name__
+                endpoint.record_failure(error, self.pool.eject_after, self.pool.eject_seconds)
+                errors.append(f"{endpoint.url}: {error}")
+                never_received = isinstance(e, aiohttp.ClientConnectorError) or (
+                    isinstance(e, aiohttp.ClientResponseError) and e.status in REJECTED_STATUSES
+                )
+                if not idempotent and not never_received:
+                    raise RpcSendUncertainError(
+                        f"{self.chain} RPC endpoint failed after receiving a transaction: {'; '.join(errors)}"
+                    ) from e
+                continue
+            endpoint.record_success(time.monotonic() - started)
+            return result
+        raise RpcUnavailableError(f"All {self.chain} RPC endpoints failed: {'; '.join(errors)}")
+
+    async def make_request(self, method, params) -> Dict[str, Any]:
+        request_id = next(self.request_counter)
+        return await self.post({"jsonrpc": "2.0", "method": method, "params": params or [], "id": request_id})
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        return [endpoint.metrics() for endpoint in self.endpoints]
+
+
+class RpcPool:
+    """Per-chain AsyncWeb3 clients sharing one keep-alive HTTP session"""
+
+    def __init__(self, chain_urls: Dict[str, Iterable[str]], timeout: float = 10.0,
+                 eject_after: int = 3, eject_seconds: float = 30.0, max_connections: int = 100):
+        self.timeout = timeout
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self.max_connections = max_connections
+        self.providers = {
+            chain: PooledAsyncHTTPProvider(self, chain, urls) for chain, urls in chain_urls.items()
+        }
+        self.clients = {chain: AsyncWeb3(provider) for chain, provider in self.providers.items()}
+        self.batchers = {chain: JsonRpcBatcher(provider) for chain, provider in self.providers.items()}
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=60, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    def web3(self, chain: str) -> AsyncWeb3:
+        if chain not in self.clients:
+            raise ValueError(f"Unsupported chain: {chain}")
+        return self.clients[chain]
+
+    def provider(self, chain: str) -> PooledAsyncHTTPProvider:
+        if chain not in self.providers:
+            raise ValueError(f"Unsupported chain: {chain}")
+        return self.providers[chain]
+
+    def batcher(self, chain: str) -> JsonRpcBatcher:
+        """Micro-batching client for read calls such as eth_call"""
+        if chain not in self.batchers:
+            raise ValueError(f"Unsupported chain: {chain}")
+        return self.batchers[chain]
+
+    def metrics(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Latency and error metrics for every endpoint, per chain"""
+        return {chain: provider.metrics() for chain, provider in self.providers.items()}
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+
+def parse_rpc_urls(value: Optional[str], defaults: Iterable[str]) -> List[str]:
+    """Comma-separated URLs from an environment value, falling back to defaults"""
+    urls = [url.strip() for url in (value or "").split(",") if url.strip()]
+    return urls or [url for url in defaults if url]
@@ -1,6 +1,7 @@
 import os
 import sys
 import time
+import math
 import asyncio
 import logging
 import uuid
@@ -12,7 +13,7 @@ import bleach
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-from fastapi import FastAPI, HTTPException, APIRouter, Depends, BackgroundTasks, Header, Request
+from fastapi import FastAPI, HTTPException, APIRouter, Depends, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from motor.motor_asyncio import AsyncIOMotorClient
@@ -26,6 +27,25 @@ import requests
 from eth_account import Account
 import asyncio
 
+from token_registry import TokenRegistry
+from allocation_engine import Allocation, AllocationRule, format_units, to_base_units
+from allocation_batch import BatchAllocator
+from burn_stats import BurnStats
+from leaderboard import Leaderboard
+from burn_rollups import BurnRollups, parse_window
+from db_indexes import ensure_indexes, explain_report
+from pagination import clamp_page_size, fetch_page
+from vote_queries import fetch_user_votes
+from job_queue import JobQueue
+from rpc_pool import RpcPool, parse_rpc_urls
+from rpc_batcher import read_token_balance, read_token_metadata
+from token_metadata import TokenMetadataCache
+from price_service import PriceService
+from quote_cache import swap_quote_cache
+from redistribution_sender import (
+    DEFAULT_DISPERSE_ADDRESS, BatchedDistributionSender, NonceManager, RedistributionSender
+)
+
 load_dotenv()
 
 # Security Configuration
@@ -135,11 +155,56 @@ CONTEST_COMMUNITY_PERCENTAGE = 12.0  # 12% to community pool for contest tokens
 COMMUNITY_PROJECT_DRB_PERCENTAGE = 0.5  # 0.5% DRB for winning project
 COMMUNITY_PROJECT_BNKR_PERCENTAGE = 0.5  # 0.5% BNKR for winning project
 
+# Basis-point allocation rules derived from the percentages above
+ALLOCATION_RULES = {
+    "contest": AllocationRule.from_percentages(
+        "contest",
+        burn=CONTEST_BURN_PERCENTAGE,
+        community_pool=CONTEST_COMMUNITY_PERCENTAGE
+    ),
+    "drb_direct_allocation": AllocationRule.from_percentages(
+        "drb_direct_allocation",
+        drb_grok=BURN_PERCENTAGE + DRB_GROK_PERCENTAGE,
+        drb_community=DRB_COMMUNITY_PERCENTAGE,
+        drb_team=DRB_TEAM_PERCENTAGE,
+        drb_project=COMMUNITY_PROJECT_DRB_PERCENTAGE,
+        bnkr_community=BNKR_COMMUNITY_PERCENTAGE,
+        bnkr_team=BNKR_TEAM_PERCENTAGE,
+        bnkr_project=COMMUNITY_PROJECT_BNKR_PERCENTAGE
+    ),
+    "swap_only": AllocationRule.from_percentages(
+        "swap_only",
+        drb_grok=BURN_PERCENTAGE + DRB_GROK_PERCENTAGE,
+        drb_community=DRB_COMMUNITY_PERCENTAGE,
+        drb_team=DRB_TEAM_PERCENTAGE,
+        drb_project=COMMUNITY_PROJECT_DRB_PERCENTAGE,
+        bnkr_community=BNKR_COMMUNITY_PERCENTAGE,
+        bnkr_team=BNKR_TEAM_PERCENTAGE,
+        bnkr_project=COMMUNITY_PROJECT_BNKR_PERCENTAGE
+    ),
+    "burn_and_swap": AllocationRule.from_percentages(
+        "burn_and_swap",
+        burn=BURN_PERCENTAGE,
+        drb_grok=DRB_GROK_PERCENTAGE,
+        drb_community=DRB_COMMUNITY_PERCENTAGE,
+        drb_team=DRB_TEAM_PERCENTAGE,
+        drb_project=COMMUNITY_PROJECT_DRB_PERCENTAGE,
+        bnkr_community=BNKR_COMMUNITY_PERCENTAGE,
+        bnkr_team=BNKR_TEAM_PERCENTAGE,
+        bnkr_project=COMMUNITY_PROJECT_BNKR_PERCENTAGE
+    )
+}
+
+# Vectorized allocator for admin batch previews and reconciliation
+batch_allocator = BatchAllocator(ALLOCATION_RULES)
+MAX_BATCH_ALLOCATION_ROWS = 100000
+
 # Voting Requirements (configurable)
 VOTE_REQUIREMENT_DRB = 1000.0    # 1000 $DRB to vote
 VOTE_REQUIREMENT_BNKR = 100.0    # 100 $BNKR to vote
 
 # Known token lists (updated with multi-chain support)
+# Built-in defaults, seeded into the token_registry collection on first start
 BURNABLE_TOKENS = [
     # Base/Ethereum DRB and BNKR tokens (burnable)
     "drb", "$drb", "drb token",  # DRB variations
@@ -207,23 +272,7 @@ def is_token_burnable(token_identifier: str, chain: str = "base") -> bool:
     Check if a token is burnable based on its identifier
     NEW TOKENS DEFAULT TO NON-BURNABLE
     """
-    if not token_identifier:
-        return False
-    
-    token_lower = str(token_identifier).lower().strip()
-    
-    # Check if explicitly marked as burnable
-    for burnable_token in BURNABLE_TOKENS:
-        if burnable_token.lower() in token_lower or token_lower in burnable_token.lower():
-            return True
-    
-    # Check if explicitly marked as non-burnable
-    for non_burnable_token in NON_BURNABLE_TOKENS:
-        if non_burnable_token.lower() in token_lower or token_lower in non_burnable_token.lower():
-            return False
-    
-    # DEFAULT: NEW TOKENS ARE NON-BURNABLE
-    return False
+    return token_registry.classifier.is_burnable(token_identifier)
 
 # Supported token types
 SUPPORTED_TOKEN_TYPES = [
@@ -266,6 +315,10 @@ class TokenValidationRequest(BaseModel):
     token_address: str
     chain: str
 
+class TokenPricesRequest(BaseModel):
+    token_addresses: List[str]
+    chain: str = "base"
+
 class TokenValidationResponse(BaseModel):
     is_valid: bool
     symbol: Optional[str] = None
@@ -370,6 +423,17 @@ PRIVY_VERIFICATION_KEY = os.getenv("PRIVY_VERIFICATION_KEY")
 ADMIN_TWITTER_HANDLE = "davincc"  # Your admin Twitter handle
 BURNRELIEFBOT_PRIVATE_KEY = os.getenv("BURNRELIEFBOT_PRIVATE_KEY")
 BASE_RPC_URL = os.getenv("BASE_RPC_URL", "https://mainnet.base.org")
+# Failover endpoints, fastest healthy one first
+BASE_RPC_URLS = parse_rpc_urls(os.getenv("BASE_RPC_URLS"), [BASE_RPC_URL, "https://base-rpc.publicnode.com"])
+# Redistributions are simulated unless explicitly switched to on-chain transfers
+LIVE_REDISTRIBUTION = os.getenv("LIVE_REDISTRIBUTION", "false").lower() == "true"
+# Send all legs of a live redistribution as one disperseToken call
+BATCHED_DISTRIBUTION = os.getenv("BATCHED_DISTRIBUTION", "false").lower() == "true"
+DISPERSE_CONTRACT_ADDRESS = os.getenv("DISPERSE_CONTRACT_ADDRESS", DEFAULT_DISPERSE_ADDRESS)
+# Approve the disperse contract once for the maximum amount instead of before each batch
+DISPERSE_APPROVE_UNLIMITED = os.getenv("DISPERSE_APPROVE_UNLIMITED", "false").lower() == "true"
+# Validate tokens and report their symbol / name / decimals from the chain
+ONCHAIN_TOKEN_METADATA = os.getenv("ONCHAIN_TOKEN_METADATA", "false").lower() == "true"
 
 # ERC-20 Token ABI (Standard Interface)
 ERC20_ABI = [
@@ -406,12 +470,16 @@ ERC20_ABI = [
     }
 ]
 
+# Shared async RPC clients with keep-alive connections and endpoint failover
+rpc_pool = RpcPool({"base": BASE_RPC_URLS}, timeout=float(os.getenv("RPC_TIMEOUT_SECONDS", "10")))
+
 # Wallet and Web3 Setup
 class BurnReliefBotWallet:
     def __init__(self):
-        self.web3 = Web3(Web3.HTTPProvider(BASE_RPC_URL))
+        self.web3 = rpc_pool.web3("base")
         self.private_key = BURNRELIEFBOT_PRIVATE_KEY
         self.account = None
+        self.sender = None
         self.setup_account()
     
     def setup_account(self):
@@ -423,6 +491,22 @@ class BurnReliefBotWallet:
             if self.private_key and self.private_key != "your_private_key_here":
                 self.account = Account.from_key(self.private_key)
                 logger.info(f"BurnReliefBot wallet initialized with real private key: {self.account.address}")
+                if LIVE_REDISTRIBUTION:
+                    # One nonce manager per wallet, shared by concurrent redistributions
+                    nonce_manager = NonceManager(self.web3)
+                    chain_id = SUPPORTED_CHAINS["base"]["chain_id"]
+                    if BATCHED_DISTRIBUTION:
+                        self.sender = BatchedDistributionSender(
+                            self.web3,
+                            self.account,
+                            nonce_manager,
+                            chain_id=chain_id,
+                            disperse_address=DISPERSE_CONTRACT_ADDRESS,
+                            approve_unlimited=DISPERSE_APPROVE_UNLIMITED
+                        )
+                    else:
+                        self.sender = RedistributionSender(self.web3, self.account, nonce_manager, chain_id=chain_id)
+                    logger.info(f"Live on-chain redistribution enabled ({'batched' if BATCHED_DISTRIBUTION else 'per transfer'})")
             else:
                 # For testing, create a mock account with the specified address
                 # This is only for testing and won't be able to sign real transactions
@@ -436,16 +520,22 @@ class BurnReliefBotWallet:
             logger.error(f"Failed to initialize wallet: {e}")
             self.account = None
     
-    def is_connected(self) -> bool:
+    async def is_connected(self) -> bool:
         """Check if wallet is connected"""
-        return self.account is not None and self.web3.is_connected()
+        return self.account is not None and await self.web3.is_connected()
     
     async def get_token_info(self, token_address: str) -> Dict[str, Any]:
         """Get token information (decimals, symbol, balance)"""
         try:
-            if not self.web3.is_address(token_address):
+            if not Web3.is_address(token_address):
                 raise ValueError(f"Invalid token address: {token_address}")
             
+            if self.sender is not None:
+                # Cached metadata; on a miss decimals, symbol, name and balance are read in one batch
+                info = await token_metadata.get_token_info("base", token_address, self.account.address)
+                info["balance_formatted"] = float(format_units(info["balance"], info["decimals"]))
+                return info
+            
             # For testing purposes, we'll simulate token info
             # In production, this would query the actual token contract
             
@@ -498,9 +588,9 @@ class BurnReliefBotWallet:
             # Fallback gas price (5 gwei)
             return 5000000000
     
-    async def send_token_redistribution(self, token_address: str, distributions: Dict[str, float]) -> Dict[str, str]:
-        """Execute REAL token redistribution transactions"""
-        if not self.is_connected():
+    async def send_token_redistribution(self, token_address: str, distributions: Dict[str, int]) -> Dict[str, str]:
+        """Execute REAL token redistribution transactions (amounts in token base units)"""
+        if not await self.is_connected():
             raise HTTPException(status_code=500, detail="Wallet not connected")
         
         try:
@@ -513,42 +603,43 @@ class BurnReliefBotWallet:
             token_info = await self.get_token_info(token_address)
             decimals = token_info["decimals"]
             symbol = token_info["symbol"]
-            current_balance = token_info["balance_formatted"]
+            current_balance = token_info["balance"]
             
             logger.info(f"Starting redistribution for {symbol} (decimals: {decimals})")
-            logger.info(f"Current wallet balance: {current_balance} {symbol}")
+            logger.info(f"Current wallet balance: {format_units(current_balance, decimals)} {symbol}")
             
             # Check if we have enough balance
             total_to_distribute = sum(distributions.values())
             if current_balance < total_to_distribute:
                 raise HTTPException(
                     status_code=400, 
-                    detail=f"Insufficient balance. Have: {current_balance}, Need: {total_to_distribute}"
+                    detail=f"Insufficient balance. Have: {format_units(current_balance, decimals)}, Need: {format_units(total_to_distribute, decimals)}"
                 )
             
-            # Simulate gas price
             gas_price = await self.estimate_gas_price()
             
+            if self.sender is not None:
+                # All legs in one disperse call, or signed with consecutive nonces and broadcast together
+                results = await self.sender.send(token_address, distributions, gas_price)
+                token_metadata.invalidate_balance("base", token_address, self.account.address)
+                for recipient_address, amount in distributions.items():
+                    if amount > 0 and not results[recipient_address].startswith("ERROR"):
+                        logger.info(f"✅ Confirmed: {format_units(amount, decimals)} {symbol} to {recipient_address}")
+                return results
+            
             # Simulate transactions
             for recipient_address, amount in distributions.items():
                 if amount > 0:
-                    try:
-                        # Generate a random transaction hash
-                        tx_hash_hex = f"0x{''.join([hex(ord(c))[2:] for c in str(uuid.uuid4())])}"
-                        
-                        logger.info(f"Transaction sent: {amount} {symbol} to {recipient_address}")
-                        logger.info(f"Transaction hash: {tx_hash_hex}")
-                        
-                        # Simulate successful transaction
-                        results[recipient_address] = tx_hash_hex
-                        logger.info(f"✅ Confirmed: {amount} {symbol} to {recipient_address}")
-                        
-                        # Small delay to simulate transaction time
-                        await asyncio.sleep(0.5)
-                        
-                    except Exception as e:
-                        logger.error(f"Failed to send to {recipient_address}: {e}")
-                        results[recipient_address] = f"ERROR: {str(e)}"
+                    # Generate a random transaction hash
+                    tx_hash_hex = f"0x{''.join([hex(ord(c))[2:] for c in str(uuid.uuid4())])}"
+                    
+                    logger.info(f"Transaction sent: {format_units(amount, decimals)} {symbol} to {recipient_address}")
+                    logger.info(f"Transaction hash: {tx_hash_hex}")
+                    results[recipient_address] = tx_hash_hex
+            
+            # Simulated transfers confirm together, as concurrent broadcasts would
+            await asyncio.sleep(0.5)
+            logger.info(f"✅ Confirmed {len(results)} transfers of {symbol}")
             
             return results
             
@@ -559,23 +650,30 @@ class BurnReliefBotWallet:
     async def execute_burn_and_redistribute(self, total_amount: float, token_address: str, is_burnable: bool = True):
         """Main function to execute burn and redistribution"""
         try:
-            # Calculate distributions
-            allocations = calculate_burn_amounts(total_amount, token_address, is_burnable)
+            # Calculate distributions in token base units
+            token_info = await self.get_token_info(token_address)
+            allocation = allocate_burn(
+                to_base_units(total_amount, token_info["decimals"]),
+                token_address,
+                is_burnable=is_burnable,
+                decimals=token_info["decimals"]
+            )
+            allocations = allocation_to_dict(allocation, is_burnable)
             
             # Prepare distribution dictionary
             distributions = {}
             
-            if is_burnable and float(allocations["burn_amount"]) > 0:
-                distributions[BURN_ADDRESS] = float(allocations["burn_amount"])
+            if is_burnable and allocation.burn > 0:
+                distributions[BURN_ADDRESS] = allocation.burn
             
-            if float(allocations["drb_grok_amount"]) > 0:
-                distributions[GROK_WALLET] = float(allocations["drb_grok_amount"])
+            if allocation.drb_grok > 0:
+                distributions[GROK_WALLET] = allocation.drb_grok
             
-            if float(allocations["drb_community_amount"]) > 0:
-                distributions[COMMUNITY_WALLET] = float(allocations["drb_community_amount"])
+            if allocation.drb_community > 0:
+                distributions[COMMUNITY_WALLET] = allocation.drb_community
             
-            if float(allocations["drb_team_amount"]) > 0:
-                distributions[TEAM_WALLET] = float(allocations["drb_team_amount"])
+            if allocation.drb_team > 0:
+                distributions[TEAM_WALLET] = allocation.drb_team
             
             logger.info(f"Executing redistribution: {distributions}")
             
@@ -595,6 +693,7 @@ class BurnReliefBotWallet:
             }
             
             await burns_collection.insert_one(transaction_record)
+            await on_burn_completed(transaction_record, newly_created=True)
             
             return {
                 "status": "success",
@@ -627,6 +726,58 @@ projects_collection = db.projects
 votes_collection = db.votes
 voting_periods_collection = db.voting_periods
 
+# Materialized burn counters kept in stats_collection
+burn_stats = BurnStats(stats_collection, burns_collection)
+
+# Per-wallet burn totals kept in leaderboard_collection
+leaderboard = Leaderboard(leaderboard_collection, stats_collection, burns_collection)
+
+# Hourly / daily burn totals per wallet, token and chain
+burn_rollups_collection = db.burn_rollups
+burn_rollups = BurnRollups(burn_rollups_collection, burns_collection)
+
+# Durable burn processing jobs, shared by every API and worker process
+burn_jobs_collection = db.burn_jobs
+
+# Token Registry Collections
+token_registry_collection = db.token_registry
+registry_meta_collection = db.registry_meta
+
+# Burnable / non-burnable lists, served from an in-memory snapshot
+token_registry = TokenRegistry(
+    token_registry_collection,
+    registry_meta_collection,
+    BURNABLE_TOKENS,
+    NON_BURNABLE_TOKENS,
+    poll_interval=float(os.getenv("TOKEN_REGISTRY_POLL_SECONDS", "5"))
+)
+
+# ERC-20 decimals / symbol / name cached for good, balances for a few seconds
+token_metadata_collection = db.token_metadata
+
+async def fetch_token_metadata(chain: str, token_address: str, holder: Optional[str] = None) -> Dict[str, Any]:
+    return await read_token_metadata(rpc_pool.batcher(chain), token_address, holder)
+
+async def fetch_token_balance(chain: str, token_address: str, holder: str) -> int:
+    return await read_token_balance(rpc_pool.batcher(chain), token_address, holder)
+
+token_metadata = TokenMetadataCache(
+    token_metadata_collection,
+    fetch_token_metadata,
+    fetch_token_balance,
+    balance_ttl=float(os.getenv("TOKEN_BALANCE_TTL_SECONDS", "15"))
+)
+
+# USD prices from CoinGecko, cached per token and refreshed in the background once stale
+price_service = PriceService(
+    api_key=os.getenv("COINGECKO_API_KEY"),
+    ttl=float(os.getenv("TOKEN_PRICE_TTL_SECONDS", "60")),
+    stale_ttl=float(os.getenv("TOKEN_PRICE_STALE_SECONDS", "600"))
+)
+# Used when CoinGecko has no quote for a token
+FALLBACK_TOKEN_PRICE = 0.001
+MAX_TOKEN_PRICES_PER_REQUEST = int(os.getenv("MAX_TOKEN_PRICES_PER_REQUEST", "250"))
+
 # Admin authentication
 # Input sanitization utilities
 def sanitize_input(text: str, max_length: int = 1000) -> str:
@@ -700,19 +851,23 @@ active_connections: List[Dict[str, Any]] = []
 async def get_token_price(token_address: str, chain: str = "base") -> float:
     """Get token price from DEX APIs or price feeds"""
     try:
-        # Simplified price fetching for Base chain
-        return 0.001  # Placeholder price
+        price = await price_service.get_price(token_address, chain)
+        return price if price is not None else FALLBACK_TOKEN_PRICE
     except Exception as e:
+        # A burn recorded at $0 would skew stats, the leaderboard and rollups
         logger.error(f"Failed to get token price: {e}")
-        return 0.0
+        price = price_service.cached_price(token_address, chain)
+        return price if price is not None else FALLBACK_TOKEN_PRICE
 
 async def validate_token_contract(token_address: str, chain: str = "base") -> bool:
     """Validate if token contract exists and is valid"""
     try:
-        # For testing purposes, accept any valid-looking address
-        if len(token_address) == 42 and token_address.startswith('0x'):
-            return True
-        return False
+        if not (len(token_address) == 42 and token_address.startswith('0x')):
+            return False
+        if ONCHAIN_TOKEN_METADATA and chain in rpc_pool.batchers:
+            # A contract that answers decimals() is treated as a token
+            await token_metadata.get_metadata(chain, token_address)
+        return True
     except Exception as e:
         logger.error(f"Token validation failed: {e}")
         return False
@@ -736,84 +891,66 @@ async def is_drb_token(token_address: str, token_name: str = "", token_symbol: s
     
     return False
 
-def calculate_burn_amounts(total_amount: float, token_address: str = "", is_burnable: bool = True, is_drb: bool = False, winning_project_wallet: str = None, is_contest: bool = False) -> Dict[str, str]:
-    """Calculate distribution amounts for burn transaction"""
-    total = float(total_amount)
-    
-    # Contest allocation: 88% burn + 12% community pool
+def select_allocation_type(token_address: str = "", is_burnable: bool = True, is_drb: bool = False, is_contest: bool = False) -> str:
+    """Pick the allocation rule for a burn"""
     if is_contest:
-        burn_amount = total * (CONTEST_BURN_PERCENTAGE / 100)  # 88%
-        community_amount = total * (CONTEST_COMMUNITY_PERCENTAGE / 100)  # 12%
-        
+        return "contest"
+    if is_drb:
+        return "drb_direct_allocation"
+    if not is_burnable or token_registry.classifier.is_listed_non_burnable(token_address):
+        return "swap_only"
+    return "burn_and_swap"
+
+def allocate_burn(total_units: int, token_address: str = "", is_burnable: bool = True, is_drb: bool = False, is_contest: bool = False, decimals: int = 18) -> Allocation:
+    """Split an amount in token base units with exact integer arithmetic"""
+    allocation_type = select_allocation_type(token_address, is_burnable, is_drb, is_contest)
+    return ALLOCATION_RULES[allocation_type].allocate(total_units, decimals)
+
+def allocation_to_dict(allocation: Allocation, is_burnable: bool = True, is_drb: bool = False, winning_project_wallet: str = None) -> Dict[str, Any]:
+    """Render an allocation in the string format used by the API and burn records"""
+    # Contest allocation: 88% burn + 12% community pool
+    if allocation.allocation_type == "contest":
         return {
-            "burn_amount": f"{burn_amount:.6f}",
-            "community_amount": f"{community_amount:.6f}",
+            "burn_amount": allocation.format("burn"),
+            "community_amount": allocation.format("community_pool"),
             "drb_grok_amount": "0.0",
             "drb_community_amount": "0.0", 
             "drb_team_amount": "0.0",
             "bnkr_community_amount": "0.0",
             "bnkr_team_amount": "0.0",
-            "total_distributed": f"{total:.6f}",
+            "total_distributed": allocation.format("total"),
             "allocation_type": "contest"
         }
     
-    if is_drb:
-        # Special handling for DRB tokens - direct allocation with minimal swapping
-        burn_amount = 0.0
-        drb_grok_amount = total * ((BURN_PERCENTAGE + DRB_GROK_PERCENTAGE) / 100)  # 95%
-        drb_community_amount = total * (DRB_COMMUNITY_PERCENTAGE / 100)  # 1.5%
-        drb_team_amount = total * (DRB_TEAM_PERCENTAGE / 100)  # 0.5%
-        drb_project_amount = total * (COMMUNITY_PROJECT_DRB_PERCENTAGE / 100)  # 0.5%
-        drb_total_amount = drb_grok_amount + drb_community_amount + drb_team_amount + drb_project_amount
-        bnkr_community_amount = total * (BNKR_COMMUNITY_PERCENTAGE / 100)  # 1.5%
-        bnkr_team_amount = total * (BNKR_TEAM_PERCENTAGE / 100)  # 0.5%
-        bnkr_project_amount = total * (COMMUNITY_PROJECT_BNKR_PERCENTAGE / 100)  # 0.5%
-        bnkr_total_amount = bnkr_community_amount + bnkr_team_amount + bnkr_project_amount
-        allocation_type = "drb_direct_allocation"
-    elif not is_burnable or token_address.lower() in [t.lower() for t in NON_BURNABLE_TOKENS]:
-        # For non-burnable tokens: no burning, all goes to swaps
-        burn_amount = 0.0
-        drb_grok_amount = total * ((BURN_PERCENTAGE + DRB_GROK_PERCENTAGE) / 100)  # 95%
-        drb_community_amount = total * (DRB_COMMUNITY_PERCENTAGE / 100)  # 1.5%
-        drb_team_amount = total * (DRB_TEAM_PERCENTAGE / 100)  # 0.5%
-        drb_project_amount = total * (COMMUNITY_PROJECT_DRB_PERCENTAGE / 100)  # 0.5%
-        drb_total_amount = drb_grok_amount + drb_community_amount + drb_team_amount + drb_project_amount
-        bnkr_community_amount = total * (BNKR_COMMUNITY_PERCENTAGE / 100)  # 1.5%
-        bnkr_team_amount = total * (BNKR_TEAM_PERCENTAGE / 100)  # 0.5%
-        bnkr_project_amount = total * (COMMUNITY_PROJECT_BNKR_PERCENTAGE / 100)  # 0.5%
-        bnkr_total_amount = bnkr_community_amount + bnkr_team_amount + bnkr_project_amount
-        allocation_type = "swap_only"
-    else:
-        # For burnable tokens: standard allocation
-        burn_amount = total * (BURN_PERCENTAGE / 100)  # 88%
-        drb_grok_amount = total * (DRB_GROK_PERCENTAGE / 100)  # 7%
-        drb_community_amount = total * (DRB_COMMUNITY_PERCENTAGE / 100)  # 1.5%
-        drb_team_amount = total * (DRB_TEAM_PERCENTAGE / 100)  # 0.5%
-        drb_project_amount = total * (COMMUNITY_PROJECT_DRB_PERCENTAGE / 100)  # 0.5%
-        drb_total_amount = drb_grok_amount + drb_community_amount + drb_team_amount + drb_project_amount
-        bnkr_community_amount = total * (BNKR_COMMUNITY_PERCENTAGE / 100)  # 1.5%
-        bnkr_team_amount = total * (BNKR_TEAM_PERCENTAGE / 100)  # 0.5%
-        bnkr_project_amount = total * (COMMUNITY_PROJECT_BNKR_PERCENTAGE / 100)  # 0.5%
-        bnkr_total_amount = bnkr_community_amount + bnkr_team_amount + bnkr_project_amount
-        allocation_type = "burn_and_swap"
-    
     return {
-        "burn_amount": str(burn_amount),
-        "drb_total_amount": str(drb_total_amount),
-        "drb_grok_amount": str(drb_grok_amount),
-        "drb_team_amount": str(drb_team_amount),
-        "drb_community_amount": str(drb_community_amount),
-        "drb_project_amount": str(drb_project_amount),
-        "bnkr_total_amount": str(bnkr_total_amount),
-        "bnkr_community_amount": str(bnkr_community_amount),
-        "bnkr_team_amount": str(bnkr_team_amount),
-        "bnkr_project_amount": str(bnkr_project_amount),
+        "burn_amount": allocation.format("burn"),
+        "drb_total_amount": allocation.format("drb_total"),
+        "drb_grok_amount": allocation.format("drb_grok"),
+        "drb_team_amount": allocation.format("drb_team"),
+        "drb_community_amount": allocation.format("drb_community"),
+        "drb_project_amount": allocation.format("drb_project"),
+        "bnkr_total_amount": allocation.format("bnkr_total"),
+        "bnkr_community_amount": allocation.format("bnkr_community"),
+        "bnkr_team_amount": allocation.format("bnkr_team"),
+        "bnkr_project_amount": allocation.format("bnkr_project"),
         "winning_project_wallet": winning_project_wallet or "No active winner",
         "is_burnable": is_burnable,
         "is_drb": is_drb,
-        "allocation_type": allocation_type
+        "allocation_type": allocation.allocation_type
     }
 
+def calculate_burn_amounts(total_amount: float, token_address: str = "", is_burnable: bool = True, is_drb: bool = False, winning_project_wallet: str = None, is_contest: bool = False, decimals: int = 18) -> Dict[str, str]:
+    """Calculate distribution amounts for burn transaction"""
+    allocation = allocate_burn(
+        to_base_units(total_amount, decimals),
+        token_address,
+        is_burnable=is_burnable,
+        is_drb=is_drb,
+        is_contest=is_contest,
+        decimals=decimals
+    )
+    return allocation_to_dict(allocation, is_burnable, is_drb, winning_project_wallet)
+
 # API Endpoints
 @api_router.get("/health")
 async def health_check():
@@ -855,7 +992,15 @@ async def validate_token(request: TokenValidationRequest):
     try:
         is_valid = await validate_token_contract(request.token_address, request.chain)
         
-        if is_valid:
+        if is_valid and ONCHAIN_TOKEN_METADATA and request.chain in rpc_pool.batchers:
+            metadata = await token_metadata.get_metadata(request.chain, request.token_address)
+            return TokenValidationResponse(
+                is_valid=True,
+                symbol=metadata["symbol"],
+                name=metadata["name"],
+                decimals=metadata["decimals"]
+            )
+        elif is_valid:
             # Get additional token info (simplified)
             return TokenValidationResponse(
                 is_valid=True,
@@ -935,7 +1080,7 @@ async def check_if_burnable(request_data: dict):
 
 @api_router.post("/burn")
 @limiter.limit("5/minute")  # Rate limit burn transactions
-async def create_burn_transaction(request: Request, burn_request: BurnRequest, background_tasks: BackgroundTasks):
+async def create_burn_transaction(request: Request, burn_request: BurnRequest):
     """Create a new burn transaction with enhanced security"""
     try:
         # Input validation and sanitization
@@ -952,7 +1097,8 @@ async def create_burn_transaction(request: Request, burn_request: BurnRequest, b
         # Validate amount
         try:
             amount = float(burn_request.amount)
-            if amount <= 0 or amount > 1000000000:  # Reasonable limits
+            # NaN and infinity slip through the range check and cannot be converted to base units
+            if not math.isfinite(amount) or amount <= 0 or amount > 1000000000:  # Reasonable limits
                 raise HTTPException(status_code=400, detail="Invalid burn amount")
         except (ValueError, TypeError):
             raise HTTPException(status_code=400, detail="Invalid amount format")
@@ -987,9 +1133,10 @@ async def create_burn_transaction(request: Request, burn_request: BurnRequest, b
         
         # Store in database
         result = await burns_collection.insert_one(transaction.dict())
+        await burn_stats.record_created()
         
-        # Process burn in background
-        background_tasks.add_task(process_burn_transaction, transaction.id)
+        # Queue for processing by the burn workers
+        await enqueue_burn(transaction.id)
         
         transaction_type = "DRB Direct Allocation" if is_drb else ("Burn" if is_burnable else "Swap")
         
@@ -1003,25 +1150,26 @@ async def create_burn_transaction(request: Request, burn_request: BurnRequest, b
             "message": f"{transaction_type} transaction created successfully"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Burn creation error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to create burn: {str(e)}")
 
 @api_router.get("/transactions/{wallet_address}")
-async def get_wallet_transactions(wallet_address: str):
-    """Get transaction history for a wallet"""
+async def get_wallet_transactions(wallet_address: str, cursor: Optional[str] = None, limit: int = 50, include: Optional[str] = None):
+    """Get transaction history for a wallet, paged with next_cursor"""
     try:
-        transactions = []
-        cursor = burns_collection.find(
-            {"wallet_address": wallet_address}
-        ).sort("timestamp", DESCENDING).limit(50)
-        
-        async for doc in cursor:
-            doc["_id"] = str(doc["_id"])
-            transactions.append(doc)
-        
-        return {"transactions": transactions}
+        return await fetch_page(
+            burns_collection,
+            {"wallet_address": wallet_address},
+            cursor,
+            clamp_page_size(limit, 50),
+            include
+        )
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Transaction fetch error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch transactions: {str(e)}")
@@ -1030,36 +1178,16 @@ async def get_wallet_transactions(wallet_address: str):
 async def get_burn_statistics():
     """Get overall burn statistics"""
     try:
-        total_burns = await burns_collection.count_documents({})
-        completed_burns = await burns_collection.count_documents({"status": "completed"})
-        
-        # Calculate totals (simplified)
-        pipeline = [
-            {"$match": {"status": "completed"}},
-            {"$group": {
-                "_id": None,
-                "total_volume": {"$sum": {"$toDouble": "$amount"}},
-                "total_burned": {"$sum": {"$toDouble": "$burn_amount"}},
-                "total_drb": {"$sum": {"$toDouble": "$drb_total_amount"}},
-                "total_bnkr": {"$sum": {"$toDouble": "$bnkr_total_amount"}}
-            }}
-        ]
-        
-        result = await burns_collection.aggregate(pipeline).to_list(1)
-        stats = result[0] if result else {
-            "total_volume": 0,
-            "total_burned": 0,
-            "total_drb": 0,
-            "total_bnkr": 0
-        }
+        stats = await burn_stats.read()
         
         return {
-            "total_transactions": total_burns,
-            "completed_transactions": completed_burns,
+            "total_transactions": stats["total_transactions"],
+            "completed_transactions": stats["completed_transactions"],
             "total_volume_usd": stats["total_volume"],
             "total_tokens_burned": stats["total_burned"],
             "total_drb_allocated": stats["total_drb"],
             "total_bnkr_allocated": stats["total_bnkr"],
+            "updated_at": stats["updated_at"],
             "burn_percentage": BURN_PERCENTAGE,
             "drb_percentage": DRB_PERCENTAGE,
             "bnkr_percentage": BNKR_PERCENTAGE,
@@ -1070,6 +1198,18 @@ async def get_burn_statistics():
         logger.error(f"Stats error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get stats: {str(e)}")
 
+@api_router.get("/stats/timeseries")
+async def get_burn_timeseries(window: str = "30d", granularity: Optional[str] = None, dimension: str = "all", key: str = "*"):
+    """Get burn volume per hour or day for all burns, or one wallet, token or chain"""
+    try:
+        span = parse_window(window)
+        return await burn_rollups.timeseries(span, granularity, dimension, key)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Timeseries error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to get burn timeseries: {str(e)}")
+
 @api_router.get("/gas-estimates/{chain}")
 async def get_gas_estimates(chain: str):
     """Get gas estimates for chain operations"""
@@ -1096,26 +1236,68 @@ async def get_token_price_endpoint(token_address: str, chain: str):
         logger.error(f"Token price error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get token price: {str(e)}")
 
+@api_router.post("/token-prices")
+async def get_token_prices(request: TokenPricesRequest):
+    """Prices for many tokens on one chain in one call; null where no price is known"""
+    try:
+        token_addresses = [sanitize_input(address, max_length=100) for address in request.token_addresses]
+        if not token_addresses:
+            raise ValueError("At least one token address is required")
+        if len(token_addresses) > MAX_TOKEN_PRICES_PER_REQUEST:
+            raise ValueError(f"Limited to {MAX_TOKEN_PRICES_PER_REQUEST} tokens per request")
+        
+        prices = await price_service.get_prices(token_addresses, request.chain)
+        return {
+            "chain": request.chain,
+            "currency": "USD",
+            "prices": [{"token_address": address, "price": prices[address]} for address in token_addresses]
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Token prices error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to get token prices: {str(e)}")
+
 @api_router.post("/swap-quote")
 async def get_swap_quote(request: dict):
     """Get swap quote for tokens"""
     try:
-        # Simplified swap quote response
-        return {
-            "status": "success",
-            "data": {
-                "input_amount": request.get("amount", "0"),
-                "output_amount": str(float(request.get("amount", "0")) * 0.95),  # 5% slippage
+        amount = request.get("amount", "0")
+        try:
+            if not math.isfinite(float(amount)):
+                raise ValueError
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Amount must be a finite number")
+        
+        async def quote() -> Dict[str, Any]:
+            # Simplified swap quote response
+            return {
+                "input_amount": amount,
+                "output_amount": str(float(amount) * 0.95),  # 5% slippage
                 "price_impact": "5%",
                 "gas_estimate": "0.002"
             }
-        }
+        
+        # Quote previews for the same pair and a similar amount share one quote for a few seconds
+        if swap_quote_cache is not None:
+            data = await swap_quote_cache.get_quote(
+                request.get("chain", "base"),
+                request.get("input_token", ""),
+                request.get("output_token", ""),
+                amount,
+                quote
+            )
+        else:
+            data = {**await quote(), "cached": False}
+        return {"status": "success", "data": data}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Swap quote error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get swap quote: {str(e)}")
 
 @api_router.post("/execute-burn")
-async def execute_burn_deprecated(request: dict):
+async def execute_burn_deprecated(http_request: Request, request: dict):
     """Legacy execute burn endpoint - redirect to new burn endpoint"""
     try:
         # Convert old format to new format
@@ -1126,23 +1308,18 @@ async def execute_burn_deprecated(request: dict):
             chain=request.get("chain", "base")
         )
         # Call the main burn endpoint logic
-        return await create_burn_transaction(burn_request, BackgroundTasks())
+        return await create_burn_transaction(http_request, burn_request)
     except Exception as e:
         logger.error(f"Execute burn error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to execute burn: {str(e)}")
 
 @api_router.get("/transactions")
-async def get_all_transactions():
-    """Get all recent transactions"""
+async def get_all_transactions(cursor: Optional[str] = None, limit: int = 20, include: Optional[str] = None):
+    """Get all recent transactions, paged with next_cursor"""
     try:
-        transactions = []
-        cursor = burns_collection.find({}).sort("timestamp", DESCENDING).limit(20)
-        
-        async for doc in cursor:
-            doc["_id"] = str(doc["_id"])
-            transactions.append(doc)
-        
-        return {"transactions": transactions}
+        return await fetch_page(burns_collection, {}, cursor, clamp_page_size(limit, 20), include)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Transactions fetch error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch transactions: {str(e)}")
@@ -1364,18 +1541,8 @@ async def cast_vote(vote_data: dict):
 async def get_user_votes(wallet_address: str):
     """Get voting history for a wallet"""
     try:
-        votes = []
-        cursor = votes_collection.find(
-            {"voter_wallet": wallet_address}
-        ).sort("timestamp", DESCENDING)
-        
-        async for vote in cursor:
-            vote["_id"] = str(vote["_id"])
-            # Get project info
-            project = await projects_collection.find_one({"id": vote["project_id"]})
-            if project:
-                vote["project_name"] = project["name"]
-            votes.append(vote)
+        # Project names are joined in the same aggregation
+        votes = await fetch_user_votes(votes_collection, wallet_address)
         
         return {"votes": votes}
         
@@ -1385,62 +1552,74 @@ async def get_user_votes(wallet_address: str):
 
 @api_router.get("/leaderboard")
 @limiter.limit("30/minute")  # Rate limit leaderboard requests
-async def get_leaderboard(request: Request):
-    """Get global leaderboard of top burners"""
+async def get_leaderboard(request: Request, window: Optional[str] = None):
+    """Get global leaderboard of top burners, optionally over a recent window (e.g. 7d)"""
     try:
-        # Get top burners from burns collection
-        pipeline = [
-            {"$match": {"status": "completed"}},
-            {"$group": {
-                "_id": {"$ifNull": ["$wallet_address", "$wallet"]},
-                "total_burned_usd": {"$sum": {"$toDouble": "$amount"}},
-                "transaction_count": {"$sum": 1}
-            }},
-            {"$sort": {"total_burned_usd": -1}},
-            {"$limit": 100}  # Get top 100 burners
-        ]
-        
-        leaderboard = []
-        total_volume = 0
-        
-        async for doc in burns_collection.aggregate(pipeline):
-            wallet_id = doc.get("_id", "Unknown")
-            burned_amount = doc["total_burned_usd"]
-            total_volume += burned_amount
-            
-            if wallet_id and wallet_id != "Unknown":
-                leaderboard.append({
-                    "wallet_address": wallet_id,
-                    "total_burned_usd": burned_amount,
-                    "transaction_count": doc["transaction_count"],
-                    "rank": len(leaderboard) + 1,
-                    "percentage_of_total": 0  # Will be calculated after
-                })
-        
-        # Calculate percentage of total for each entry
-        if total_volume > 0:
-            for entry in leaderboard:
-                entry["percentage_of_total"] = (entry["total_burned_usd"] / total_volume) * 100
+        if window:
+            return await get_windowed_leaderboard(window)
+        
+        totals = await leaderboard.totals()
+        total_volume = totals["total_burned"]
+        
+        leaderboard_entries = []
+        for entry in await leaderboard.top(100):  # Get top 100 burners
+            leaderboard_entries.append({
+                "wallet_address": entry["wallet_address"],
+                "total_burned_usd": entry["total_burned"],
+                "transaction_count": entry["transaction_count"],
+                "rank": len(leaderboard_entries) + 1,
+                "percentage_of_total": (entry["total_burned"] / total_volume) * 100 if total_volume > 0 else 0
+            })
         
         return {
-            "leaderboard": leaderboard,
+            "leaderboard": leaderboard_entries,
             "total_volume": total_volume,
-            "total_participants": len(leaderboard),
+            "total_participants": totals["participants"],
             "updated_at": datetime.utcnow().isoformat()
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Leaderboard error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get leaderboard: {str(e)}")
 
+async def get_windowed_leaderboard(window: str):
+    """Top burners over a recent window, read from daily / hourly rollups"""
+    try:
+        span = parse_window(window)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    total_volume = await burn_rollups.window_total(span)
+    total_participants = await burn_rollups.window_participants(span)
+    
+    leaderboard_entries = []
+    for entry in await burn_rollups.top_keys("wallet", span, 100):
+        leaderboard_entries.append({
+            "wallet_address": entry["key"],
+            "total_burned_usd": entry["total_burned"],
+            "transaction_count": entry["transaction_count"],
+            "rank": len(leaderboard_entries) + 1,
+            "percentage_of_total": (entry["total_burned"] / total_volume) * 100 if total_volume > 0 else 0
+        })
+    
+    return {
+        "leaderboard": leaderboard_entries,
+        "window": window,
+        "total_volume": total_volume,
+        "total_participants": total_participants,
+        "updated_at": datetime.utcnow().isoformat()
+    }
+
 @api_router.get("/community/stats")
 async def get_community_stats():
     """Get community statistics and leaderboard"""
     try:
-        # Check if burns collection exists and has data
-        total_burns_count = await burns_collection.count_documents({})
+        # Check if burns collection has data
+        stats = await burn_stats.read()
         
-        if total_burns_count == 0:
+        if stats["total_transactions"] == 0:
             # Return empty stats when no burns exist
             return CommunityStats(
                 total_burns=0,
@@ -1467,48 +1646,24 @@ async def get_community_stats():
             })
         
         # Get top burners
-        pipeline = [
-            {"$match": {"status": "completed"}},
-            {"$group": {
-                "_id": {"$ifNull": ["$wallet_address", "$wallet"]},
-                "total_burned": {"$sum": {"$toDouble": "$amount"}},
-                "transaction_count": {"$sum": 1}
-            }},
-            {"$sort": {"total_burned": -1}},
-            {"$limit": 10}
-        ]
-        
         top_burners = []
-        async for doc in burns_collection.aggregate(pipeline):
-            wallet_id = doc.get("_id", "Unknown")
-            if wallet_id and wallet_id != "Unknown":
-                top_burners.append({
-                    "wallet": wallet_id[:6] + "..." + wallet_id[-4:],
-                    "total_burned": doc["total_burned"],
-                    "transaction_count": doc["transaction_count"]
-                })
+        for entry in await leaderboard.top(10):
+            wallet_id = entry["wallet_address"]
+            top_burners.append({
+                "wallet": wallet_id[:6] + "..." + wallet_id[-4:],
+                "total_burned": entry["total_burned"],
+                "transaction_count": entry["transaction_count"]
+            })
         
-        # Calculate total volume from actual database data
-        total_volume = 0
-        try:
-            pipeline_volume = [
-                {"$match": {"status": "completed"}},
-                {"$group": {
-                    "_id": None,
-                    "total": {"$sum": {"$toDouble": "$amount"}}
-                }}
-            ]
-            async for doc in burns_collection.aggregate(pipeline_volume):
-                total_volume = doc.get("total", 0)
-                break
-        except:
-            total_volume = 0
+        # Total volume and active wallets from the maintained counters
+        total_volume = stats["total_volume"]
+        active_wallets = (await leaderboard.totals())["participants"]
         
         return CommunityStats(
-            total_burns=await burns_collection.count_documents({"status": "completed"}),
+            total_burns=stats["completed_transactions"],
             total_volume_usd=total_volume,
             total_tokens_burned=total_volume,  # Same as volume for now
-            active_wallets=len(top_burners),
+            active_wallets=active_wallets,
             chain_distribution={"base": 100.0},  # Base only for now
             top_burners=top_burners,
             recent_burns=recent_burns
@@ -1518,44 +1673,106 @@ async def get_community_stats():
         logger.error(f"Community stats error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get community stats: {str(e)}")
 
+async def on_burn_completed(burn: Dict[str, Any], newly_created: bool = False):
+    """Apply a completed burn to the materialized statistics and leaderboard"""
+    # Counters can be corrected later with a rebuild, so never fail the burn here
+    try:
+        await burn_stats.record_completed(burn, newly_created=newly_created)
+    except Exception as e:
+        logger.error(f"Failed to update burn stats for {burn.get('id')}: {e}")
+    
+    try:
+        await leaderboard.record_burn(burn)
+    except Exception as e:
+        logger.error(f"Failed to update leaderboard for {burn.get('id')}: {e}")
+    
+    try:
+        await burn_rollups.record_burn(burn)
+    except Exception as e:
+        logger.error(f"Failed to update burn rollups for {burn.get('id')}: {e}")
+
+# Burn status changes allowed by transition_burn; a retried burn goes back to
+# pending and a requeued dead letter goes from failed back to pending
+BURN_TRANSITIONS = {
+    "pending": ("processing", "failed"),
+    "processing": ("pending", "completed", "failed"),
+    "completed": (),
+    "failed": ("pending",)
+}
+
+async def transition_burn(transaction_id: str, status: str, fields: Optional[Dict[str, Any]] = None) -> bool:
+    """Move a burn to status if its current status allows it; returns False otherwise"""
+    sources = [source for source, targets in BURN_TRANSITIONS.items() if status in targets]
+    result = await burns_collection.update_one(
+        {"id": transaction_id, "status": {"$in": sources}},
+        {"$set": {"status": status, "status_updated_at": datetime.utcnow(), **(fields or {})}}
+    )
+    return result.modified_count == 1
+
 async def process_burn_transaction(transaction_id: str):
-    """Process burn transaction in background"""
+    """Process a queued burn; raising hands it back to burn_queue for a retry"""
+    transaction = await burns_collection.find_one({"id": transaction_id})
+    if not transaction:
+        logger.warning(f"Burn transaction {transaction_id} not found")
+        return
+    if transaction["status"] == "completed":
+        return
+    
+    # Still "processing" when a worker died mid-burn and the job was reclaimed
+    if transaction["status"] != "processing" and not await transition_burn(transaction_id, "processing"):
+        raise RuntimeError(f"Burn {transaction_id} cannot be processed from status {transaction['status']}")
+    
     try:
-        # Get transaction
-        transaction = await burns_collection.find_one({"id": transaction_id})
-        if not transaction:
-            return
-        
-        # Update status to processing
-        await burns_collection.update_one(
-            {"id": transaction_id},
-            {"$set": {"status": "processing"}}
-        )
-        
         # Simulate processing time
         await asyncio.sleep(2)
         
         # Simulate transaction hash
         tx_hash = f"0x{uuid.uuid4().hex}"
-        
-        # Update to completed
-        await burns_collection.update_one(
-            {"id": transaction_id},
-            {"$set": {
-                "status": "completed",
-                "tx_hash": tx_hash
-            }}
-        )
-        
-        logger.info(f"Burn transaction {transaction_id} completed")
-        
-    except Exception as e:
-        logger.error(f"Burn processing error: {e}")
-        # Update to failed
-        await burns_collection.update_one(
-            {"id": transaction_id},
-            {"$set": {"status": "failed"}}
-        )
+    except Exception:
+        await transition_burn(transaction_id, "pending")
+        raise
+    
+    # Update to completed (only once, so counters are never applied twice)
+    if await transition_burn(transaction_id, "completed", {"tx_hash": tx_hash}):
+        transaction["tx_hash"] = tx_hash
+        transaction["status"] = "completed"
+        await on_burn_completed(transaction)
+    
+    logger.info(f"Burn transaction {transaction_id} completed")
+
+async def run_burn_job(job: Dict[str, Any]):
+    if job["kind"] != "burn":
+        raise ValueError(f"Unknown job kind {job['kind']}")
+    await process_burn_transaction(job["payload"]["transaction_id"])
+
+async def fail_burn_job(job: Dict[str, Any], error: str):
+    """Dead-letter hook: the burn is marked failed once its retries are used up"""
+    await transition_burn(job["payload"]["transaction_id"], "failed", {"failure_reason": error})
+
+burn_queue = JobQueue(
+    burn_jobs_collection,
+    run_burn_job,
+    workers=int(os.getenv("BURN_WORKERS", "4")),
+    lease_seconds=float(os.getenv("BURN_JOB_LEASE_SECONDS", "60")),
+    max_attempts=int(os.getenv("BURN_JOB_MAX_ATTEMPTS", "5")),
+    on_dead_letter=fail_burn_job
+)
+
+def burn_job_id(transaction_id: str) -> str:
+    return f"burn:{transaction_id}"
+
+async def enqueue_burn(transaction_id: str) -> bool:
+    return await burn_queue.enqueue(burn_job_id(transaction_id), "burn", {"transaction_id": transaction_id})
+
+async def enqueue_unfinished_burns() -> int:
+    """Queue pending / processing burns that have no job yet (e.g. created before the queue existed)"""
+    queued = 0
+    async for burn in burns_collection.find({"status": {"$in": ["pending", "processing"]}}, {"_id": 0, "id": 1}):
+        if burn.get("id") and await enqueue_burn(burn["id"]):
+            queued += 1
+    if queued:
+        logger.info(f"Queued {queued} unfinished burns")
+    return queued
 
 # Add CORS middleware
 app.add_middleware(
@@ -1571,7 +1788,7 @@ app.add_middleware(
 async def get_wallet_status():
     """Get BurnReliefBot wallet status"""
     try:
-        is_connected = burn_wallet_manager.is_connected()
+        is_connected = await burn_wallet_manager.is_connected()
         wallet_address = burn_wallet_manager.account.address if burn_wallet_manager.account else None
         
         # Get additional info if connected
@@ -1613,7 +1830,7 @@ async def get_wallet_status():
 async def get_token_info(token_address: str, admin_user: dict = Depends(verify_admin_token)):
     """Get detailed token information (admin only)"""
     try:
-        if not burn_wallet_manager.is_connected():
+        if not await burn_wallet_manager.is_connected():
             raise HTTPException(status_code=500, detail="Wallet not connected")
         
         token_info = await burn_wallet_manager.get_token_info(token_address)
@@ -1632,7 +1849,7 @@ async def test_redistribution(test_data: dict, admin_user: dict = Depends(verify
         token_address = test_data.get("token_address")
         test_amount = float(test_data.get("test_amount", 0.01))  # Default 0.01 tokens
         
-        if not burn_wallet_manager.is_connected():
+        if not await burn_wallet_manager.is_connected():
             raise HTTPException(status_code=500, detail="Wallet not connected")
         
         # Get token info first
@@ -1682,27 +1899,29 @@ async def execute_contest_burn(contest_burn_data: dict, admin_user: dict = Depen
         if total_amount <= 0:
             raise HTTPException(status_code=400, detail="Invalid amount")
         
-        if not burn_wallet_manager.is_connected():
+        if not await burn_wallet_manager.is_connected():
             raise HTTPException(status_code=500, detail="Wallet not connected")
         
-        # Calculate contest allocations (88% burn + 12% community)
-        allocations = calculate_burn_amounts(
-            total_amount, 
-            token_address, 
-            is_burnable=True, 
-            is_contest=True
+        # Calculate contest allocations (88% burn + 12% community) in token base units
+        token_info = await burn_wallet_manager.get_token_info(token_address)
+        allocation = allocate_burn(
+            to_base_units(total_amount, token_info["decimals"]),
+            token_address,
+            is_contest=True,
+            decimals=token_info["decimals"]
         )
+        allocations = allocation_to_dict(allocation)
         
         # Prepare distribution dictionary for contest burns
         distributions = {}
         
         # 88% to burn address
-        if float(allocations["burn_amount"]) > 0:
-            distributions[BURN_ADDRESS] = float(allocations["burn_amount"])
+        if allocation.burn > 0:
+            distributions[BURN_ADDRESS] = allocation.burn
         
         # 12% to community wallet
-        if float(allocations["community_amount"]) > 0:
-            distributions[COMMUNITY_WALLET] = float(allocations["community_amount"])
+        if allocation.community_pool > 0:
+            distributions[COMMUNITY_WALLET] = allocation.community_pool
         
         logger.info(f"Executing contest burn: {distributions}")
         
@@ -1725,6 +1944,7 @@ async def execute_contest_burn(contest_burn_data: dict, admin_user: dict = Depen
         }
         
         await burns_collection.insert_one(transaction_record)
+        await on_burn_completed(transaction_record, newly_created=True)
         
         return {
             "status": "success",
@@ -1877,8 +2097,220 @@ async def start_contest(contest_data: dict, admin_user: dict = Depends(verify_ad
         logger.error(f"Contest start error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to start contest: {str(e)}")
 
+@admin_router.post("/allocations/batch")
+async def batch_allocations(batch_data: dict, admin_user: dict = Depends(verify_admin_token)):
+    """Compute allocation columns for many burns at once (admin only)"""
+    try:
+        amounts = batch_data.get("amounts", [])
+        # Per-row rule names (contest, drb_direct_allocation, swap_only, burn_and_swap)
+        # or token classes (contest, drb, non_burnable, burnable)
+        rules = batch_data.get("allocation_types") or batch_data.get("token_classes") or []
+        decimals = int(batch_data.get("decimals", 6))
+        
+        if not amounts:
+            raise ValueError("At least one amount is required")
+        if len(amounts) > MAX_BATCH_ALLOCATION_ROWS:
+            raise ValueError(f"Batch limited to {MAX_BATCH_ALLOCATION_ROWS} rows")
+        
+        columns = await asyncio.to_thread(batch_allocator.allocate_amounts, amounts, rules, decimals)
+        
+        return {
+            "rows": len(amounts),
+            "decimals": decimals,
+            "columns": columns
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Batch allocation error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to compute batch allocations: {str(e)}")
+
+@admin_router.post("/stats/rebuild")
+async def rebuild_burn_statistics(admin_user: dict = Depends(verify_admin_token)):
+    """Recompute materialized burn statistics from the burns collection (admin only)"""
+    try:
+        stats = await burn_stats.rebuild()
+        return {"status": "rebuilt", "stats": stats}
+    except Exception as e:
+        logger.error(f"Stats rebuild error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to rebuild stats: {str(e)}")
+
+@admin_router.post("/leaderboard/rebuild")
+async def rebuild_leaderboard(admin_user: dict = Depends(verify_admin_token)):
+    """Recompute per-wallet leaderboard totals from the burns collection (admin only)"""
+    try:
+        totals = await leaderboard.rebuild()
+        return {"status": "rebuilt", "totals": totals}
+    except Exception as e:
+        logger.error(f"Leaderboard rebuild error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to rebuild leaderboard: {str(e)}")
+
+@admin_router.post("/rollups/rebuild")
+async def rebuild_burn_rollups(admin_user: dict = Depends(verify_admin_token)):
+    """Recompute hourly / daily burn rollups from the burns collection (admin only)"""
+    try:
+        buckets = await burn_rollups.rebuild()
+        return {"status": "rebuilt", "buckets": buckets}
+    except Exception as e:
+        logger.error(f"Rollups rebuild error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to rebuild rollups: {str(e)}")
+
+@admin_router.get("/indexes/report")
+async def get_index_report(admin_user: dict = Depends(verify_admin_token)):
+    """Explain every known query shape and flag collection scans (admin only)"""
+    try:
+        report = await explain_report(db)
+        return {
+            "queries": report,
+            "collscans": [entry["query"] for entry in report if entry.get("collscan")]
+        }
+    except Exception as e:
+        logger.error(f"Index report error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to build index report: {str(e)}")
+
+@admin_router.get("/jobs")
+async def get_burn_jobs(limit: int = 50, admin_user: dict = Depends(verify_admin_token)):
+    """Burn job counts per state and the most recent dead letters (admin only)"""
+    try:
+        dead_letters = await burn_queue.dead_letters(min(max(limit, 1), 200))
+        return {
+            "counts": await burn_queue.counts(),
+            "workers": burn_queue.workers,
+            "dead_letters": [
+                {
+                    "job_id": job["_id"],
+                    "transaction_id": job["payload"].get("transaction_id"),
+                    "attempts": job["attempts"],
+                    "last_error": job.get("last_error"),
+                    "dead_lettered_at": job.get("dead_lettered_at")
+                }
+                for job in dead_letters
+            ]
+        }
+    except Exception as e:
+        logger.error(f"Burn jobs error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to get burn jobs: {str(e)}")
+
+@admin_router.post("/jobs/{transaction_id}/requeue")
+async def requeue_burn_job(transaction_id: str, admin_user: dict = Depends(verify_admin_token)):
+    """Retry a failed burn from scratch (admin only)"""
+    try:
+        if not await transition_burn(transaction_id, "pending", {"failure_reason": None}):
+            raise HTTPException(status_code=404, detail="No failed burn with this transaction id")
+        # Burns failed before the queue existed have no job to requeue
+        if not await burn_queue.requeue(burn_job_id(transaction_id)):
+            await enqueue_burn(transaction_id)
+        return {"transaction_id": transaction_id, "status": "pending"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Burn job requeue error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to requeue burn job: {str(e)}")
+
+@admin_router.get("/rpc/metrics")
+async def get_rpc_metrics(admin_user: dict = Depends(verify_admin_token)):
+    """Latency and error metrics per RPC endpoint (admin only)"""
+    try:
+        return {
+            "chains": rpc_pool.metrics(),
+            "token_metadata_cache": token_metadata.stats,
+            "token_prices": price_service.metrics(),
+            "swap_quote_cache": swap_quote_cache.stats if swap_quote_cache is not None else {"enabled": False}
+        }
+    except Exception as e:
+        logger.error(f"RPC metrics error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to get RPC metrics: {str(e)}")
+
+@admin_router.get("/token-registry")
+async def get_token_registry(admin_user: dict = Depends(verify_admin_token)):
+    """List burnable / non-burnable registry entries (admin only)"""
+    try:
+        entries = await token_registry.list_entries()
+        snapshot = token_registry.snapshot
+        return {
+            "entries": entries,
+            "version": snapshot.version,
+            "loaded_at": snapshot.loaded_at.isoformat(),
+            "burnable_count": len(snapshot.burnable),
+            "non_burnable_count": len(snapshot.non_burnable)
+        }
+    except Exception as e:
+        logger.error(f"Token registry fetch error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch token registry: {str(e)}")
+
+@admin_router.post("/token-registry")
+async def upsert_token_registry_entry(entry_data: dict, admin_user: dict = Depends(verify_admin_token)):
+    """Add or reclassify a token in the registry (admin only)"""
+    try:
+        entry = await token_registry.upsert_entry(
+            sanitize_input(entry_data.get("identifier", ""), max_length=100),
+            entry_data.get("classification", ""),
+            admin_user["user_id"]
+        )
+        return {"status": "updated", "entry": entry, "version": token_registry.snapshot.version}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Token registry update error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to update token registry: {str(e)}")
+
+@admin_router.delete("/token-registry/{identifier}")
+async def delete_token_registry_entry(identifier: str, admin_user: dict = Depends(verify_admin_token)):
+    """Remove a token from the registry (admin only)"""
+    try:
+        removed = await token_registry.remove_entry(identifier)
+        
+        if not removed:
+            raise HTTPException(status_code=404, detail="Token not found in registry")
+        
+        return {"status": "deleted", "version": token_registry.snapshot.version}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Token registry deletion error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to delete token registry entry: {str(e)}")
+
 app.include_router(admin_router, prefix="/api/admin")
 
+@app.on_event("startup")
+async def startup_services():
+    try:
+        await ensure_indexes(db)
+    except Exception as e:
+        logger.error(f"Index bootstrap failed: {e}")
+    if os.getenv("INDEX_EXPLAIN_REPORT", "true").lower() == "true":
+        asyncio.create_task(explain_report(db))
+    
+    await token_registry.start()
+    if ONCHAIN_TOKEN_METADATA or LIVE_REDISTRIBUTION:
+        asyncio.create_task(token_metadata.warm_up(
+            burns_collection,
+            int(os.getenv("TOKEN_METADATA_WARMUP_LIMIT", "100")),
+            chains=list(rpc_pool.batchers)
+        ))
+    try:
+        await burn_stats.ensure_initialized()
+        await leaderboard.ensure_initialized()
+        await burn_rollups.ensure_initialized()
+    except Exception as e:
+        logger.error(f"Burn stats initialization failed: {e}")
+    
+    # BURN_WORKERS=0 leaves processing to separate burn_worker.py processes
+    if burn_queue.workers > 0:
+        try:
+            await burn_queue.start()
+            await enqueue_unfinished_burns()
+        except Exception as e:
+            logger.error(f"Burn queue startup failed: {e}")
+
+@app.on_event("shutdown")
+async def shutdown_services():
+    await burn_queue.stop()
+    await token_registry.stop()
+    await rpc_pool.close()
+    await price_service.close()
+    client.close()
+
 @app.get("/")
 async def root():
     return {"message": "Burn Relief Bot API - Base Chain Only", "version": "2.0", "chains": ["base"]}
@@ -1,15 +1,15 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, HTTPException, WebSocket, WebSocketDisconnect
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
+import math
 from pathlib import Path
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 import uuid
 from datetime import datetime
-from web3 import Web3
 from eth_utils import is_address
 import requests
 import asyncio
@@ -19,6 +19,11 @@ import sys
 sys.path.append('/app/backend')
 from blockchain_service_simple import blockchain_service
 from cross_chain_router import cross_chain_router
+from plan_scheduler import MongoPlanStore
+from tx_monitor import TxMonitor
+from route_graph import format_cost, format_duration
+from rpc_pool import RpcPool, parse_rpc_urls
+from rpc_batcher import read_token_metadata
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -28,6 +33,9 @@ mongo_url = os.environ['MONGO_URL']
 client = AsyncIOMotorClient(mongo_url)
 db = client[os.environ['DB_NAME']]
 
+# Cross-chain execution plans keep per-step state in MongoDB so they can resume after a restart
+cross_chain_router.plan_store = MongoPlanStore(db.cross_chain_plans)
+
 # Create the main app without a prefix
 app = FastAPI()
 
@@ -46,6 +54,28 @@ SUPPORTED_CHAINS = {
     }
 }
 
+# Batched, pooled RPC access for the EVM chains above
+rpc_pool = RpcPool({chain: [config["rpc_url"]] for chain, config in SUPPORTED_CHAINS.items() if "rpc_url" in config})
+
+# RPCs the cross-chain transaction monitor polls; override with <CHAIN>_MONITOR_RPC_URLS
+MONITOR_RPC_URLS = {
+    "ethereum": ["https://ethereum-rpc.publicnode.com"],
+    "base": [SUPPORTED_CHAINS["base"]["rpc_url"], "https://base-rpc.publicnode.com"],
+    "polygon": ["https://polygon-bor-rpc.publicnode.com"],
+    "arbitrum": ["https://arb1.arbitrum.io/rpc"],
+    "solana": ["https://api.mainnet-beta.solana.com"]
+}
+monitor_rpc_pool = RpcPool({
+    chain: parse_rpc_urls(os.getenv(f"{chain.upper()}_MONITOR_RPC_URLS"), urls)
+    for chain, urls in MONITOR_RPC_URLS.items()
+})
+cross_chain_router.tx_monitor = TxMonitor(
+    monitor_rpc_pool,
+    max_watched=int(os.getenv("MAX_WATCHED_TRANSACTIONS", "5000")),
+    pending_timeout=float(os.getenv("MONITOR_PENDING_TIMEOUT_SECONDS", "900"))
+)
+MAX_MONITORED_TRANSACTIONS = int(os.getenv("MAX_MONITORED_TRANSACTIONS", "500"))
+
 # Constants
 BURN_ADDRESS = "0x000000000000000000000000000000000000dEaD"
 DRB_TOKEN_CA = "0x3ec2156D4c0A9CBdAB4a016633b7BcF6a8d68Ea2"
@@ -218,6 +248,13 @@ class CrossChainBurnRequest(BaseModel):
     amount: str
     approve_cross_chain: bool = True
 
+class MonitoredTransaction(BaseModel):
+    tx_hash: str
+    chain: str
+
+class CrossChainMonitorRequest(BaseModel):
+    transactions: List[MonitoredTransaction]
+
 class CrossChainTransaction(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     user_address: str
@@ -230,6 +267,9 @@ class CrossChainTransaction(BaseModel):
     total_steps: int = 0
     estimated_completion: str
     actual_completion: Optional[datetime] = None
+    step_status: Dict[str, str] = Field(default_factory=dict)
+    failed_steps: Dict[str, dict] = Field(default_factory=dict)
+    error: Optional[str] = None
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 # Utility functions
@@ -278,32 +318,9 @@ async def get_token_info(token_address: str, chain: str):
     """Get token information from blockchain"""
     if chain in ["base", "ethereum", "polygon", "arbitrum"]:
         try:
-            chain_config = SUPPORTED_CHAINS[chain]
-            web3 = Web3(Web3.HTTPProvider(chain_config["rpc_url"]))
-            
-            # ERC-20 ABI for name and symbol
-            erc20_abi = [
-                {
-                    "constant": True,
-                    "inputs": [],
-                    "name": "name",
-                    "outputs": [{"name": "", "type": "string"}],
-                    "type": "function"
-                },
-                {
-                    "constant": True,
-                    "inputs": [],
-                    "name": "symbol", 
-                    "outputs": [{"name": "", "type": "string"}],
-                    "type": "function"
-                }
-            ]
-            
-            contract = web3.eth.contract(address=token_address, abi=erc20_abi)
-            name = contract.functions.name().call()
-            symbol = contract.functions.symbol().call()
-            
-            return {"name": name, "symbol": symbol}
+            # decimals, symbol and name go out as one JSON-RPC batch
+            metadata = await read_token_metadata(rpc_pool.batcher(chain), token_address)
+            return {"name": metadata["name"], "symbol": metadata["symbol"]}
         except Exception as e:
             logger.error(f"Error getting token info for {chain}: {e}")
             return None
@@ -312,6 +329,18 @@ async def get_token_info(token_address: str, chain: str):
     # For now, return None
     return None
 
+async def amount_in_usd(token_address: str, chain: str, amount: str) -> Optional[float]:
+    """USD value of amount of a token, or None when it has no known price"""
+    try:
+        amount = float(amount)
+        price = await blockchain_service.price_service.get_price(token_address, chain)
+    except Exception as e:
+        logger.warning(f"No USD value for {amount} of {token_address} on {chain}: {e}")
+        return None
+    if price is None or not math.isfinite(amount):
+        return None
+    return amount * price
+
 # API Routes
 @api_router.get("/")
 async def root():
@@ -722,7 +751,8 @@ async def analyze_cross_chain_route(request: CrossChainRouteRequest):
         route_analysis = await cross_chain_router.analyze_cross_chain_route(
             request.source_chain,
             request.source_token,
-            request.amount
+            request.amount,
+            amount_usd=await amount_in_usd(request.source_token, request.source_chain, request.amount)
         )
         
         if not route_analysis.get("success"):
@@ -751,36 +781,53 @@ async def execute_cross_chain_burn(request: CrossChainBurnRequest):
         route_analysis = await cross_chain_router.analyze_cross_chain_route(
             request.source_chain,
             request.source_token,
-            request.amount
+            request.amount,
+            amount_usd=await amount_in_usd(request.source_token, request.source_chain, request.amount)
         )
         
         if not route_analysis.get("success"):
             raise HTTPException(status_code=400, detail=route_analysis.get("error", "Route analysis failed"))
         
-        # Execute the cross-chain burn sequence
-        execution_result = await cross_chain_router.execute_cross_chain_burn(
-            route_analysis["routes"],
-            request.wallet_address
-        )
-        
-        if not execution_result.get("success"):
-            raise HTTPException(status_code=400, detail=execution_result.get("error", "Execution failed"))
-        
-        # Create cross-chain transaction record
+        # Record the transaction before executing it, so a plan that fails part way or is cut off
+        # by a crash can still be looked up and resumed under its id
+        transaction_id = str(uuid.uuid4())
         cross_chain_tx = CrossChainTransaction(
+            id=transaction_id,
             user_address=request.wallet_address,
             source_chain=request.source_chain,
             source_token=request.source_token,
             amount=request.amount,
-            execution_plan=execution_result["execution_plan"],
-            total_steps=len(execution_result["execution_plan"]),
+            execution_plan=[],
+            total_steps=len(cross_chain_router.build_execution_dag(route_analysis["routes"])),
             estimated_completion=route_analysis["total_estimated_time"],
             status="executing"
         )
-        
-        # Save to database
         await db.cross_chain_transactions.insert_one(cross_chain_tx.dict())
         
+        # Execute the cross-chain burn plan; its step state is saved under the transaction id
+        execution_result = await cross_chain_router.execute_cross_chain_burn(
+            route_analysis["routes"],
+            request.wallet_address,
+            plan_id=transaction_id
+        )
+        
+        await db.cross_chain_transactions.update_one(
+            {"id": transaction_id},
+            {"$set": {
+                "execution_plan": execution_result.get("execution_plan", []),
+                "step_status": execution_result.get("step_status", {}),
+                "failed_steps": execution_result.get("failed_steps", {}),
+                "error": execution_result.get("error"),
+                "status": "executing" if execution_result.get("success") else "failed"
+            }}
+        )
+        
+        if not execution_result.get("success"):
+            raise HTTPException(
+                status_code=400,
+                detail=f"{execution_result.get('error', 'Execution failed')} (cross-chain transaction {transaction_id})"
+            )
+        
         return {
             "success": True,
             "cross_chain_transaction_id": cross_chain_tx.id,
@@ -797,6 +844,34 @@ async def execute_cross_chain_burn(request: CrossChainBurnRequest):
         logger.error(f"Cross-chain burn execution error: {e}")
         raise HTTPException(status_code=500, detail="Failed to execute cross-chain burn")
 
+@api_router.post("/cross-chain/resume/{transaction_id}")
+async def resume_cross_chain_burn(transaction_id: str):
+    """Resume an interrupted cross-chain burn from its saved step state"""
+    try:
+        execution_result = await cross_chain_router.resume_cross_chain_burn(transaction_id)
+        if not execution_result.get("success") and "execution_plan" not in execution_result:
+            raise HTTPException(status_code=404, detail=execution_result.get("error", "Plan not found"))
+        
+        await db.cross_chain_transactions.update_one(
+            {"id": transaction_id},
+            {"$set": {
+                "execution_plan": execution_result["execution_plan"],
+                "step_status": execution_result["step_status"],
+                "failed_steps": execution_result["failed_steps"],
+                "error": execution_result.get("error"),
+                "total_steps": len(execution_result["step_status"]),
+                "status": "executing" if execution_result["success"] else "failed"
+            }}
+        )
+        
+        return execution_result
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Cross-chain burn resume error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to resume cross-chain burn")
+
 @api_router.get("/cross-chain/transaction/{transaction_id}")
 async def get_cross_chain_transaction(transaction_id: str):
     """Get cross-chain transaction status"""
@@ -824,6 +899,61 @@ async def monitor_cross_chain_transaction(tx_hash: str, chain: str):
         logger.error(f"Cross-chain monitoring error: {e}")
         raise HTTPException(status_code=500, detail="Failed to monitor cross-chain transaction")
 
+@api_router.post("/cross-chain/monitor")
+async def monitor_cross_chain_transactions(request: CrossChainMonitorRequest):
+    """Status of many transactions at once; unconfirmed ones keep being watched"""
+    try:
+        if len(request.transactions) > MAX_MONITORED_TRANSACTIONS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_MONITORED_TRANSACTIONS} transactions per request")
+        
+        statuses = await cross_chain_router.monitor_cross_chain_transactions(
+            [(tx.tx_hash, tx.chain) for tx in request.transactions]
+        )
+        return {"transactions": statuses}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Cross-chain monitoring error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to monitor cross-chain transactions")
+
+@app.websocket("/api/cross-chain/monitor/ws")
+async def cross_chain_monitor_updates(websocket: WebSocket):
+    """Push status updates for transactions the client follows.
+    Clients send {"transactions": [{"tx_hash": ..., "chain": ...}]} to follow more of them"""
+    await websocket.accept()
+    monitor = cross_chain_router.tx_monitor
+    updates = monitor.subscribe([])
+    
+    async def follow_requests():
+        while True:
+            message = await websocket.receive_json()
+            transactions = [(tx["tx_hash"], tx["chain"]) for tx in message.get("transactions", [])][:MAX_MONITORED_TRANSACTIONS]
+            monitor.follow(updates, transactions)
+            rejected = monitor.watch(transactions)
+            if rejected:
+                await websocket.send_json({
+                    "error": "Transaction monitor is at capacity",
+                    "rejected": [{"tx_hash": tx_hash, "chain": chain} for tx_hash, chain in rejected]
+                })
+    
+    reader = asyncio.ensure_future(follow_requests())
+    try:
+        while not reader.done():
+            getter = asyncio.ensure_future(updates.get())
+            await asyncio.wait({getter, reader}, return_when=asyncio.FIRST_COMPLETED)
+            if not getter.done():
+                getter.cancel()
+                break
+            await websocket.send_json(getter.result())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if reader.done() and not reader.cancelled() and reader.exception() is not None:
+            logger.info(f"Monitor subscription closed: {reader.exception()!r}")
+        reader.cancel()
+        monitor.unsubscribe(updates)
+
 @api_router.get("/cross-chain/supported-tokens/{chain}")
 async def get_supported_tokens(chain: str):
     """Get supported tokens for cross-chain operations"""
@@ -836,20 +966,32 @@ async def get_supported_tokens(chain: str):
         raise HTTPException(status_code=500, detail="Failed to get supported tokens")
 
 @api_router.get("/cross-chain/optimal-routes")
-async def get_optimal_routes():
-    """Get current optimal routing information"""
+async def get_optimal_routes(source_chain: str = "base", amount_usd: Optional[float] = None):
+    """Current target chain and bridge hops for $DRB and $cbBTC from source_chain,
+    from the route graph's latest fee and latency estimates"""
     try:
+        route_graph = cross_chain_router.route_graph
+        plans = route_graph.best_routes(source_chain, ("DRB", "cbBTC"), amount_usd)
         return {
-            "optimal_chains": {
-                "DRB": "base",
-                "cbBTC": "ethereum"
+            "source_chain": source_chain,
+            "optimal_chains": {token: plan.target_chain for token, plan in plans.items()},
+            "routes": {
+                token: {
+                    "target_chain": plan.target_chain,
+                    "hops": [hop.to_dict() for hop in plan.hops],
+                    "estimated_time": format_duration(plan.seconds),
+                    "estimated_cost": format_cost(plan.cost_usd)
+                }
+                for token, plan in plans.items()
             },
-            "supported_bridges": ["Li.Fi", "Wormhole", "Stargate", "Hyperlane"],
-            "supported_chains": ["ethereum", "base", "polygon", "arbitrum", "solana"],
+            "supported_bridges": sorted({edge.provider for edges in route_graph.edges.values() for edge in edges}),
+            "supported_chains": list(route_graph.chains),
             "routing_strategy": "Lowest cost + fastest execution",
             "last_updated": datetime.utcnow().isoformat()
         }
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Optimal routes error: {e}")
         raise HTTPException(status_code=500, detail="Failed to get optimal routes")
@@ -874,4 +1016,8 @@ logger = logging.getLogger(__name__)
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await rpc_pool.close()
+    await blockchain_service.price_service.close()
+    await cross_chain_router.close()
+    await monitor_rpc_pool.close()
     client.close()
\ No newline at end of file
@@ -0,0 +1,149 @@
+"""
+Token classifier for Burn Relief Bot - Precompiled burnable / non-burnable lookup
+Exact-match hash map for contract addresses plus an Aho-Corasick automaton for
+symbol and name aliases, built once and queried without scanning the lists
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+# Classification labels
+BURNABLE = "burnable"
+NON_BURNABLE = "non_burnable"
+UNKNOWN = "unknown"
+
+# Lower rank wins when an identifier matches entries from both lists
+_PRECEDENCE = {BURNABLE: 0, NON_BURNABLE: 1}
+
+_EVM_ADDRESS_RE = re.compile(r"^0x[0-9a-f]{40}$")
+
+
+def is_contract_address(value: str) -> bool:
+    """Check if a normalized identifier is an EVM contract address"""
+    return bool(_EVM_ADDRESS_RE.match(value))
+
+
+def _stronger(current: Optional[str], candidate: str) -> str:
+    if current is None or _PRECEDENCE[candidate] < _PRECEDENCE[current]:
+        return candidate
+    return current
+
+
+class TokenClassifier:
+    """Immutable token classification index"""
+
+    def __init__(self, burnable: Iterable[str], non_burnable: Iterable[str]):
+        # Contract address -> label
+        self.addresses: Dict[str, str] = {}
+        # Every substring of every alias -> label (alias contains the identifier)
+        self.alias_substrings: Dict[str, str] = {}
+        # Exact entries of the non-burnable list
+        self.listed_non_burnable = set()
+
+        # Aho-Corasick automaton over aliases (identifier contains the alias)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Optional[str]] = [None]
+
+        for label, entries in ((BURNABLE, burnable), (NON_BURNABLE, non_burnable)):
+            for entry in entries:
+                self._add(entry, label)
+
+        self._build_fail_links()
+
+    def _add(self, entry: str, label: str):
+        value = str(entry).lower().strip()
+        if not value:
+            return
+
+        if label == NON_BURNABLE:
+            self.listed_non_burnable.add(value)
+
+        if is_contract_address(value):
+            self.addresses[value] = _stronger(self.addresses.get(value), label)
+            return
+
+        # Aliases are short, so storing their substrings keeps the reverse
+        # containment check a single dict lookup
+        for start in range(len(value)):
+            for end in range(start + 1, len(value) + 1):
+                fragment = value[start:end]
+                self.alias_substrings[fragment] = _stronger(self.alias_substrings.get(fragment), label)
+
+        node = 0
+        for char in value:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+            node = next_node
+        self._output[node] = _stronger(self._output[node], label)
+
+    def _build_fail_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                # Inherit matches that end at the fail target
+                inherited = self._output[self._fail[child]]
+                if inherited is not None:
+                    self._output[child] = _stronger(self._output[child], inherited)
+
+    def _scan(self, text: str) -> Optional[str]:
+        """Return the strongest label of any alias contained in text"""
+        best = None
+        node = 0
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            label = output[node]
+            if label is not None:
+                best = _stronger(best, label)
+                if best == BURNABLE:
+                    break
+        return best
+
+    def classify(self, token_identifier: str) -> str:
+        """Classify a token address, symbol or name"""
+        if not token_identifier:
+            return UNKNOWN
+
+        value = str(token_identifier).lower().strip()
+        if not value:
+            return UNKNOWN
+
+        # Contract addresses only ever match exactly
+        if is_contract_address(value):
+            return self.addresses.get(value, UNKNOWN)
+
+        label = self.alias_substrings.get(value)
+        if label == BURNABLE:
+            return BURNABLE
+
+        scanned = self._scan(value)
+        if scanned is not None:
+            label = _stronger(label, scanned)
+
+        return label or UNKNOWN
+
+    def is_burnable(self, token_identifier: str) -> bool:
+        """Burnable wins over non-burnable, unknown tokens are non-burnable"""
+        return self.classify(token_identifier) == BURNABLE
+
+    def is_listed_non_burnable(self, token_identifier: str) -> bool:
+        """Check for an exact entry on the non-burnable list"""
+        value = str(token_identifier or "").lower().strip()
+        return value in self.listed_non_burnable
@@ -0,0 +1,178 @@
+"""
+Token metadata cache for Burn Relief Bot - Two-tier cache of ERC-20 metadata
+decimals, symbol and name never change once a token is deployed, so they are
+kept forever in an in-process LRU backed by the token_metadata collection;
+balances change with every transfer and are only cached for a few seconds
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pymongo import DESCENDING
+
+logger = logging.getLogger(__name__)
+
+IMMUTABLE_FIELDS = ("decimals", "symbol", "name")
+
+MetadataFetcher = Callable[[str, str, Optional[str]], Awaitable[Dict[str, Any]]]
+BalanceFetcher = Callable[[str, str, str], Awaitable[int]]
+
+
+def metadata_key(chain: str, address: str) -> str:
+    return f"{chain.lower()}:{address.lower()}"
+
+
+class TokenMetadataCache:
+    """LRU -> token_metadata collection -> chain lookup for immutable token fields"""
+
+    def __init__(self, collection, fetch_metadata: MetadataFetcher, fetch_balance: BalanceFetcher,
+                 max_entries: int = 10_000, balance_ttl: float = 15.0):
+        self.collection = collection
+        self.fetch_metadata = fetch_metadata
+        self.fetch_balance = fetch_balance
+        self.max_entries = max_entries
+        self.balance_ttl = balance_ttl
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._balances: Dict[Tuple[str, str], Tuple[float, int]] = {}
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.stats = {"memory_hits": 0, "db_hits": 0, "chain_reads": 0, "balance_hits": 0, "balance_reads": 0}
+
+    def _remember(self, key: str, metadata: Dict[str, Any]):
+        self._entries[key] = metadata
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _remember_balance(self, key: str, holder: str, balance: int):
+        now = time.monotonic()
+        if len(self._balances) >= self.max_entries:
+            self._balances = {k: v for k, v in self._balances.items() if v[0] > now}
+        self._balances[(key, holder.lower())] = (now + self.balance_ttl, balance)
+
+    def _cached_balance(self, key: str, holder: str) -> Optional[int]:
+        entry = self._balances.get((key, holder.lower()))
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    async def _load(self, chain: str, address: str, key: str, holder: Optional[str]) -> Dict[str, Any]:
+        doc = await self.collection.find_one({"_id": key})
+        # Documents saved with a failed field (before those were skipped) are read again and overwritten
+        if doc and all(doc.get(field) is not None for field in IMMUTABLE_FIELDS):
+            self.stats["db_hits"] += 1
+            metadata = {field: doc.get(field) for field in IMMUTABLE_FIELDS}
+            self._remember(key, metadata)
+            return metadata
+
+        self.stats["chain_reads"] += 1
+        fetched = await self.fetch_metadata(chain, address, holder)
+        metadata = {field: fetched.get(field) for field in IMMUTABLE_FIELDS}
+        if holder and "balance" in fetched:
+            self._remember_balance(key, holder, fetched["balance"])
+        if fetched.get("failed_fields"):
+            # A placeholder for a call that failed would be kept forever; read the token again next time
+            logger.warning(f"Not caching metadata for {key}: {', '.join(fetched['failed_fields'])} could not be read")
+            return metadata
+        await self.collection.update_one(
+            {"_id": key},
+            {"$set": {
+                "chain": chain.lower(),
+                "address": address.lower(),
+                **metadata,
+                "fetched_at": datetime.utcnow()
+            }},
+            upsert=True
+        )
+        self._remember(key, metadata)
+        return metadata
+
+    async def get_metadata(self, chain: str, address: str, holder: Optional[str] = None) -> Dict[str, Any]:
+        """decimals, symbol and name; concurrent misses for one token share a single lookup.
+        holder, when given, lets a chain read fetch the balance in the same batch"""
+        key = metadata_key(chain, address)
+        metadata = self._entries.get(key)
+        if metadata is not None:
+            self._entries.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return dict(metadata)
+
+        if key in self._in_flight:
+            return dict(await asyncio.shield(self._in_flight[key]))
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            metadata = await self._load(chain, address, key, holder)
+            future.set_result(metadata)
+            return dict(metadata)
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a failure nobody else waited on is not logged as unhandled
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    async def get_balance(self, chain: str, address: str, holder: str) -> int:
+        key = metadata_key(chain, address)
+        balance = self._cached_balance(key, holder)
+        if balance is not None:
+            self.stats["balance_hits"] += 1
+            return balance
+        self.stats["balance_reads"] += 1
+        balance = await self.fetch_balance(chain, address, holder)
+        self._remember_balance(key, holder, balance)
+        return balance
+
+    async def get_token_info(self, chain: str, address: str, holder: str) -> Dict[str, Any]:
+        """Metadata plus holder's balance, reading the chain at most once"""
+        metadata = await self.get_metadata(chain, address, holder)
+        metadata["balance"] = await self.get_balance(chain, address, holder)
+        return metadata
+
+    def invalidate_balance(self, chain: str, address: str, holder: str):
+        """Drop a cached balance, e.g. after sending tokens"""
+        self._balances.pop((metadata_key(chain, address), holder.lower()), None)
+
+    async def top_burned_tokens(self, burns_collection, limit: int) -> List[Tuple[str, str]]:
+        """(chain, token) pairs with the most burns"""
+        pipeline = [
+            {"$match": {"token_address": {"$type": "string"}}},
+            {"$group": {
+                "_id": {"chain": {"$ifNull": ["$chain", "base"]}, "token": {"$toLower": "$token_address"}},
+                "burns": {"$sum": 1}
+            }},
+            {"$sort": {"burns": DESCENDING}},
+            {"$limit": limit}
+        ]
+        tokens = []
+        async for doc in burns_collection.aggregate(pipeline):
+            tokens.append((doc["_id"]["chain"], doc["_id"]["token"]))
+        return tokens
+
+    async def warm_up(self, burns_collection, limit: int = 100, chains: Optional[List[str]] = None,
+                      concurrency: int = 20) -> int:
+        """Preload metadata for the most burned tokens; returns how many were loaded"""
+        tokens = await self.top_burned_tokens(burns_collection, limit)
+        if chains is not None:
+            tokens = [(chain, token) for chain, token in tokens if chain in chains]
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def load(chain: str, token: str) -> bool:
+            async with semaphore:
+                try:
+                    await self.get_metadata(chain, token)
+                    return True
+                except Exception as e:
+                    logger.warning(f"Token metadata warm-up failed for {chain}:{token}: {e}")
+                    return False
+
+        loaded = sum(await asyncio.gather(*(load(chain, token) for chain, token in tokens)))
+        logger.info(f"Token metadata warmed for {loaded} of {len(tokens)} tokens")
+        return loaded
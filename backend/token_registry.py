@@ -0,0 +1,182 @@
+"""
+Token registry for Burn Relief Bot - Admin-editable burnable / non-burnable lists
+Entries live in the token_registry collection and are served from an immutable
+in-memory snapshot that is rebuilt in the background when the version changes
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from pymongo import ReturnDocument
+
+from token_classifier import BURNABLE, NON_BURNABLE, TokenClassifier
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_VERSION_ID = "token_registry"
+VALID_CLASSIFICATIONS = (BURNABLE, NON_BURNABLE)
+
+
+class TokenRegistrySnapshot(NamedTuple):
+    """Point-in-time view of the registry, swapped as a whole on reload"""
+    version: int
+    classifier: TokenClassifier
+    burnable: Tuple[str, ...]
+    non_burnable: Tuple[str, ...]
+    loaded_at: datetime
+
+
+def build_snapshot(version: int, burnable: Iterable[str], non_burnable: Iterable[str]) -> TokenRegistrySnapshot:
+    """Compile a snapshot from raw token lists"""
+    burnable = tuple(burnable)
+    non_burnable = tuple(non_burnable)
+    return TokenRegistrySnapshot(
+        version=version,
+        classifier=TokenClassifier(burnable, non_burnable),
+        burnable=burnable,
+        non_burnable=non_burnable,
+        loaded_at=datetime.utcnow()
+    )
+
+
+class TokenRegistry:
+    """Mongo-backed token lists with a lock-free read path"""
+
+    def __init__(self, collection, meta_collection,
+                 default_burnable: Iterable[str], default_non_burnable: Iterable[str],
+                 poll_interval: float = 5.0):
+        self.collection = collection
+        self.meta_collection = meta_collection
+        self.default_burnable = list(default_burnable)
+        self.default_non_burnable = list(default_non_burnable)
+        self.poll_interval = poll_interval
+
+        # Serve the built-in lists until the collection has been loaded
+        self.snapshot = build_snapshot(0, self.default_burnable, self.default_non_burnable)
+        self._poll_task: Optional[asyncio.Task] = None
+
+    @property
+    def classifier(self) -> TokenClassifier:
+        return self.snapshot.classifier
+
+    async def start(self):
+        """Seed the collection if needed, load it and start watching for changes"""
+        try:
+            await self.collection.create_index("identifier", unique=True)
+            if await self.collection.count_documents({}) == 0:
+                await self.seed_defaults()
+            await self.reload()
+        except Exception as e:
+            logger.error(f"Token registry load failed, serving built-in lists: {e}")
+
+        if self._poll_task is None:
+            self._poll_task = asyncio.create_task(self._poll_loop())
+
+    async def stop(self):
+        if self._poll_task:
+            self._poll_task.cancel()
+            try:
+                await self._poll_task
+            except asyncio.CancelledError:
+                pass
+            self._poll_task = None
+
+    async def seed_defaults(self):
+        """Copy the built-in lists into an empty collection"""
+        now = datetime.utcnow()
+        documents = []
+        seen = set()
+        for classification, entries in ((BURNABLE, self.default_burnable),
+                                        (NON_BURNABLE, self.default_non_burnable)):
+            for entry in entries:
+                identifier = str(entry).lower().strip()
+                if identifier and identifier not in seen:
+                    seen.add(identifier)
+                    documents.append({
+                        "identifier": identifier,
+                        "classification": classification,
+                        "updated_at": now,
+                        "updated_by": "seed"
+                    })
+        if documents:
+            await self.collection.insert_many(documents, ordered=False)
+        await self._bump_version()
+        logger.info(f"Token registry seeded with {len(documents)} entries")
+
+    async def get_version(self) -> int:
+        doc = await self.meta_collection.find_one({"_id": REGISTRY_VERSION_ID})
+        return doc.get("version", 0) if doc else 0
+
+    async def reload(self) -> TokenRegistrySnapshot:
+        """Rebuild the snapshot from the collection and swap it in"""
+        version = await self.get_version()
+        burnable: List[str] = []
+        non_burnable: List[str] = []
+
+        async for doc in self.collection.find({}, {"_id": 0, "identifier": 1, "classification": 1}):
+            if doc.get("classification") == BURNABLE:
+                burnable.append(doc["identifier"])
+            elif doc.get("classification") == NON_BURNABLE:
+                non_burnable.append(doc["identifier"])
+
+        # Compile off the event loop, then publish with a single assignment
+        snapshot = await asyncio.to_thread(build_snapshot, version, burnable, non_burnable)
+        self.snapshot = snapshot
+        logger.info(f"Token registry v{version} loaded: {len(burnable)} burnable, {len(non_burnable)} non-burnable")
+        return snapshot
+
+    async def _poll_loop(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                if await self.get_version() != self.snapshot.version:
+                    await self.reload()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Token registry poll failed: {e}")
+
+    async def _bump_version(self) -> int:
+        doc = await self.meta_collection.find_one_and_update(
+            {"_id": REGISTRY_VERSION_ID},
+            {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow()}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return doc["version"]
+
+    async def list_entries(self) -> List[Dict[str, Any]]:
+        entries = []
+        async for doc in self.collection.find({}, {"_id": 0}).sort("identifier", 1):
+            entries.append(doc)
+        return entries
+
+    async def upsert_entry(self, identifier: str, classification: str, updated_by: str) -> Dict[str, Any]:
+        """Add or reclassify a token, then publish a new version"""
+        identifier = str(identifier).lower().strip()
+        if not identifier:
+            raise ValueError("Token identifier is required")
+        if classification not in VALID_CLASSIFICATIONS:
+            raise ValueError(f"Classification must be one of {', '.join(VALID_CLASSIFICATIONS)}")
+
+        entry = {
+            "identifier": identifier,
+            "classification": classification,
+            "updated_at": datetime.utcnow(),
+            "updated_by": updated_by
+        }
+        await self.collection.update_one({"identifier": identifier}, {"$set": entry}, upsert=True)
+        await self._bump_version()
+        await self.reload()
+        return entry
+
+    async def remove_entry(self, identifier: str) -> bool:
+        """Remove a token so it falls back to the non-burnable default"""
+        result = await self.collection.delete_one({"identifier": str(identifier).lower().strip()})
+        if result.deleted_count == 0:
+            return False
+        await self._bump_version()
+        await self.reload()
+        return True
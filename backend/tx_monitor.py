@@ -0,0 +1,366 @@
+"""
+Transaction monitor for Burn Relief Bot - Batched confirmation tracking across chains
+Watched transactions are grouped per chain and checked together: EVM receipts in
+one JSON-RPC batch, Solana signatures through getSignatureStatuses. Each chain is
+polled about once per block, using block times measured from the chain itself,
+and status changes are pushed to subscribers
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Starting block times in seconds; replaced by measured values once a chain is polled
+BLOCK_TIMES = {
+    "ethereum": 12.0,
+    "base": 2.0,
+    "polygon": 2.0,
+    "arbitrum": 0.25,
+    "solana": 0.4
+}
+DEFAULT_BLOCK_TIME = 2.0
+# Blocks on top of a receipt's block before an EVM transaction counts as confirmed
+REQUIRED_CONFIRMATIONS = {"ethereum": 12, "base": 6, "polygon": 32, "arbitrum": 6}
+DEFAULT_REQUIRED_CONFIRMATIONS = 6
+# Weight of the newest measurement in a chain's block time average
+BLOCK_TIME_ALPHA = 0.3
+# getSignatureStatuses accepts at most this many signatures per call
+SOLANA_MAX_SIGNATURES = 256
+
+PENDING = "pending"
+CONFIRMING = "confirming"
+CONFIRMED = "confirmed"
+FAILED = "failed"
+# No receipt or signature status turned up within the monitor's pending_timeout
+DROPPED = "dropped"
+FINAL_STATUSES = {CONFIRMED, FAILED, DROPPED}
+
+TxKey = Tuple[str, str]
+
+
+def tx_key(tx_hash: str, chain: str) -> TxKey:
+    """(chain, hash) a transaction is tracked under; EVM hashes are case-insensitive"""
+    chain = chain.lower()
+    return chain, tx_hash if chain == "solana" else tx_hash.lower()
+
+
+class TxMonitor:
+    """Polls watched transactions per chain in batches and publishes status changes.
+
+    rpc_pool supplies one JSON-RPC provider per chain (see rpc_pool); a chain named
+    "solana" is queried with Solana RPC methods, every other chain as EVM.
+    At most max_watched transactions are polled at once, and one that has no receipt
+    pending_timeout seconds after it was first watched is reported as dropped.
+    """
+
+    def __init__(self, rpc_pool, min_interval: float = 0.5, max_interval: float = 15.0,
+                 max_batch: int = 100, max_entries: int = 10_000, queue_size: int = 1_000,
+                 max_watched: int = 5_000, pending_timeout: float = 900.0):
+        self.rpc_pool = rpc_pool
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_batch = max_batch
+        self.max_entries = max_entries
+        self.queue_size = queue_size
+        self.max_watched = max_watched
+        self.pending_timeout = pending_timeout
+
+        self.block_times = dict(BLOCK_TIMES)
+        # chain -> (height, monotonic time) of the last head seen, for measuring block time
+        self._heads: Dict[str, Tuple[int, float]] = {}
+        self._measured: Set[str] = set()
+        # chain -> hashes still waiting for a final status
+        self._watched: Dict[str, Dict[TxKey, str]] = {}
+        # key -> monotonic time it was first watched
+        self._watched_since: Dict[TxKey, float] = {}
+        self._pollers: Dict[str, asyncio.Task] = {}
+        self._latest: "OrderedDict[TxKey, Dict[str, Any]]" = OrderedDict()
+        # queue -> keys it follows, or None for every transaction
+        self._subscribers: Dict[asyncio.Queue, Optional[Set[TxKey]]] = {}
+        self.stats = {"polls": 0, "rpc_requests": 0, "transactions_checked": 0, "updates_published": 0, "poll_errors": 0,
+                      "dropped": 0, "watch_rejected": 0}
+
+    def poll_interval(self, chain: str) -> float:
+        """About one block, within [min_interval, max_interval]"""
+        block_time = self.block_times.get(chain, DEFAULT_BLOCK_TIME)
+        return min(max(block_time, self.min_interval), self.max_interval)
+
+    def _observe_head(self, chain: str, height: int):
+        now = time.monotonic()
+        previous = self._heads.get(chain)
+        if previous is None or height < previous[0]:
+            self._heads[chain] = (height, now)
+            return
+        if height > previous[0]:
+            measured = (now - previous[1]) / (height - previous[0])
+            if chain in self._measured:
+                measured = BLOCK_TIME_ALPHA * measured + (1 - BLOCK_TIME_ALPHA) * self.block_times[chain]
+            # The first measurement replaces the configured guess outright
+            self._measured.add(chain)
+            self.block_times[chain] = measured
+            self._heads[chain] = (height, now)
+
+    def subscribe(self, transactions: Optional[Iterable[Tuple[str, str]]] = None) -> asyncio.Queue:
+        """Queue receiving status updates for the given (tx_hash, chain) pairs, or for all"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        keys = None if transactions is None else {tx_key(tx_hash, chain) for tx_hash, chain in transactions}
+        self._subscribers[queue] = keys
+        # Bring a new subscriber up to date with what is already known
+        for key in keys or ():
+            if key in self._latest:
+                self._deliver(queue, self._latest[key])
+        return queue
+
+    def follow(self, queue: asyncio.Queue, transactions: Iterable[Tuple[str, str]]):
+        """Add transactions to a subscription"""
+        keys = self._subscribers.get(queue)
+        if keys is None:
+            return
+        for tx_hash, chain in transactions:
+            key = tx_key(tx_hash, chain)
+            keys.add(key)
+            if key in self._latest:
+                self._deliver(queue, self._latest[key])
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.pop(queue, None)
+
+    def _deliver(self, queue: asyncio.Queue, update: Dict[str, Any]):
+        if queue.full():
+            # A slow subscriber loses its oldest update rather than stalling the monitor
+            queue.get_nowait()
+        queue.put_nowait(update)
+
+    def _publish(self, key: TxKey, update: Dict[str, Any]):
+        previous = self._latest.get(key)
+        self._latest[key] = update
+        self._latest.move_to_end(key)
+        while len(self._latest) > self.max_entries:
+            self._latest.popitem(last=False)
+        if previous is not None and all(previous.get(field) == update.get(field)
+                                        for field in ("status", "confirmations", "error")):
+            return
+        self.stats["updates_published"] += 1
+        for queue, keys in self._subscribers.items():
+            if keys is None or key in keys:
+                self._deliver(queue, update)
+
+    def watch(self, transactions: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Track (tx_hash, chain) pairs until they confirm, fail or are dropped.
+        Returns the pairs turned away because max_watched transactions are already watched"""
+        rejected = []
+        for tx_hash, chain in transactions:
+            key = tx_key(tx_hash, chain)
+            latest = self._latest.get(key)
+            if latest is not None and latest["status"] in FINAL_STATUSES:
+                continue
+            if key in self._watched_since:
+                continue
+            if len(self._watched_since) >= self.max_watched:
+                rejected.append((tx_hash, chain))
+                continue
+            self._watched.setdefault(key[0], {})[key] = tx_hash
+            self._watched_since[key] = time.monotonic()
+            poller = self._pollers.get(key[0])
+            if poller is None or poller.done():
+                self._pollers[key[0]] = asyncio.ensure_future(self._poll_chain(key[0]))
+        if rejected:
+            self.stats["watch_rejected"] += len(rejected)
+            logger.warning(f"Transaction monitor is watching {self.max_watched} transactions; {len(rejected)} not watched")
+        return rejected
+
+    def _unwatch(self, key: TxKey):
+        self._watched.get(key[0], {}).pop(key, None)
+        self._watched_since.pop(key, None)
+
+    def _expire(self, chain: str):
+        """Drop watched transactions that still have no receipt after pending_timeout"""
+        cutoff = time.monotonic() - self.pending_timeout
+        for key, tx_hash in list(self._watched.get(chain, {}).items()):
+            if self._watched_since.get(key, cutoff) > cutoff:
+                continue
+            latest = self._latest.get(key)
+            # Anything already in a block keeps being followed until it is final
+            if latest is not None and latest["status"] == CONFIRMING:
+                continue
+            self._unwatch(key)
+            self.stats["dropped"] += 1
+            self._publish(key, self._snapshot(
+                tx_hash, chain, DROPPED, error=f"No receipt within {self.pending_timeout:.0f} seconds"
+            ))
+
+    def status(self, tx_hash: str, chain: str) -> Optional[Dict[str, Any]]:
+        """Last known status without querying the chain"""
+        return self._latest.get(tx_key(tx_hash, chain))
+
+    async def check(self, transactions: Iterable[Tuple[str, str]], watch: bool = True) -> List[Dict[str, Any]]:
+        """Query the given (tx_hash, chain) pairs now, one batch per chain, in the order given.
+        Transactions without a final status are watched from then on unless watch is False"""
+        transactions = list(transactions)
+        by_chain: Dict[str, Dict[TxKey, str]] = {}
+        for tx_hash, chain in transactions:
+            key = tx_key(tx_hash, chain)
+            by_chain.setdefault(key[0], {})[key] = tx_hash
+
+        async def check_chain(chain: str, hashes: Dict[TxKey, str]):
+            try:
+                return await self._query(chain, hashes)
+            except Exception as e:
+                return {key: self._snapshot(tx_hash, chain, None, error=str(e)) for key, tx_hash in hashes.items()}
+
+        results: Dict[TxKey, Dict[str, Any]] = {}
+        for updates in await asyncio.gather(*(check_chain(chain, hashes) for chain, hashes in by_chain.items())):
+            results.update(updates)
+        if watch:
+            rejected = self.watch(
+                (update["tx_hash"], update["chain"]) for update in results.values()
+                if update["status"] not in FINAL_STATUSES and "error" not in update
+            )
+            for tx_hash, chain in rejected:
+                results[tx_key(tx_hash, chain)] = {**results[tx_key(tx_hash, chain)], "watched": False}
+        return [results[tx_key(tx_hash, chain)] for tx_hash, chain in transactions]
+
+    async def _poll_chain(self, chain: str):
+        """Check every watched transaction on chain once per block until none are left"""
+        while self._watched.get(chain):
+            # Transactions are usually just sent or just checked, so nothing changes before the next block
+            await asyncio.sleep(self.poll_interval(chain))
+            if not self._watched.get(chain):
+                break
+            try:
+                await self._query(chain, dict(self._watched[chain]))
+            except Exception as e:
+                self.stats["poll_errors"] += 1
+                logger.warning(f"Transaction monitor poll failed for {chain}: {e}")
+            self._expire(chain)
+        self._watched.pop(chain, None)
+
+    async def _query(self, chain: str, hashes: Dict[TxKey, str]) -> Dict[TxKey, Dict[str, Any]]:
+        provider = self.rpc_pool.provider(chain)
+        self.stats["polls"] += 1
+        self.stats["transactions_checked"] += len(hashes)
+        if chain == "solana":
+            updates = await self._query_solana(provider, hashes)
+        else:
+            updates = await self._query_evm(provider, chain, hashes)
+        for key, update in updates.items():
+            if "error" in update:
+                continue
+            self._publish(key, update)
+            if update["status"] in FINAL_STATUSES:
+                self._unwatch(key)
+        return updates
+
+    async def _post(self, provider, payload: Any) -> Any:
+        self.stats["rpc_requests"] += 1
+        return await provider.post(payload)
+
+    async def _query_evm(self, provider, chain: str, hashes: Dict[TxKey, str]) -> Dict[TxKey, Dict[str, Any]]:
+        """eth_blockNumber plus one eth_getTransactionReceipt per hash, max_batch calls per request"""
+        keys = list(hashes)
+        calls = [{"jsonrpc": "2.0", "id": 0, "method": "eth_blockNumber", "params": []}]
+        calls += [
+            {"jsonrpc": "2.0", "id": index + 1, "method": "eth_getTransactionReceipt", "params": [hashes[key]]}
+            for index, key in enumerate(keys)
+        ]
+        batches = await asyncio.gather(*(
+            self._post(provider, calls[start:start + self.max_batch])
+            for start in range(0, len(calls), self.max_batch)
+        ))
+        responses = {}
+        for batch in batches:
+            if isinstance(batch, dict):
+                raise ValueError(batch.get("error", {}).get("message") or f"Unexpected batch response: {batch}")
+            responses.update((response.get("id"), response) for response in batch)
+
+        head_response = responses.get(0, {})
+        if "result" not in head_response:
+            raise ValueError(f"eth_blockNumber failed: {head_response.get('error')}")
+        head = int(head_response["result"], 16)
+        self._observe_head(chain, head)
+        required = REQUIRED_CONFIRMATIONS.get(chain, DEFAULT_REQUIRED_CONFIRMATIONS)
+
+        updates = {}
+        for index, key in enumerate(keys):
+            response = responses.get(index + 1, {})
+            if "result" not in response:
+                error = response.get("error", {}).get("message", "No response in batch")
+                updates[key] = self._snapshot(hashes[key], chain, None, error=error)
+                continue
+            receipt = response["result"]
+            if receipt is None:
+                updates[key] = self._snapshot(hashes[key], chain, PENDING, confirmations=0)
+                continue
+            block = int(receipt["blockNumber"], 16)
+            confirmations = max(head - block + 1, 0)
+            if receipt.get("status") == "0x0":
+                status = FAILED
+            else:
+                status = CONFIRMED if confirmations >= required else CONFIRMING
+            updates[key] = self._snapshot(hashes[key], chain, status, confirmations=confirmations,
+                                          block_number=block, required_confirmations=required)
+        return updates
+
+    async def _query_solana(self, provider, hashes: Dict[TxKey, str]) -> Dict[TxKey, Dict[str, Any]]:
+        """getSignatureStatuses for up to SOLANA_MAX_SIGNATURES signatures per call, all in one batch"""
+        keys = list(hashes)
+        chunks = [keys[start:start + SOLANA_MAX_SIGNATURES] for start in range(0, len(keys), SOLANA_MAX_SIGNATURES)]
+        calls = [
+            {"jsonrpc": "2.0", "id": index, "method": "getSignatureStatuses",
+             "params": [[hashes[key] for key in chunk], {"searchTransactionHistory": True}]}
+            for index, chunk in enumerate(chunks)
+        ]
+        responses = await self._post(provider, calls if len(calls) > 1 else calls[0])
+        if isinstance(responses, dict):
+            responses = [responses]
+        by_id = {response.get("id"): response for response in responses}
+
+        updates = {}
+        for index, chunk in enumerate(chunks):
+            response = by_id.get(index, {})
+            if "result" not in response:
+                error = response.get("error", {}).get("message", "No response in batch")
+                for key in chunk:
+                    updates[key] = self._snapshot(hashes[key], "solana", None, error=error)
+                continue
+            self._observe_head("solana", response["result"]["context"]["slot"])
+            for key, value in zip(chunk, response["result"]["value"]):
+                if value is None:
+                    updates[key] = self._snapshot(hashes[key], "solana", PENDING, confirmations=0)
+                elif value.get("err") is not None:
+                    updates[key] = self._snapshot(hashes[key], "solana", FAILED, slot=value.get("slot"),
+                                                  transaction_error=value["err"])
+                else:
+                    finalized = value.get("confirmationStatus") == "finalized"
+                    # Solana reports null confirmations once a transaction is rooted
+                    updates[key] = self._snapshot(
+                        hashes[key], "solana", CONFIRMED if finalized else CONFIRMING,
+                        confirmations=value.get("confirmations"), slot=value.get("slot"),
+                        commitment=value.get("confirmationStatus")
+                    )
+        return updates
+
+    def _snapshot(self, tx_hash: str, chain: str, status: Optional[str], **fields) -> Dict[str, Any]:
+        snapshot = {"tx_hash": tx_hash, "chain": chain, "status": status or "unknown"}
+        snapshot.update(fields)
+        snapshot["last_updated"] = datetime.utcnow().isoformat()
+        return snapshot
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "watched": {chain: len(hashes) for chain, hashes in self._watched.items()},
+            "max_watched": self.max_watched,
+            "poll_interval_seconds": {chain: round(self.poll_interval(chain), 3) for chain in self._watched},
+            "subscribers": len(self._subscribers)
+        }
+
+    async def close(self):
+        for task in self._pollers.values():
+            task.cancel()
+        self._pollers.clear()
@@ -0,0 +1,35 @@
+"""
+Vote queries for Burn Relief Bot - Voting history joined with project names
+One $lookup aggregation replaces a find_one per vote, so a wallet's history
+costs the same number of round-trips however many votes it has
+"""
+
+from typing import Any, Dict, List
+
+from pymongo import DESCENDING
+
+
+def user_votes_pipeline(wallet_address: str) -> List[Dict[str, Any]]:
+    """Votes for a wallet, newest first, with project_name from the projects collection"""
+    return [
+        {"$match": {"voter_wallet": wallet_address}},
+        {"$sort": {"timestamp": DESCENDING}},
+        {"$lookup": {
+            "from": "projects",
+            "localField": "project_id",
+            "foreignField": "id",
+            "as": "project"
+        }},
+        # Left out entirely when the project no longer exists
+        {"$addFields": {"project_name": {"$arrayElemAt": ["$project.name", 0]}}},
+        {"$project": {"project": 0}}
+    ]
+
+
+async def fetch_user_votes(votes_collection, wallet_address: str) -> List[Dict[str, Any]]:
+    """Run user_votes_pipeline and make the documents JSON-safe"""
+    votes = []
+    async for vote in votes_collection.aggregate(user_votes_pipeline(wallet_address)):
+        vote["_id"] = str(vote["_id"])
+        votes.append(vote)
+    return votes